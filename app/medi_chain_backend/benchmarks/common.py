@@ -0,0 +1,47 @@
+"""Helpers shared by the benchmark scripts.
+
+Import this module before anything from ``src``: it points the app at a
+throwaway SQLite database unless ``DATABASE_URL`` is already set.
+"""
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='medichain-bench-')}/bench.db"
+)
+os.environ.setdefault("JWT_SECRET", "medichain-benchmark-secret-0123456789")
+
+
+async def create_schema():
+    from sqlmodel import SQLModel
+    from src.db.main import async_engine
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(samples) -> dict:
+    """Milliseconds p50/p95/mean for a list of durations in seconds."""
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 4),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+    }
+
+
+async def timed(call, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return samples
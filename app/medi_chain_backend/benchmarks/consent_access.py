@@ -0,0 +1,135 @@
+"""Cost of patient record access enforcement.
+
+    python -m benchmarks.consent_access [--iterations N]
+
+Times ``GET /api/prescriptions/patient/{id}`` for a linked doctor against
+an otherwise identical route without the access check, in alternating
+batches, and reports the p50 difference together with the cost of the
+check itself on a cache hit and on a miss. Exits non-zero if the added p50
+is 1 ms or more.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import uuid
+from typing import List
+
+from benchmarks.common import create_schema, summarize, timed
+
+from fastapi import APIRouter, Depends, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
+
+from src.consents.cache import consent_decisions
+from src.db.main import async_session_maker, get_session
+from src.dependencies import AccessTokenBearer, ensure_patient_access
+from src.doctor_patient.models import DoctorPatient
+from src.doctors.models import Doctor
+from src.main import app
+from src.pagination import PageParams, set_next_cursor
+from src.patients.models import Patient
+from src.prescriptions.models import Prescription
+from src.prescriptions.schemas import PrescriptionResponse
+from src.prescriptions.service import PrescriptionService
+from src.utils import create_access_token
+
+TARGET_MS = 1.0
+
+unchecked_router = APIRouter()
+
+
+@unchecked_router.get("/unchecked/prescriptions/patient/{patient_id}", response_model=List[PrescriptionResponse])
+async def get_prescriptions_unchecked(
+    patient_id: str,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(AccessTokenBearer())
+):
+    """The patient listing as it was before access enforcement."""
+    prescriptions = await PrescriptionService().get_prescriptions_by_patient(uuid.UUID(patient_id), session, page)
+    set_next_cursor(response, prescriptions)
+    return prescriptions.items
+
+
+async def seed():
+    async with async_session_maker() as session:
+        patient = Patient(full_name="Bench Patient", email="bench-patient@example.com", password_hash="x")
+        doctor = Doctor(full_name="Bench Doctor", email="bench-doctor@example.com", password_hash="x",
+                        specialization="GP", hospital_name="General")
+        session.add_all([patient, doctor])
+        session.add(DoctorPatient(doctor_id=doctor.id, patient_id=patient.id, grants_access=True))
+        session.add_all([
+            Prescription(patient_id=patient.id, doctor_id=doctor.id, medication="m", dosage=str(i))
+            for i in range(20)
+        ])
+        await session.commit()
+        return patient.id, doctor.id
+
+
+async def run(iterations: int) -> dict:
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app.include_router(unchecked_router)
+    await create_schema()
+    patient_id, doctor_id = await seed()
+    token = create_access_token({"email": "bench-doctor@example.com", "id": str(doctor_id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    token_data = {"user": {"id": str(doctor_id)}}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        def request(path):
+            async def call():
+                response = await client.get(path, headers=headers)
+                response.raise_for_status()
+            return call
+
+        checked = request(f"/api/prescriptions/patient/{patient_id}")
+        unchecked = request(f"/unchecked/prescriptions/patient/{patient_id}")
+        await timed(checked, 50)
+        await timed(unchecked, 50)
+        enforced, bypassed = [], []
+        batch = 100
+        for _ in range(max(1, iterations // batch)):
+            enforced += await timed(checked, batch)
+            bypassed += await timed(unchecked, batch)
+
+    async with async_session_maker() as session:
+        async def check():
+            await ensure_patient_access(Request({"type": "http"}), session, token_data, patient_id)
+
+        async def cold_check():
+            consent_decisions.clear()
+            await check()
+
+        cached = await timed(check, iterations)
+        uncached = await timed(cold_check, iterations)
+
+    enforced_summary, unchecked_summary = summarize(enforced), summarize(bypassed)
+    added = round(enforced_summary["p50_ms"] - unchecked_summary["p50_ms"], 4)
+    return {
+        "request_enforced": enforced_summary,
+        "request_unchecked": unchecked_summary,
+        "added_p50_ms": added,
+        "check_cached": summarize(cached),
+        "check_uncached": summarize(uncached),
+        "target_ms": TARGET_MS,
+        "ok": added < TARGET_MS,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.iterations))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Throughput and memory of the streaming audit log export.
+
+    python -m benchmarks.exports [--rows N] [--chunk-rows N]
+
+Fills ``audit_logs`` with ``--rows`` rows (200,000 by default), then streams
+the NDJSON and CSV exports of a quarter of the table and of all of it the
+way the endpoint does, discarding the bytes. Reports rows and megabytes per
+second, plus the peak Python heap while streaming, measured in a separate
+pass under tracemalloc. Exits non-zero if exporting the whole table needs
+more than twice the peak memory of exporting a quarter of it, i.e. if
+memory grows with the export size instead of the chunk size.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import create_schema
+
+from sqlalchemy import insert
+
+from src.audit_logs.models import AuditLog
+from src.audit_logs.service import AuditLogService
+from src.db.main import async_session_maker
+from src.exports import stream_rows
+
+BASE = datetime(2026, 1, 1)
+INSERT_BATCH = 10_000
+
+
+async def fill(rows: int):
+    actors = [uuid.uuid4() for _ in range(50)]
+    async with async_session_maker() as session:
+        for start in range(0, rows, INSERT_BATCH):
+            await session.execute(insert(AuditLog), [
+                {
+                    "id": uuid.uuid4(),
+                    "actor_id": actors[i % len(actors)],
+                    "action": "CREATE_APPOINTMENT",
+                    "target_type": "appointment",
+                    "target_id": uuid.uuid4(),
+                    "timestamp": BASE + timedelta(seconds=i),
+                    "ip_address": "10.0.0.1",
+                }
+                for i in range(start, min(start + INSERT_BATCH, rows))
+            ])
+        await session.commit()
+
+
+async def drain(statement, format: str, chunk_rows: int):
+    size = 0
+    async for chunk in stream_rows(statement, format, chunk_rows):
+        size += len(chunk)
+    return size
+
+
+async def measure(statement, format: str, chunk_rows: int, rows: int) -> dict:
+    start = time.perf_counter()
+    size = await drain(statement, format, chunk_rows)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await drain(statement, format, chunk_rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+        "mb_per_second": round(size / elapsed / 1e6, 2),
+        "peak_heap_mb": round(peak / 1e6, 2),
+    }
+
+
+async def run(rows: int, chunk_rows: int) -> dict:
+    await create_schema()
+    await fill(rows)
+    service = AuditLogService()
+    quarter = service.export_statement(date_to=BASE + timedelta(seconds=rows // 4))
+    everything = service.export_statement()
+
+    result = {"chunk_rows": chunk_rows}
+    for format in ("ndjson", "csv"):
+        result[format] = {
+            "quarter": await measure(quarter, format, chunk_rows, rows // 4),
+            "all": await measure(everything, format, chunk_rows, rows),
+        }
+    result["ok"] = all(
+        result[format]["all"]["peak_heap_mb"] <= 2 * result[format]["quarter"]["peak_heap_mb"]
+        for format in ("ndjson", "csv")
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.rows, args.chunk_rows))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""Load test with a weighted mix of clinical workloads.
+
+    python -m benchmarks.load [--patients N] [--doctors N] [--users N] [--duration S]
+                              [--mix NAME=WEIGHT,...] [--seed N]
+                              [--base-url URL] [--no-seed | --seed-only]
+
+Seeds ``DATABASE_URL`` with a synthetic dataset: ``--patients`` patients
+and ``--doctors`` doctors sharing one password, each patient linked to
+``--links`` doctors with a granted consent, and a day of booked
+appointments per doctor. The schema is dropped and recreated first, so
+point it at a scratch database (the default is a throwaway SQLite file).
+
+Then ``--users`` virtual users run for ``--duration`` seconds, each picking
+scenarios at random by weight:
+
+* ``login``: a patient or doctor signs in (password check included);
+* ``dashboard``: a doctor polls their dashboard with ``If-None-Match``;
+* ``booking``: a patient looks up a doctor's availability and books a slot
+  (a 409 for a slot taken meanwhile is expected);
+* ``prescription``: a doctor writes a prescription for one of their patients;
+* ``consent``: a patient revokes or re-grants a doctor's access.
+
+Requests go to the app in-process (startup and shutdown hooks included)
+unless ``--base-url`` names a running server; seed the server's database
+first with ``--seed-only`` and start the server afterwards, so its caches
+see the data. ``--seed`` fixes the dataset and every user's choices.
+
+Prints requests, throughput, p50/p95/p99 latency, status counts and the
+error rate (responses outside a scenario's expected statuses, and transport
+failures) per route and overall. Exits non-zero if any request errored.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import create_schema, percentile
+
+# No outside services: a REDIS_URL from .env is ignored unless exported.
+os.environ.setdefault("REDIS_URL", "")
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from src.appointments.models import Appointment
+from src.consents.models import Consent
+from src.dashboard.rebuild import rebuild_counters
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.doctors.models import Doctor
+from src.patients.models import Patient
+from src.utils import create_access_token, generate_password_hash
+
+PASSWORD = "load-test-password"
+SPECIALIZATIONS = ["Cardiology", "Dermatology", "Neurology", "Oncology", "Pediatrics", "Radiology"]
+INSERT_BATCH = 5000
+SLOT = timedelta(minutes=30)
+# Bookable slots: the next 14 days, 08:00-18:00 UTC.
+BOOKING_DAYS, SLOTS_PER_DAY = 14, 20
+
+DEFAULT_MIX = {"login": 5, "dashboard": 40, "booking": 20, "prescription": 20, "consent": 15}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def seed(patients: int, doctors: int, links: int, rng: random.Random):
+    """Recreate the schema and fill it with the synthetic dataset."""
+    await create_schema()
+    password_hash = generate_password_hash(PASSWORD)
+    doctor_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(doctors)]
+    patient_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(patients)]
+    today = datetime.now(timezone.utc).replace(tzinfo=None, hour=8, minute=0, second=0, microsecond=0)
+
+    def batches(rows):
+        for start in range(0, len(rows), INSERT_BATCH):
+            yield rows[start:start + INSERT_BATCH]
+
+    tables = [
+        (Doctor, [
+            {"id": doctor_id, "full_name": f"Doctor {i}", "email": f"doctor{i}@load.example.com",
+             "password_hash": password_hash, "specialization": SPECIALIZATIONS[i % len(SPECIALIZATIONS)],
+             "hospital_name": f"Hospital {i % 10}"}
+            for i, doctor_id in enumerate(doctor_ids)
+        ]),
+        (Patient, [
+            {"id": patient_id, "full_name": f"Patient {i}", "email": f"patient{i}@load.example.com",
+             "password_hash": password_hash}
+            for i, patient_id in enumerate(patient_ids)
+        ]),
+    ]
+    pairs = [(doctor_id, patient_id) for patient_id in patient_ids for doctor_id in rng.sample(doctor_ids, min(links, doctors))]
+    tables.append((DoctorPatient, [{"id": uuid.uuid4(), "doctor_id": d, "patient_id": p, "grants_access": True} for d, p in pairs]))
+    tables.append((Consent, [
+        {"id": uuid.uuid4(), "doctor_id": d, "patient_id": p, "access_status": "granted", "granted_at": today}
+        for d, p in pairs
+    ]))
+    by_doctor = defaultdict(list)
+    for doctor_id, patient_id in pairs:
+        by_doctor[doctor_id].append(patient_id)
+    tables.append((Appointment, [
+        {"id": uuid.uuid4(), "doctor_id": doctor_id, "patient_id": patient_id, "appointment_date": today + slot * SLOT}
+        for doctor_id, patient_list in by_doctor.items()
+        for slot, patient_id in enumerate(patient_list[:SLOTS_PER_DAY // 2])
+    ]))
+
+    async with async_session_maker() as session:
+        for model, rows in tables:
+            for batch in batches(rows):
+                await session.execute(insert(model), batch)
+        await session.commit()
+        await rebuild_counters(session)
+
+
+class Dataset:
+    """Ids the virtual users act on, read back from the database."""
+
+    def __init__(self, patients: List[Tuple[uuid.UUID, str]], doctors: List[Tuple[uuid.UUID, str]],
+                 consents: List[Tuple[uuid.UUID, uuid.UUID, uuid.UUID]]):
+        self.patients = patients
+        self.doctors = doctors
+        self.consents = consents
+        self.emails = dict(patients + doctors)
+        self.patients_of: Dict[uuid.UUID, List[uuid.UUID]] = defaultdict(list)
+        for consent_id, patient_id, doctor_id in consents:
+            self.patients_of[doctor_id].append(patient_id)
+        self._tokens: Dict[uuid.UUID, dict] = {}
+
+    @classmethod
+    async def load(cls) -> "Dataset":
+        async with async_session_maker() as session:
+            patients = (await session.execute(select(Patient.id, Patient.email).order_by(Patient.email))).all()
+            doctors = (await session.execute(select(Doctor.id, Doctor.email).order_by(Doctor.email))).all()
+            consents = (await session.execute(
+                select(Consent.id, Consent.patient_id, Consent.doctor_id).order_by(Consent.patient_id, Consent.doctor_id)
+            )).all()
+        if not patients or not doctors or not consents:
+            raise SystemExit("The database has no load test dataset; run without --no-seed first")
+        return cls(patients, doctors, consents)
+
+    def headers(self, user_id: uuid.UUID) -> dict:
+        if user_id not in self._tokens:
+            token = create_access_token({"email": self.emails[user_id], "id": str(user_id)}, expiry=timedelta(days=1))
+            self._tokens[user_id] = {"Authorization": f"Bearer {token}"}
+        return self._tokens[user_id]
+
+
+class RouteStats:
+    __slots__ = ("latencies", "statuses", "errors")
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def summary(self, elapsed: float) -> dict:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 1),
+            "p50_ms": round(percentile(self.latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 0.99) * 1000, 2),
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items(), key=str)},
+            "error_rate": round(self.errors / count, 4),
+        }
+
+
+class VirtualUser:
+    def __init__(self, client, dataset: Dataset, rng: random.Random, stats: Dict[str, RouteStats]):
+        self.client = client
+        self.dataset = dataset
+        self.rng = rng
+        self.stats = stats
+        self.etags: Dict[str, str] = {}
+
+    async def request(self, route: str, method: str, url: str, expected=(200,), **kwargs):
+        """Send one request, recording it under ``route`` (a path template)."""
+        stats = self.stats.setdefault(f"{method} {route}", RouteStats())
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception as exc:
+            stats.latencies.append(time.perf_counter() - start)
+            stats.statuses[type(exc).__name__] += 1
+            stats.errors += 1
+            return None
+        stats.latencies.append(time.perf_counter() - start)
+        stats.statuses[response.status_code] += 1
+        if response.status_code not in expected:
+            stats.errors += 1
+        return response
+
+
+async def login(user: VirtualUser):
+    kind = "doctors" if user.rng.random() < 0.3 else "patients"
+    _, email = user.rng.choice(user.dataset.doctors if kind == "doctors" else user.dataset.patients)
+    await user.request(f"/api/{kind}/login", "POST", f"/api/{kind}/login", json={"email": email, "password": PASSWORD})
+
+
+async def dashboard(user: VirtualUser):
+    doctor_id, _ = user.rng.choice(user.dataset.doctors)
+    url = f"/api/doctors/{doctor_id}/dashboard"
+    headers = dict(user.dataset.headers(doctor_id))
+    if url in user.etags:
+        headers["If-None-Match"] = user.etags[url]
+    response = await user.request("/api/doctors/{doctor_id}/dashboard", "GET", url, expected=(200, 304), headers=headers)
+    if response is not None and "etag" in response.headers:
+        user.etags[url] = response.headers["etag"]
+
+
+async def booking(user: VirtualUser):
+    patient_id, _ = user.rng.choice(user.dataset.patients)
+    doctor_id, _ = user.rng.choice(user.dataset.doctors)
+    headers = user.dataset.headers(patient_id)
+    start = datetime.now(timezone.utc).replace(tzinfo=None, hour=8, minute=0, second=0, microsecond=0)
+    day = start + timedelta(days=user.rng.randrange(1, BOOKING_DAYS + 1))
+    available = await user.request(
+        "/api/doctors/{doctor_id}/availability", "GET", f"/api/doctors/{doctor_id}/availability",
+        params={"from": day.isoformat(), "to": (day + SLOTS_PER_DAY * SLOT).isoformat()}, headers=headers,
+    )
+    # Only the doctor's free slots can be booked (none at weekends).
+    slots = available.json()["slots"] if available is not None and available.status_code == 200 else []
+    if not slots:
+        return
+    body = {
+        "patient_id": str(patient_id), "doctor_id": str(doctor_id), "reason": "Load test visit",
+        "appointment_date": user.rng.choice(slots)["start"],
+    }
+    await user.request("/api/appointments/", "POST", "/api/appointments/", expected=(200, 409), json=body, headers=headers)
+
+
+async def prescription(user: VirtualUser):
+    doctor_id, _ = user.rng.choice(user.dataset.doctors)
+    patients = user.dataset.patients_of.get(doctor_id)
+    if not patients:
+        return
+    body = {
+        "patient_id": str(user.rng.choice(patients)), "doctor_id": str(doctor_id),
+        "medication": user.rng.choice(["Amoxicillin", "Metformin", "Lisinopril", "Atorvastatin"]),
+        "dosage": f"{user.rng.choice([5, 10, 20, 50])} mg",
+    }
+    await user.request("/api/prescriptions/", "POST", "/api/prescriptions/", json=body,
+                       headers=user.dataset.headers(doctor_id))
+
+
+async def consent(user: VirtualUser):
+    consent_id, patient_id, _ = user.rng.choice(user.dataset.consents)
+    status = user.rng.choice(["revoked", "granted"])
+    await user.request("/api/consents/{consent_id}", "PUT", f"/api/consents/{consent_id}",
+                       json={"access_status": status}, headers=user.dataset.headers(patient_id))
+
+
+SCENARIOS = {"login": login, "dashboard": dashboard, "booking": booking, "prescription": prescription, "consent": consent}
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str]):
+    import httpx
+
+    timeout = httpx.Timeout(60.0)
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+            yield client
+        return
+
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        # Unhandled errors become 500s, as they would behind a server.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=timeout) as client:
+            yield client
+
+
+async def run_load(client, dataset: Dataset, users: int, duration: float, mix: Dict[str, float], seed: int) -> dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stats: Dict[str, RouteStats] = {}
+    scenarios = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def user_loop(index: int):
+        user = VirtualUser(client, dataset, random.Random(f"{seed}-{index}"), stats)
+        while time.perf_counter() < deadline:
+            name = user.rng.choices(names, weights)[0]
+            scenarios[name] += 1
+            await SCENARIOS[name](user)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[user_loop(i) for i in range(users)])
+    elapsed = time.perf_counter() - start
+
+    total = RouteStats()
+    for route in stats.values():
+        total.latencies.extend(route.latencies)
+        total.statuses.update(route.statuses)
+        total.errors += route.errors
+    return {
+        "users": users,
+        "seconds": round(elapsed, 2),
+        "scenarios": dict(scenarios),
+        "total": total.summary(elapsed) if total.latencies else {"requests": 0},
+        "routes": {route: stats[route].summary(elapsed) for route in sorted(stats)},
+    }
+
+
+async def run(args) -> dict:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if not args.no_seed:
+        start = time.perf_counter()
+        await seed(args.patients, args.doctors, args.links, random.Random(args.seed))
+        seeded = round(time.perf_counter() - start, 2)
+        if args.seed_only:
+            return {"seeded_seconds": seeded, "ok": True}
+    dataset = await Dataset.load()
+    async with open_client(args.base_url) as client:
+        result = await run_load(client, dataset, args.users, args.duration, args.mix, args.seed)
+    result["dataset"] = {"patients": len(dataset.patients), "doctors": len(dataset.doctors), "consents": len(dataset.consents)}
+    result["target"] = args.base_url or "in-process"
+    result["ok"] = result["total"].get("requests", 0) > 0 and result["total"]["error_rate"] == 0
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--doctors", type=int, default=100)
+    parser.add_argument("--links", type=int, default=2, help="doctors per patient")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help=f"scenario weights, e.g. {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())}")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url", help="load a running server instead of the in-process app")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--no-seed", action="store_true", help="reuse the dataset already in the database")
+    group.add_argument("--seed-only", action="store_true", help="seed the database and exit")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
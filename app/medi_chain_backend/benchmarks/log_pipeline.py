@@ -0,0 +1,173 @@
+"""Request throughput with logging off, written synchronously, and queued.
+
+    python -m benchmarks.log_pipeline [--requests N] [--concurrency N] [--records N] [--rounds N]
+
+First times a bare ``logger.info`` call (what a request pays per record)
+in each of the modes below, then serves ``GET /api/prescriptions/patient/{id}`` ``--requests`` times from
+``--concurrency`` concurrent clients, with every request also logging
+``--records`` INFO records that carry a ``PatientRegister`` payload (what
+the patient routes used to log). Four runs:
+
+* ``off``: records below WARNING are dropped by the logger;
+* ``sync``: a ``StreamHandler`` with ``JsonFormatter`` writes each record to
+  a file on the event loop, like the old ``logging.basicConfig`` setup;
+* ``queued``: ``LogPipeline``, formatting and writing on its own thread;
+* ``sampled``: the same, keeping one in ten of the records.
+
+The request runs alternate for ``--rounds`` rounds; the median requests per
+second of each is reported. Exits non-zero unless a queued record costs the
+caller less than a synchronously written one. The listener thread still
+needs the GIL to format, so on a fast local file the throughput gain is
+smaller than the per-call one; the queue mainly keeps a slow or blocked
+output off the request path, and sampling removes most of the formatting.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from benchmarks.common import create_schema
+
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.doctors.models import Doctor
+from src.logs import JsonFormatter, LogPipeline
+from src.main import app
+from src.patients.models import Patient
+from src.patients.schemas import PatientRegister
+from src.prescriptions.models import Prescription
+from src.utils import create_access_token
+
+logger = logging.getLogger("benchmarks.log_pipeline")
+
+CALL_ITERATIONS = 50_000
+
+SIGNUP = PatientRegister(full_name="Bench Patient", email="bench@example.com", password="secret-password",
+                         phone="+15550000000", address="1 Bench Street")
+
+
+async def seed():
+    async with async_session_maker() as session:
+        patient = Patient(full_name="Bench Patient", email="bench-patient@example.com", password_hash="x")
+        doctor = Doctor(full_name="Bench Doctor", email="bench-doctor@example.com", password_hash="x",
+                        specialization="GP", hospital_name="General")
+        session.add_all([patient, doctor])
+        session.add(DoctorPatient(doctor_id=doctor.id, patient_id=patient.id, grants_access=True))
+        session.add_all([
+            Prescription(patient_id=patient.id, doctor_id=doctor.id, medication="m", dosage=str(i))
+            for i in range(20)
+        ])
+        await session.commit()
+        return patient.id, doctor.id
+
+
+def logging_app(records: int):
+    async def wrapped(scope, receive, send):
+        if scope["type"] == "http":
+            for i in range(records):
+                logger.info("Handling %s (%d): %s", scope["path"], i, SIGNUP,
+                            extra={"event": "bench.request", "method": scope["method"]})
+        await app(scope, receive, send)
+
+    return wrapped
+
+
+def call_cost(iterations: int) -> float:
+    """Microseconds per ``logger.info`` call."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        logger.info("Handling %s (%d): %s", "/bench", i, SIGNUP, extra={"event": "bench.request", "method": "GET"})
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def throughput(client, path: str, headers: dict, requests: int, concurrency: int) -> float:
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(path, headers=headers)
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, concurrency: int, records: int, rounds: int) -> dict:
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    root = logging.getLogger()
+    await create_schema()
+    patient_id, doctor_id = await seed()
+    token = create_access_token({"email": "bench-doctor@example.com", "id": str(doctor_id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    path = f"/api/prescriptions/patient/{patient_id}"
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=logging_app(records)), base_url="http://bench")
+    await throughput(client, path, headers, concurrency * 10, concurrency)
+
+    output = os.path.join(tempfile.mkdtemp(prefix="medichain-logs-"), "app.log")
+    pipeline = LogPipeline(level="INFO", json=True, queue_size=1_000_000, sample_rates={})
+    sampled = LogPipeline(level="INFO", json=True, queue_size=1_000_000, sample_rates={"bench.request": 0.1})
+
+    @contextmanager
+    def mode(name: str):
+        with open(output, "w") as stream:
+            if name == "off":
+                root.setLevel(logging.WARNING)
+                yield
+            elif name == "sync":
+                handler = logging.StreamHandler(stream)
+                handler.setFormatter(JsonFormatter())
+                root.setLevel(logging.INFO)
+                root.addHandler(handler)
+                yield
+                root.removeHandler(handler)
+            else:
+                active = pipeline if name == "queued" else sampled
+                active.start(stream)
+                yield
+                active.stop()
+
+    modes = ("off", "sync", "queued", "sampled")
+    calls = {}
+    for name in modes:
+        with mode(name):
+            calls[name] = call_cost(CALL_ITERATIONS)
+
+    rates = {name: [] for name in modes}
+    for _ in range(rounds):
+        for name in modes:
+            with mode(name):
+                rates[name].append(await throughput(client, path, headers, requests, concurrency))
+    await client.aclose()
+
+    result = {"requests": requests, "concurrency": concurrency, "records_per_request": records, "rounds": rounds}
+    for name in modes:
+        result[name] = {"call_us": round(calls[name], 2), "rps": round(statistics.median(rates[name]))}
+    result["queued_dropped"] = pipeline.stats()["dropped"]
+    result["ok"] = calls["queued"] < calls["sync"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--records", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.requests, args.concurrency, args.records, args.rounds))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Overhead of the request metrics middleware and engine hooks.
+
+    python -m benchmarks.metrics [--iterations N]
+
+Times ``GET /api/prescriptions/patient/{id}`` (token check, access check,
+version lookup and a page of 20 rows) with and without ``MetricsMiddleware``
+and the SQL hooks, in alternating batches, and reports the p50 of both and
+the relative difference. Exits non-zero if the metrics add 2% or more.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+from benchmarks.common import create_schema, summarize, timed
+
+# The app is imported without metrics; they are switched on per batch below.
+os.environ["METRICS_ENABLED"] = "false"
+
+from src.db.main import async_engine, async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.doctors.models import Doctor
+from src.main import app
+from src.metrics import MetricsMiddleware, instrument_engine, metrics_registry
+from src.patients.models import Patient
+from src.prescriptions.models import Prescription
+from src.utils import create_access_token
+
+TARGET_PERCENT = 2.0
+
+
+async def seed():
+    async with async_session_maker() as session:
+        patient = Patient(full_name="Bench Patient", email="bench-patient@example.com", password_hash="x")
+        doctor = Doctor(full_name="Bench Doctor", email="bench-doctor@example.com", password_hash="x",
+                        specialization="GP", hospital_name="General")
+        session.add_all([patient, doctor])
+        session.add(DoctorPatient(doctor_id=doctor.id, patient_id=patient.id, grants_access=True))
+        session.add_all([
+            Prescription(patient_id=patient.id, doctor_id=doctor.id, medication="m", dosage=str(i))
+            for i in range(20)
+        ])
+        await session.commit()
+        return patient.id, doctor.id
+
+
+async def run(iterations: int) -> dict:
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await create_schema()
+    patient_id, doctor_id = await seed()
+    token = create_access_token({"email": "bench-doctor@example.com", "id": str(doctor_id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    path = f"/api/prescriptions/patient/{patient_id}"
+
+    plain_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    metered_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=MetricsMiddleware(app)), base_url="http://bench")
+
+    def request(client):
+        async def call():
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+        return call
+
+    plain_call, metered_call = request(plain_client), request(metered_client)
+    await timed(plain_call, 100)
+    plain, metered = [], []
+    batch = 100
+    for _ in range(max(1, iterations // batch)):
+        plain += await timed(plain_call, batch)
+        uninstrument = instrument_engine(async_engine)
+        metered += await timed(metered_call, batch)
+        uninstrument()
+    await plain_client.aclose()
+    await metered_client.aclose()
+
+    plain_summary, metered_summary = summarize(plain), summarize(metered)
+    overhead = (metered_summary["p50_ms"] / plain_summary["p50_ms"] - 1) * 100
+    return {
+        "without_metrics": plain_summary,
+        "with_metrics": metered_summary,
+        "overhead_p50_percent": round(overhead, 2),
+        "recorded_requests": sum(metrics.count for metrics in metrics_registry.routes.values()),
+        "target_percent": TARGET_PERCENT,
+        "ok": overhead < TARGET_PERCENT,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.iterations))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
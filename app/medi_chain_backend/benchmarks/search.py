@@ -0,0 +1,121 @@
+"""Latency of the ranked patient/doctor search.
+
+    python -m benchmarks.search [--rows N] [--queries N]
+
+Fills ``doctors`` with ``--rows`` rows (1,000,000 by default) of generated
+names, specializations, hospitals and phones, then times
+``SearchService.search`` for typeahead queries: 3-6 letter prefixes of a
+name, whole names, a name plus a specialization prefix and phone prefixes.
+On SQLite this measures the in-process index (its one-off load is reported
+separately); point ``DATABASE_URL`` at a migrated Postgres database to
+measure the trigram/tsvector indexes. Exits non-zero if the p95 is 20 ms
+or more.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+
+from benchmarks.common import create_schema, summarize, timed
+
+from sqlalchemy import insert
+
+from src.db.main import async_session_maker
+from src.doctors.models import Doctor
+from src.search.index import search_indexes
+from src.search.service import SearchParams, SearchService
+
+TARGET_MS = 20.0
+INSERT_BATCH = 10_000
+SYLLABLES = ["an", "bel", "car", "dor", "el", "fin", "gar", "hal", "is", "jor", "ka", "lin",
+             "mar", "nor", "ol", "per", "quin", "ros", "sal", "tor", "ul", "van", "wes", "yor", "zel"]
+SPECIALIZATIONS = ["Cardiology", "Dermatology", "Neurology", "Oncology", "Pediatrics", "Radiology",
+                   "Psychiatry", "Orthopedics", "Urology", "Endocrinology", "Gastroenterology", "Nephrology"]
+
+
+def name(rng: random.Random) -> str:
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize() for _ in range(2)
+    )
+
+
+async def fill(rows: int, rng: random.Random) -> list:
+    names = []
+    async with async_session_maker() as session:
+        for start in range(0, rows, INSERT_BATCH):
+            batch = []
+            for i in range(start, min(start + INSERT_BATCH, rows)):
+                full_name = name(rng)
+                names.append(full_name)
+                batch.append({
+                    "id": uuid.uuid4(), "full_name": full_name, "email": f"doctor{i}@example.com",
+                    "password_hash": "x", "specialization": rng.choice(SPECIALIZATIONS),
+                    "hospital_name": f"{name(rng).split()[0]} Hospital", "phone": f"+1555{i:07d}",
+                })
+            await session.execute(insert(Doctor), batch)
+        await session.commit()
+    return names
+
+
+def queries(names: list, count: int, rng: random.Random) -> list:
+    result = []
+    for i in range(count):
+        full_name = rng.choice(names)
+        first, last = full_name.lower().split()
+        kind = i % 4
+        if kind == 0:
+            result.append(last[:rng.randint(3, 6)])
+        elif kind == 1:
+            result.append(full_name)
+        elif kind == 2:
+            result.append(f"{first} {rng.choice(SPECIALIZATIONS)[:4].lower()}")
+        else:
+            result.append(f"+1555{rng.randint(0, len(names) - 1):07d}"[:rng.randint(8, 11)])
+    return result
+
+
+async def run(rows: int, count: int) -> dict:
+    rng = random.Random(7)
+    await create_schema()
+    names = await fill(rows, rng)
+    service = SearchService()
+    terms = iter(queries(names, count + 1, rng))
+
+    async with async_session_maker() as session:
+        start = time.perf_counter()
+        await service.search("doctors", SearchParams(q=next(terms)), session)
+        first = time.perf_counter() - start
+
+        async def search():
+            await service.search("doctors", SearchParams(q=next(terms)), session)
+
+        samples = await timed(search, count)
+
+    result = {
+        "rows": rows,
+        "backend": session.get_bind().dialect.name,
+        "first_query_ms": round(first * 1000, 1),
+        "index": search_indexes.stats(),
+        "search": summarize(samples),
+        "target_p95_ms": TARGET_MS,
+    }
+    result["ok"] = result["search"]["p95_ms"] < TARGET_MS
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=400)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.rows, args.queries))
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Cold start of the app: eager routers and create_all vs lazy routers at the Alembic head.
+
+    python -m benchmarks.startup [--runs N] [--target PERCENT] [--max-ms MS]
+
+Prepares a SQLite database with every table created and ``alembic_version``
+stamped at the migration head, then starts fresh interpreters against it,
+alternating ``--runs`` times between:
+
+* ``eager``: ``LAZY_ROUTERS=false`` and ``DB_SCHEMA_INIT=create_all``, the
+  way the app always started;
+* ``fast``: ``LAZY_ROUTERS=true`` and ``DB_SCHEMA_INIT=auto``, so the router
+  modules are not imported and create_all is skipped because the database
+  is at the head.
+
+Each child imports ``src.main``, runs the startup handlers and serves one
+``GET /api/patients/search`` without a token (a 401, but the router is
+resolved and imported by then), then reports ``GET /health/startup``. The
+parent times the whole thing from spawning the process to the child's
+report, which is what a restarted worker costs before it answers. Also
+prints where ``import src.main`` spends its time, from ``-X importtime``,
+summed per package.
+
+Exits non-zero unless the median fast start is at least ``--target``
+percent quicker than the median eager one, and, with ``--max-ms``, under
+that many milliseconds.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+MODES = {
+    "eager": {"LAZY_ROUTERS": "false", "DB_SCHEMA_INIT": "create_all"},
+    "fast": {"LAZY_ROUTERS": "true", "DB_SCHEMA_INIT": "auto"},
+}
+
+FIRST_REQUEST = "/api/patients/search?q=ab"
+DEFAULT_TARGET = 10.0
+
+
+def child():
+    """Run in the spawned interpreter: start the app and report timings."""
+    start = time.perf_counter()
+    import asyncio
+
+    import httpx
+
+    from src.main import app
+
+    async def serve():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+                first = time.perf_counter()
+                response = await client.get(FIRST_REQUEST)
+                first_request = time.perf_counter() - first
+                stats = (await client.get("/health/startup")).json()
+        return {
+            "first_request_status": response.status_code,
+            "first_request_ms": round(first_request * 1000, 2),
+            "total_ms": round((time.perf_counter() - start) * 1000, 2),
+            **stats,
+        }
+
+    print(json.dumps(asyncio.run(serve())))
+
+
+def prepare_database(path: str) -> str:
+    """A SQLite database with every table, stamped at the Alembic head."""
+    from sqlalchemy import create_engine, text
+    from sqlmodel import SQLModel
+
+    import src.db.main  # noqa: F401  (registers every model on the metadata)
+    from src.db.schema import VERSION_TABLE, migration_heads
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        SQLModel.metadata.create_all(conn)
+        conn.execute(text(f"CREATE TABLE {VERSION_TABLE} (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        for head in migration_heads():
+            conn.execute(text(f"INSERT INTO {VERSION_TABLE} (version_num) VALUES (:head)"), {"head": head})
+    engine.dispose()
+    return f"sqlite+aiosqlite:///{path}"
+
+
+def child_env(database_url: str, mode: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url, **MODES[mode])
+    env.setdefault("REDIS_URL", "")
+    env.setdefault("JWT_SECRET", "medichain-benchmark-secret-0123456789")
+    return env
+
+
+def start_once(database_url: str, mode: str) -> dict:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        env=child_env(database_url, mode), capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {"wall_ms": round(wall * 1000, 2), **report}
+
+
+def import_breakdown(database_url: str, top: int = 15) -> list:
+    """Self time of ``import src.main`` per package, in milliseconds."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        env=child_env(database_url, "eager"), capture_output=True, text=True, check=True,
+    )
+    totals = defaultdict(int)
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        parts = name.strip().split(".")
+        package = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+        totals[package] += int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: -item[1])[:top]
+    return [{"package": package, "self_ms": round(us / 1000, 1)} for package, us in ranked]
+
+
+def median_of(runs: list, key: str) -> float:
+    return round(statistics.median(run[key] for run in runs), 2)
+
+
+def run(runs: int, target: float, max_ms: float = None) -> dict:
+    with tempfile.TemporaryDirectory(prefix="medichain-startup-") as directory:
+        database_url = prepare_database(os.path.join(directory, "startup.db"))
+        start_once(database_url, "eager")  # warm the bytecode and OS caches
+        results = {mode: [] for mode in MODES}
+        for _ in range(runs):
+            for mode in MODES:
+                results[mode].append(start_once(database_url, mode))
+        imports = import_breakdown(database_url)
+
+    summary = {}
+    for mode, mode_runs in results.items():
+        last = mode_runs[-1]
+        summary[mode] = {
+            "wall_ms": median_of(mode_runs, "wall_ms"),
+            "import_ms": median_of(mode_runs, "import_ms"),
+            "ready_ms": median_of(mode_runs, "ready_ms"),
+            "first_request_ms": median_of(mode_runs, "first_request_ms"),
+            "schema": last["schema"],
+            "steps_ms": last["steps_ms"],
+            "router_imports_ms": last["router_imports_ms"],
+        }
+    eager, fast = summary["eager"]["wall_ms"], summary["fast"]["wall_ms"]
+    improvement = round((eager - fast) / eager * 100, 1)
+    ok = improvement >= target and (max_ms is None or fast <= max_ms)
+    return {
+        "runs": runs,
+        "modes": summary,
+        "improvement_percent": improvement,
+        "target_percent": target,
+        "max_ms": max_ms,
+        "import_breakdown": imports,
+        "ok": ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET,
+                        help="required wall-time improvement of fast over eager, in percent")
+    parser.add_argument("--max-ms", type=float, default=None, help="optional ceiling on the fast start")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+    result = run(args.runs, args.target, args.max_ms)
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
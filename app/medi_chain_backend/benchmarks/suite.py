@@ -0,0 +1,361 @@
+"""Micro-benchmarks of auth, the service layer and serialization, checked against a baseline.
+
+    python -m benchmarks.suite [--backend sqlite|postgres|all] [--sizes 10,1000,100000]
+                               [--only TEXT] [--scale X] [--output FILE]
+                               [--baseline FILE] [--threshold PERCENT] [--update-baseline]
+                               [--postgres-url URL]
+
+Cases (p50/p95/mean each):
+
+* ``auth.*``: ``create_access_token``, ``decode_token``, ``verify_password``;
+* ``create.*``: every ``*Service.create_*``, one session and commit per call;
+* ``list.*[N]``: the first page of the patient/doctor/actor list queries
+  with N matching rows in the table;
+* ``serialize.appointments[N]``: ``json_response`` of N ``AppointmentResponse`` rows.
+
+Every backend runs in its own process on a fresh database: a temporary
+SQLite file, and for Postgres ``--postgres-url`` (its tables are dropped)
+or else an ephemeral cluster started with ``initdb``/``pg_ctl`` when they
+are on ``PATH``. Postgres is skipped, not failed, when neither is there.
+
+The p50 of each case is compared with ``--baseline`` (``baseline.json``
+next to this file, one section per backend); the run exits non-zero when a
+case is more than ``--threshold`` percent slower. Cases missing from the
+baseline are reported but never fail. Timings depend on the machine:
+record the baseline on the machine that checks it with ``--update-baseline``.
+``--scale`` multiplies the iteration counts.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from benchmarks.common import create_schema, summarize, timed
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = (10, 1000, 100_000)
+DEFAULT_THRESHOLD = 50.0
+# Differences below this are noise whatever the ratio.
+MIN_DELTA_MS = 0.05
+INSERT_BATCH = 10_000
+BACKENDS = ("sqlite", "postgres")
+
+
+def iterations(base: int, scale: float) -> int:
+    return max(3, round(base * scale))
+
+
+class Suite:
+    def __init__(self, only: Optional[str], scale: float):
+        self.only = only
+        self.scale = scale
+        self.results: Dict[str, dict] = {}
+
+    def wanted(self, name: str) -> bool:
+        return self.only is None or self.only in name
+
+    async def measure(self, name: str, call: Callable, count: int):
+        if not self.wanted(name):
+            return
+        await call()
+        self.results[name] = summarize(await timed(call, iterations(count, self.scale)))
+
+
+def sync(function, *args):
+    async def call():
+        function(*args)
+
+    return call
+
+
+async def auth_cases(suite: Suite):
+    from src.utils import create_access_token, decode_token, generate_password_hash, verify_password
+
+    user = {"email": "bench@example.com", "id": str(uuid.uuid4())}
+    token = create_access_token(user)
+    password_hash = generate_password_hash("benchmark-password")
+    await suite.measure("auth.create_access_token", sync(create_access_token, user), 2000)
+    await suite.measure("auth.decode_token", sync(decode_token, token), 2000)
+    await suite.measure("auth.verify_password", sync(verify_password, "benchmark-password", password_hash), 20)
+
+
+async def insert_people(count: int):
+    from sqlalchemy import insert
+
+    from src.db.main import async_session_maker
+    from src.doctors.models import Doctor
+    from src.patients.models import Patient
+
+    doctor_id = uuid.uuid4()
+    patient_ids = [uuid.uuid4() for _ in range(count)]
+    async with async_session_maker() as session:
+        await session.execute(insert(Doctor), [{
+            "id": doctor_id, "full_name": "Bench Doctor", "email": f"doctor-{doctor_id}@example.com",
+            "password_hash": "x", "specialization": "GP", "hospital_name": "General",
+        }])
+        await session.execute(insert(Patient), [
+            {"id": patient_id, "full_name": "Bench Patient", "email": f"patient-{patient_id}@example.com", "password_hash": "x"}
+            for patient_id in patient_ids
+        ])
+        await session.commit()
+    return doctor_id, patient_ids
+
+
+async def create_cases(suite: Suite):
+    from src.appointments.schemas import AppointmentCreate
+    from src.appointments.service import AppointmentService
+    from src.audit_logs.schemas import AuditLogCreate
+    from src.audit_logs.service import AuditLogService
+    from src.availability.index import SlotIndex
+    from src.availability.models import DoctorSchedule
+    from src.consents.schemas import ConsentCreate
+    from src.consents.service import ConsentService
+    from src.db.main import async_session_maker
+    from src.doctor_patient.schemas import DoctorPatientCreate
+    from src.doctor_patient.service import DoctorPatientService
+    from src.lab_reports.schemas import LabReportCreate
+    from src.lab_reports.service import LabReportService
+    from src.prescriptions.schemas import PrescriptionCreate
+    from src.prescriptions.service import PrescriptionService
+
+    count = iterations(200, suite.scale)
+    # One call more than timed: measure() warms up first.
+    doctor_id, (patient_id, *others) = await insert_people(count + 2)
+    # Bookings must fall on the (default) schedule's slots.
+    schedule = SlotIndex(DoctorSchedule(doctor_id=doctor_id))
+    starts = (datetime(2030, 1, 1) + i * schedule.slot for i in itertools.count())
+    slots = (start for start in starts if schedule.is_slot(start))
+    # Consents and doctor-patient links are unique per pair; the other
+    # cases all use (and link) patient_id.
+    consent_patients, link_patients = iter(others), iter(others)
+
+    def create(method: Callable, make_data: Callable):
+        async def call():
+            async with async_session_maker() as session:
+                await method(make_data(), session)
+
+        return call
+
+    cases = [
+        ("create.appointment", AppointmentService().create_appointment, lambda: AppointmentCreate(
+            patient_id=patient_id, doctor_id=doctor_id, appointment_date=next(slots), reason="check-up")),
+        ("create.audit_log", AuditLogService().create_audit_log, lambda: AuditLogCreate(
+            actor_id=doctor_id, action="CREATE_APPOINTMENT", target_type="appointment", target_id=uuid.uuid4())),
+        ("create.consent", ConsentService().create_consent, lambda: ConsentCreate(
+            patient_id=next(consent_patients), doctor_id=doctor_id)),
+        ("create.doctor_patient", DoctorPatientService().create_doctor_patient, lambda: DoctorPatientCreate(
+            patient_id=next(link_patients), doctor_id=doctor_id)),
+        ("create.lab_report", LabReportService().create_lab_report, lambda: LabReportCreate(
+            patient_id=patient_id, doctor_id=doctor_id, file_url="https://example.com/report.pdf", report_type="blood")),
+        ("create.prescription", PrescriptionService().create_prescription, lambda: PrescriptionCreate(
+            patient_id=patient_id, doctor_id=doctor_id, medication="Amoxicillin", dosage="500 mg")),
+    ]
+    for name, method, make_data in cases:
+        await suite.measure(name, create(method, make_data), 200)
+
+
+async def list_cases(suite: Suite, size: int):
+    from sqlalchemy import insert
+
+    from src.appointments.models import Appointment
+    from src.appointments.service import AppointmentService
+    from src.audit_logs.models import AuditLog
+    from src.audit_logs.service import AuditLogService
+    from src.db.main import async_session_maker
+    from src.pagination import DEFAULT_PAGE_LIMIT, PageParams
+    from src.prescriptions.models import Prescription
+    from src.prescriptions.service import PrescriptionService
+
+    if not any(suite.wanted(f"list.{kind}[{size}]") for kind in ("prescriptions_by_patient", "appointments_by_doctor", "audit_logs_by_actor")):
+        return
+    doctor_id, (patient_id,) = await insert_people(1)
+    base = datetime(2026, 1, 1)
+    tables = {
+        Prescription: lambda i: {"id": uuid.uuid4(), "patient_id": patient_id, "doctor_id": doctor_id,
+                                 "medication": "m", "dosage": "1", "created_at": base + timedelta(seconds=i)},
+        Appointment: lambda i: {"id": uuid.uuid4(), "patient_id": patient_id, "doctor_id": doctor_id,
+                                "appointment_date": base + timedelta(minutes=30 * i), "created_at": base + timedelta(seconds=i)},
+        AuditLog: lambda i: {"id": uuid.uuid4(), "actor_id": doctor_id, "action": "CREATE_APPOINTMENT",
+                             "target_type": "appointment", "timestamp": base + timedelta(seconds=i)},
+    }
+    async with async_session_maker() as session:
+        for model, row in tables.items():
+            for start in range(0, size, INSERT_BATCH):
+                await session.execute(insert(model), [row(i) for i in range(start, min(start + INSERT_BATCH, size))])
+        await session.commit()
+
+    def first_page(method: Callable, owner_id: uuid.UUID):
+        async def call():
+            async with async_session_maker() as session:
+                await method(owner_id, session, PageParams(limit=DEFAULT_PAGE_LIMIT))
+
+        return call
+
+    await suite.measure(f"list.prescriptions_by_patient[{size}]",
+                        first_page(PrescriptionService().get_prescriptions_by_patient, patient_id), 200)
+    await suite.measure(f"list.appointments_by_doctor[{size}]",
+                        first_page(AppointmentService().get_appointments_by_doctor, doctor_id), 200)
+    await suite.measure(f"list.audit_logs_by_actor[{size}]",
+                        first_page(AuditLogService().get_audit_logs_by_actor, doctor_id), 200)
+
+
+async def serialization_cases(suite: Suite, size: int):
+    from benchmarks.serialization import make_rows
+    from src.appointments.schemas import AppointmentResponse
+    from src.serialization import json_response
+
+    name = f"serialize.appointments[{size}]"
+    if suite.wanted(name):
+        rows = make_rows(size)
+        await suite.measure(name, sync(json_response, AppointmentResponse, rows, None, True), min(2000, max(5, 200_000 // size)))
+
+
+async def run_cases(sizes: List[int], only: Optional[str] = None, scale: float = 1.0) -> dict:
+    """Run every case on the database ``DATABASE_URL`` points at (schema recreated)."""
+    from src.db.main import async_engine
+
+    await create_schema()
+    suite = Suite(only, scale)
+    await auth_cases(suite)
+    await create_cases(suite)
+    for size in sizes:
+        await list_cases(suite, size)
+        await serialization_cases(suite, size)
+    return {"dialect": async_engine.dialect.name, "cases": suite.results}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> dict:
+    """Cases whose p50 is more than ``threshold`` percent over the baseline."""
+    regressions, missing = [], []
+    for backend, result in results.items():
+        expected = baseline.get(backend, {})
+        for name, summary in result.get("cases", {}).items():
+            if name not in expected:
+                missing.append(f"{backend}:{name}")
+                continue
+            before, after = expected[name]["p50_ms"], summary["p50_ms"]
+            change = (after / before - 1) * 100 if before else 0.0
+            if change > threshold and after - before > MIN_DELTA_MS:
+                regressions.append({"case": f"{backend}:{name}", "baseline_p50_ms": before,
+                                    "p50_ms": after, "change_percent": round(change, 1)})
+    return {"threshold_percent": threshold, "regressions": regressions, "missing_from_baseline": missing}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def ephemeral_postgres() -> Iterator[Optional[str]]:
+    """URL of a throwaway local Postgres cluster, or None without ``initdb``/``pg_ctl``."""
+    initdb, pg_ctl = shutil.which("initdb"), shutil.which("pg_ctl")
+    if not initdb or not pg_ctl:
+        yield None
+        return
+    directory = tempfile.mkdtemp(prefix="medichain-pg-")
+    data, port = os.path.join(directory, "data"), free_port()
+    try:
+        subprocess.run([initdb, "-D", data, "-U", "bench", "--auth=trust"], check=True, capture_output=True)
+        subprocess.run(
+            [pg_ctl, "-D", data, "-w", "-l", os.path.join(directory, "server.log"), "start",
+             "-o", f"-p {port} -c listen_addresses=127.0.0.1 -k {directory}"],
+            check=True, capture_output=True,
+        )
+        try:
+            yield f"postgresql+asyncpg://bench@127.0.0.1:{port}/postgres"
+        finally:
+            subprocess.run([pg_ctl, "-D", data, "-m", "immediate", "stop"], capture_output=True)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_backend(database_url: str, args) -> dict:
+    """Run the cases in a fresh process, since the engine is bound at import."""
+    command = [sys.executable, "-m", "benchmarks.suite", "--worker", "--sizes", ",".join(map(str, args.sizes)),
+               "--scale", str(args.scale)]
+    if args.only:
+        command += ["--only", args.only]
+    # No outside services: a REDIS_URL from .env is ignored unless exported.
+    env = {**os.environ, "DATABASE_URL": database_url, "REDIS_URL": os.environ.get("REDIS_URL", "")}
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    return json.loads(completed.stdout)
+
+
+def run(args) -> dict:
+    results = {}
+    backends = BACKENDS if args.backend == "all" else (args.backend,)
+    if "sqlite" in backends:
+        directory = tempfile.mkdtemp(prefix="medichain-suite-")
+        try:
+            results["sqlite"] = run_backend(f"sqlite+aiosqlite:///{directory}/suite.db", args)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    if "postgres" in backends:
+        if args.postgres_url:
+            results["postgres"] = run_backend(args.postgres_url, args)
+        else:
+            with ephemeral_postgres() as url:
+                results["postgres"] = (
+                    run_backend(url, args) if url else {"skipped": "no --postgres-url and no initdb/pg_ctl on PATH"}
+                )
+
+    output = {"backends": results}
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as source:
+            baseline = json.load(source)
+    if args.update_baseline:
+        for backend, result in results.items():
+            if "cases" in result:
+                baseline[backend] = {name: {"p50_ms": case["p50_ms"]} for name, case in sorted(result["cases"].items())}
+        with open(args.baseline, "w") as target:
+            json.dump(baseline, target, indent=2)
+            target.write("\n")
+    output["comparison"] = compare(results, baseline, args.threshold)
+    output["ok"] = not output["comparison"]["regressions"] and not any("error" in result for result in results.values())
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=[*BACKENDS, "all"], default="sqlite")
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", help="run only the cases whose name contains this text")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--postgres-url")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_cases(args.sizes, args.only, args.scale))))
+        return
+
+    result = run(args)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as target:
+            target.write(text + "\n")
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Shared fixtures for the offline test modules.
+
+The older ``test_*.py`` scripts talk to a server on localhost:8000. The
+modules that use these fixtures run in-process against a throwaway SQLite
+database instead (or ``TEST_DATABASE_URL`` when it is set).
+"""
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+_tmp_dir = tempfile.mkdtemp(prefix="medichain-test-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite+aiosqlite:///{_tmp_dir}/test.db"
+)
+os.environ.setdefault("JWT_SECRET", "medichain-offline-test-secret-0123456789")
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    """Run a coroutine on the shared loop (the engine's pool is bound to it)."""
+    return loop.run_until_complete
+
+
+@pytest.fixture
+def db(run):
+    from sqlmodel import SQLModel
+    from src.db.main import async_engine
+
+    async def reset():
+        async with async_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    run(reset())
+    return async_engine
+
+
+@pytest.fixture
+def count_round_trips():
+    """``with count_round_trips(engine) as (statements, commits)`` records the
+    first keyword of every statement ``engine`` runs and each commit."""
+
+    @contextmanager
+    def count(engine):
+        from sqlalchemy import event
+
+        statements, commits = [], []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0].upper())
+
+        def on_commit(conn):
+            commits.append(1)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+        event.listen(engine.sync_engine, "commit", on_commit)
+        try:
+            yield statements, commits
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+            event.remove(engine.sync_engine, "commit", on_commit)
+
+    return count
+
+
+@pytest.fixture
+def client(db, run):
+    import httpx
+    from src.main import app
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture
+def seed(db, run):
+    """Insert a patient and a doctor and return their ids and bearer headers."""
+    from src.db.main import async_session_maker
+    from src.doctors.models import Doctor
+    from src.patients.models import Patient
+    from src.utils import create_access_token
+
+    async def insert():
+        async with async_session_maker() as session:
+            patient = Patient(full_name="Pat Ient", email="patient@example.com", password_hash="x")
+            doctor = Doctor(
+                full_name="Doc Tor", email="doctor@example.com", password_hash="x",
+                specialization="Cardiology", hospital_name="General",
+            )
+            session.add_all([patient, doctor])
+            await session.commit()
+            return patient.id, doctor.id
+
+    patient_id, doctor_id = run(insert())
+
+    def headers(user_id):
+        token = create_access_token({"email": "user@example.com", "id": str(user_id)})
+        return {"Authorization": f"Bearer {token}"}
+
+    return {
+        "patient_id": patient_id,
+        "doctor_id": doctor_id,
+        "patient_headers": headers(patient_id),
+        "doctor_headers": headers(doctor_id),
+    }
+
+
+@pytest.fixture
+def shared_response_cache(monkeypatch):
+    """Treat the in-process response cache as shared, as it is with Redis, so
+    access-filtered listings are cached too."""
+    from src.response_cache import response_cache
+
+    monkeypatch.setattr(response_cache, "backend_name", "redis")
+    return response_cache
+
+
+@pytest.fixture
+def grant_access(client, run, seed):
+    """Call to let the seeded doctor read the seeded patient's records.
+
+    The patient links the doctor, as only a link the patient created opens
+    their records (booking or prescribing links do not).
+    """
+    def grant():
+        body = {"doctor_id": str(seed["doctor_id"]), "patient_id": str(seed["patient_id"])}
+        response = run(client.post("/api/doctor-patient/", json=body, headers=seed["patient_headers"]))
+        assert response.status_code == 200
+        return response.json()
+
+    return grant
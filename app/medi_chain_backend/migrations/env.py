@@ -23,6 +23,11 @@ from src.prescriptions.models import Prescription
 from src.lab_reports.models import LabReport
 from src.consents.models import Consent
 from src.audit_logs.models import AuditLog
+from src.doctor_patient.models import DoctorPatient
+from src.dashboard.models import DoctorCounters, DoctorDailyAppointments
+from src.availability.models import DoctorSchedule
+from src.versions.models import CollectionVersion
+from src.imports.models import ImportJob
 from sqlmodel import SQLModel
 
 target_metadata = SQLModel.metadata
@@ -0,0 +1,55 @@
+"""Keyset pagination indexes
+
+Revision ID: a1f3c9d2b7e4
+Revises: 74179f585413
+Create Date: 2026-10-18 09:12:40.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c9d2b7e4'
+down_revision = '74179f585413'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) backing the paginated list endpoints,
+# which filter on an owner column and order by (timestamp, id).
+KEYSET_INDEXES = [
+    ("ix_appointments_patient_created", "appointments", ["patient_id", "created_at", "id"]),
+    ("ix_appointments_doctor_created", "appointments", ["doctor_id", "created_at", "id"]),
+    ("ix_prescriptions_patient_created", "prescriptions", ["patient_id", "created_at", "id"]),
+    ("ix_prescriptions_doctor_created", "prescriptions", ["doctor_id", "created_at", "id"]),
+    ("ix_lab_reports_patient_uploaded", "lab_reports", ["patient_id", "uploaded_at", "id"]),
+    ("ix_lab_reports_doctor_uploaded", "lab_reports", ["doctor_id", "uploaded_at", "id"]),
+    ("ix_consents_patient_created", "consents", ["patient_id", "created_at", "id"]),
+    ("ix_consents_doctor_created", "consents", ["doctor_id", "created_at", "id"]),
+    ("ix_doctor_patient_doctor_assigned", "doctor_patient", ["doctor_id", "assigned_at", "id"]),
+    ("ix_doctor_patient_patient_assigned", "doctor_patient", ["patient_id", "assigned_at", "id"]),
+    ("ix_audit_logs_actor_timestamp", "audit_logs", ["actor_id", "timestamp", "id"]),
+    ("ix_audit_logs_action_timestamp", "audit_logs", ["action", "timestamp", "id"]),
+]
+
+
+def upgrade():
+    # Tables may already have been created by SQLModel.metadata.create_all,
+    # so every step here is idempotent.
+    columns = [c["name"] for c in sa.inspect(op.get_bind()).get_columns("consents")]
+    if "created_at" not in columns:
+        op.add_column(
+            "consents",
+            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+
+    for name, table, cols in KEYSET_INDEXES:
+        op.create_index(name, table, cols, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_column("consents", "created_at")
@@ -0,0 +1,53 @@
+"""Patient and doctor search indexes (Postgres only)
+
+Revision ID: a4c8e1f6b3d9
+Revises: e9b4c2d7f1a6
+Create Date: 2026-10-18 17:48:30.119524
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e1f6b3d9'
+down_revision = 'e9b4c2d7f1a6'
+branch_labels = None
+depends_on = None
+
+
+# Same expressions as SEARCH_VECTOR in src/patients/models.py and
+# src/doctors/models.py; the search queries only use these indexes while
+# the expressions match exactly.
+PATIENT_VECTOR = "setweight(to_tsvector('simple', coalesce(full_name, '')), 'A')"
+DOCTOR_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(full_name, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(specialization, '')), 'B')"
+    " || setweight(to_tsvector('simple', coalesce(hospital_name, '')), 'C')"
+)
+
+SEARCH_INDEXES = [
+    ("ix_patients_search", "patients", f"USING gin (({PATIENT_VECTOR}))"),
+    ("ix_patients_full_name_trgm", "patients", "USING gin (full_name gin_trgm_ops)"),
+    ("ix_patients_phone_prefix", "patients", "(phone varchar_pattern_ops)"),
+    ("ix_doctors_search", "doctors", f"USING gin (({DOCTOR_VECTOR}))"),
+    ("ix_doctors_full_name_trgm", "doctors", "USING gin (full_name gin_trgm_ops)"),
+    ("ix_doctors_phone_prefix", "doctors", "(phone varchar_pattern_ops)"),
+]
+
+
+def upgrade():
+    # SQLite searches through the in-process index instead.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, definition in SEARCH_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for name, _, _ in reversed(SEARCH_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
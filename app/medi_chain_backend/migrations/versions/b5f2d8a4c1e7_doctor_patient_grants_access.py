@@ -0,0 +1,33 @@
+"""Doctor-patient links created by the patient
+
+Revision ID: b5f2d8a4c1e7
+Revises: a4c8e1f6b3d9
+Create Date: 2026-10-18 19:05:42.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5f2d8a4c1e7'
+down_revision = 'a4c8e1f6b3d9'
+branch_labels = None
+depends_on = None
+
+
+# Existing links cannot be told apart from those booking or prescribing
+# created, so none of them grants access after the upgrade; a patient
+# restores a doctor's access by creating the link (or granting consent).
+def upgrade():
+    columns = [c["name"] for c in sa.inspect(op.get_bind()).get_columns("doctor_patient")]
+    if "grants_access" not in columns:
+        op.add_column(
+            "doctor_patient",
+            sa.Column("grants_access", sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+
+
+def downgrade():
+    op.drop_column("doctor_patient", "grants_access")
@@ -0,0 +1,32 @@
+"""Per-collection version counters for ETags
+
+Revision ID: b8d4e2f6a9c3
+Revises: f2a6c8e4d1b9
+Create Date: 2026-10-18 15:06:27.318594
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d4e2f6a9c3'
+down_revision = 'f2a6c8e4d1b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'collection_versions',
+        sa.Column('resource', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('owner_id', sa.Uuid(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('resource', 'owner_id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('collection_versions', if_exists=True)
@@ -0,0 +1,33 @@
+"""One booking per doctor and slot
+
+Revision ID: c3e9a7d5b2f8
+Revises: b5f2d8a4c1e7
+Create Date: 2026-10-18 20:14:09.663052
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e9a7d5b2f8'
+down_revision = 'b5f2d8a4c1e7'
+branch_labels = None
+depends_on = None
+
+
+# Partial, so a cancelled appointment does not hold its slot. Double bookings
+# already in the table must be cancelled before upgrading.
+NOT_CANCELLED = sa.text("status != 'cancelled'")
+
+
+def upgrade():
+    op.create_index(
+        "uq_appointments_doctor_slot", "appointments", ["doctor_id", "appointment_date"], unique=True,
+        sqlite_where=NOT_CANCELLED, postgresql_where=NOT_CANCELLED, if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index("uq_appointments_doctor_slot", table_name="appointments", if_exists=True)
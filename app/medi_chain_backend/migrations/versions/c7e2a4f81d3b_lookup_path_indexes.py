@@ -0,0 +1,40 @@
+"""Lookup path indexes and doctor/patient pair uniqueness
+
+Revision ID: c7e2a4f81d3b
+Revises: a1f3c9d2b7e4
+Create Date: 2026-10-18 10:03:55.907113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a4f81d3b'
+down_revision = 'a1f3c9d2b7e4'
+branch_labels = None
+depends_on = None
+
+
+# (patient_id, created_at), (actor_id, timestamp) and (action, timestamp)
+# are covered by the keyset indexes of a1f3c9d2b7e4.
+LOOKUP_INDEXES = [
+    ("ix_appointments_doctor_date", "appointments", ["doctor_id", "appointment_date"], False),
+    # The pair lookups in create_doctor_patient / create_consent. Unique
+    # indexes rather than constraints so SQLite can add them in place;
+    # ON CONFLICT (doctor_id, patient_id) can target either. Any duplicate
+    # pairs must be removed before upgrading.
+    ("uq_doctor_patient_pair", "doctor_patient", ["doctor_id", "patient_id"], True),
+    ("uq_consents_doctor_patient", "consents", ["doctor_id", "patient_id"], True),
+]
+
+
+def upgrade():
+    for name, table, cols, unique in LOOKUP_INDEXES:
+        op.create_index(name, table, cols, unique=unique, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(LOOKUP_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
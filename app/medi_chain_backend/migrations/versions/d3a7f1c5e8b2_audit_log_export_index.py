@@ -0,0 +1,25 @@
+"""Audit log (timestamp, id) index for date-range exports
+
+Revision ID: d3a7f1c5e8b2
+Revises: b8d4e2f6a9c3
+Create Date: 2026-10-18 16:12:40.553219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7f1c5e8b2'
+down_revision = 'b8d4e2f6a9c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_audit_logs_timestamp', 'audit_logs', ['timestamp', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_audit_logs_timestamp', table_name='audit_logs', if_exists=True)
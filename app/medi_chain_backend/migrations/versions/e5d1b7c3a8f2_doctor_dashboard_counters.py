@@ -0,0 +1,44 @@
+"""Doctor dashboard counters
+
+Revision ID: e5d1b7c3a8f2
+Revises: c7e2a4f81d3b
+Create Date: 2026-10-18 11:20:14.334871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5d1b7c3a8f2'
+down_revision = 'c7e2a4f81d3b'
+branch_labels = None
+depends_on = None
+
+
+# The tables start empty; run ``python -m src.dashboard.rebuild`` once after
+# upgrading a database that already holds appointments or prescriptions.
+def upgrade():
+    op.create_table(
+        'doctor_counters',
+        sa.Column('doctor_id', sa.Uuid(), nullable=False),
+        sa.Column('active_patients', sa.Integer(), nullable=False),
+        sa.Column('pending_consents', sa.Integer(), nullable=False),
+        sa.Column('prescriptions', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('doctor_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'doctor_daily_appointments',
+        sa.Column('doctor_id', sa.Uuid(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('appointments', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('doctor_id', 'day'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('doctor_daily_appointments', if_exists=True)
+    op.drop_table('doctor_counters', if_exists=True)
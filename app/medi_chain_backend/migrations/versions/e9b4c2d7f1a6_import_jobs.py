@@ -0,0 +1,42 @@
+"""Bulk account import jobs
+
+Revision ID: e9b4c2d7f1a6
+Revises: d3a7f1c5e8b2
+Create Date: 2026-10-18 17:02:11.804316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4c2d7f1a6'
+down_revision = 'd3a7f1c5e8b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column('source', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+        sa.Column('format', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('errors', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('remove_source', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('import_jobs', if_exists=True)
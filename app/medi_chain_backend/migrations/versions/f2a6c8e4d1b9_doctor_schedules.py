@@ -0,0 +1,35 @@
+"""Doctor working hours and slot length
+
+Revision ID: f2a6c8e4d1b9
+Revises: e5d1b7c3a8f2
+Create Date: 2026-10-18 12:41:52.107463
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6c8e4d1b9'
+down_revision = 'e5d1b7c3a8f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'doctor_schedules',
+        sa.Column('doctor_id', sa.Uuid(), nullable=False),
+        sa.Column('work_start', sa.Time(), nullable=False),
+        sa.Column('work_end', sa.Time(), nullable=False),
+        sa.Column('slot_minutes', sa.Integer(), nullable=False),
+        sa.Column('working_days', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id']),
+        sa.PrimaryKeyConstraint('doctor_id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('doctor_schedules', if_exists=True)
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional
@@ -6,8 +7,23 @@ from src.patients.models import Patient
 from src.doctors.models import Doctor
 
 
+# Cancelled appointments do not hold their slot.
+CANCELLED = "cancelled"
+
+
 class Appointment(SQLModel, table=True):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_patient_created", "patient_id", "created_at", "id"),
+        Index("ix_appointments_doctor_created", "doctor_id", "created_at", "id"),
+        Index("ix_appointments_doctor_date", "doctor_id", "appointment_date"),
+        # Bookings start on the doctor's slots, so two that overlap start
+        # together: this is the double-booking check across workers.
+        Index(
+            "uq_appointments_doctor_slot", "doctor_id", "appointment_date", unique=True,
+            sqlite_where=text(f"status != '{CANCELLED}'"), postgresql_where=text(f"status != '{CANCELLED}'"),
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     patient_id: uuid.UUID = Field(foreign_key="patients.id", nullable=False)
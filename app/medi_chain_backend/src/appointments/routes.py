@@ -1,12 +1,19 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from src.db.main import get_session
-from .schemas import AppointmentCreate, AppointmentUpdate, AppointmentResponse
+from src.db.main import get_read_session, get_session
+from .models import Appointment
+from .schemas import AppointmentBulkCreate, AppointmentBulkUpdate, AppointmentCreate, AppointmentUpdate, AppointmentResponse
 from .service import AppointmentService
-from src.dependencies import AccessTokenBearer
+from src.dependencies import AccessTokenBearer, ensure_patient_access, ensure_same_user, require_patient_access
+from src.pagination import PageParams, set_next_cursor
+from src.serialization import json_response
+from src.versions.bumps import doctor_collection, patient_collection
+from src.versions.etags import check_collections, ensure_modified, make_etag, read_current, record_version
+from src.bulk import BulkDelete, BulkResponse
+from src.response_cache import doctor_scope, page_entry, response_cache
 
 appointment_router = APIRouter()
 
@@ -26,38 +33,91 @@ async def create_appointment(
     return new_appointment
 
 
+@appointment_router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_appointments(
+    bulk_data: AppointmentBulkCreate,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    actor_id = uuid.UUID(token_data["user"]["id"]) if "id" in token_data["user"] else None
+    return await appointment_service.bulk_create_appointments(bulk_data, session, actor_id)
+
+
+@appointment_router.put("/bulk", response_model=BulkResponse)
+async def bulk_update_appointments(
+    bulk_data: AppointmentBulkUpdate,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    actor_id = uuid.UUID(token_data["user"]["id"]) if "id" in token_data["user"] else None
+    return await appointment_service.bulk_update_appointments(bulk_data, session, actor_id)
+
+
+@appointment_router.post("/bulk-delete", response_model=BulkResponse)
+async def bulk_delete_appointments(
+    bulk_data: BulkDelete,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    actor_id = uuid.UUID(token_data["user"]["id"]) if "id" in token_data["user"] else None
+    return await appointment_service.bulk_delete_appointments(bulk_data, session, actor_id)
+
+
 @appointment_router.get("/{appointment_id}", response_model=AppointmentResponse)
 async def get_appointment(
     appointment_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    version = await record_version(session, Appointment, uuid.UUID(appointment_id), "appointments")
+    if version is not None:
+        await ensure_patient_access(request, session, token_data, version.patient_id)
+        ensure_modified(request, response, make_etag(request, [version.version]))
     appointment = await appointment_service.get_appointment_by_id(uuid.UUID(appointment_id), session)
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
         )
-    return appointment
+    return json_response(AppointmentResponse, appointment, response)
 
 
 @appointment_router.get("/patient/{patient_id}", response_model=List[AppointmentResponse])
 async def get_appointments_by_patient(
     patient_id: str,
-    session: AsyncSession = Depends(get_session),
-    token_data: dict = Depends(access_token_bearer)
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+    token_data: dict = Depends(require_patient_access)
 ):
-    appointments = await appointment_service.get_appointments_by_patient(uuid.UUID(patient_id), session)
-    return appointments
+    await check_collections(request, response, session, patient_collection("appointments", uuid.UUID(patient_id)))
+    appointments = await appointment_service.get_appointments_by_patient(uuid.UUID(patient_id), session, page)
+    set_next_cursor(response, appointments)
+    return json_response(AppointmentResponse, appointments.items, response, many=True)
 
 
 @appointment_router.get("/doctor/{doctor_id}", response_model=List[AppointmentResponse])
 async def get_appointments_by_doctor(
     doctor_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    appointments = await appointment_service.get_appointments_by_doctor(uuid.UUID(doctor_id), session)
-    return appointments
+    ensure_same_user(token_data, uuid.UUID(doctor_id))
+
+    async def load():
+        versions, appointments = await read_current(
+            session, [doctor_collection("appointments", uuid.UUID(doctor_id))],
+            lambda current: appointment_service.get_appointments_by_doctor(uuid.UUID(doctor_id), current, page, accessible_only=True),
+        )
+        return page_entry(appointments, AppointmentResponse, make_etag(request, versions))
+
+    return await response_cache.respond(
+        request, token_data, doctor_scope("appointments", uuid.UUID(doctor_id)), load, access_filtered=True
+    )
 
 
 @appointment_router.put("/{appointment_id}", response_model=AppointmentResponse)
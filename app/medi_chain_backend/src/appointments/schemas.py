@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
+from src.bulk import MAX_BULK_ITEMS, BulkMode
+
 
 class AppointmentCreate(BaseModel):
     patient_id: uuid.UUID
@@ -19,6 +21,20 @@ class AppointmentUpdate(BaseModel):
     status: Optional[str] = Field(default=None, max_length=50)
 
 
+class AppointmentBulkCreate(BaseModel):
+    items: List[AppointmentCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
+class AppointmentBulkUpdateItem(AppointmentUpdate):
+    id: uuid.UUID
+
+
+class AppointmentBulkUpdate(BaseModel):
+    items: List[AppointmentBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
 class AppointmentResponse(BaseModel):
     id: uuid.UUID
     patient_id: uuid.UUID
@@ -1,70 +1,59 @@
 import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import delete, select
 from fastapi import HTTPException, status
-from .models import Appointment
-from .schemas import AppointmentCreate, AppointmentUpdate
-from src.patients.models import Patient
-from src.doctors.models import Doctor
-from src.doctor_patient.models import DoctorPatient
-from src.doctor_patient.service import DoctorPatientService
+from src.pagination import Page, PageParams, paginate
+from src.consents.access import accessible_patient_ids
+from .models import CANCELLED, Appointment
+from .schemas import AppointmentBulkCreate, AppointmentBulkUpdate, AppointmentCreate, AppointmentUpdate
+from src.bulk import BulkDelete, BulkItemResult, BulkResponse, bulk_response
+from src.validation import ensure_references_exist, existing_references, link_doctor_patient, link_doctor_patient_pairs
 from src.audit_logs.models import AuditLog
-from typing import List, Optional
+from src.audit_logs.sink import audit_sink
+from src.dashboard.counters import CounterUpdates
+from src.availability.index import SlotIndex, booked_slots
+from src.response_cache import doctor_scope, response_cache
+from src.versions.bumps import VersionBumps
+from typing import Optional
 
 
-class AppointmentService:
-    def __init__(self):
-        self.doctor_patient_service = DoctorPatientService()
+def _update_slot(session: AsyncSession, slots: SlotIndex, appointment: Appointment, appointment_date=None, status=None):
+    """Book, move or release ``appointment``'s slot for a date and/or status change.
+
+    Cancelling releases the slot and un-cancelling books it again, so both
+    can raise 409 like a move.
+    """
+    was_cancelled = appointment.status == CANCELLED
+    if (status or appointment.status) == CANCELLED:
+        if not was_cancelled:
+            booked_slots.release(session, appointment.doctor_id, appointment.id)
+    elif appointment_date is not None or was_cancelled:
+        booked_slots.book(session, slots, appointment.id, appointment_date or appointment.appointment_date)
 
+
+class AppointmentService:
     async def get_appointment_by_id(self, appointment_id: uuid.UUID, session: AsyncSession):
         statement = select(Appointment).where(Appointment.id == appointment_id)
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_appointments_by_patient(self, patient_id: uuid.UUID, session: AsyncSession) -> List[Appointment]:
+    async def get_appointments_by_patient(self, patient_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(Appointment).where(Appointment.patient_id == patient_id)
-        result = await session.execute(statement)
-        appointments = result.scalars().all()
-        return list(appointments)
+        return await paginate(session, statement, Appointment.created_at, Appointment.id, page)
 
-    async def get_appointments_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession) -> List[Appointment]:
+    async def get_appointments_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None, accessible_only: bool = False) -> Page:
+        """The doctor's appointments; with ``accessible_only``, only those of patients they may still access."""
         statement = select(Appointment).where(Appointment.doctor_id == doctor_id)
-        result = await session.execute(statement)
-        appointments = result.scalars().all()
-        return list(appointments)
+        if accessible_only:
+            patient_ids = await accessible_patient_ids(session, doctor_id)
+            statement = statement.where(Appointment.patient_id.in_(patient_ids))
+        return await paginate(session, statement, Appointment.created_at, Appointment.id, page)
 
     async def create_appointment(self, appointment_data: AppointmentCreate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None):
-        # Check if patient exists
-        patient_statement = select(Patient).where(Patient.id == appointment_data.patient_id)
-        patient_result = await session.execute(patient_statement)
-        patient = patient_result.scalar_one_or_none()
-        
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-            )
-
-        # Check if doctor exists
-        doctor_statement = select(Doctor).where(Doctor.id == appointment_data.doctor_id)
-        doctor_result = await session.execute(doctor_statement)
-        doctor = doctor_result.scalar_one_or_none()
-        
-        if not doctor:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
-            )
-
-        # Create doctor-patient relationship if it doesn't exist
-        try:
-            from src.doctor_patient.schemas import DoctorPatientCreate
-            doctor_patient_data = DoctorPatientCreate(
-                doctor_id=appointment_data.doctor_id,
-                patient_id=appointment_data.patient_id
-            )
-            await self.doctor_patient_service.create_doctor_patient(doctor_patient_data, session)
-        except Exception as e:
-            # If relationship already exists, that's fine
-            pass
+        await ensure_references_exist(
+            session, patient_id=appointment_data.patient_id, doctor_id=appointment_data.doctor_id
+        )
+        slots = await booked_slots.get(session, appointment_data.doctor_id)
 
         new_appointment = Appointment(
             patient_id=appointment_data.patient_id,
@@ -73,21 +62,36 @@ class AppointmentService:
             reason=appointment_data.reason,
             notes=appointment_data.notes,
         )
+        # Raises 409 if the doctor is already booked at that time.
+        booked_slots.book(session, slots, new_appointment.id, new_appointment.appointment_date)
+
+        counters = CounterUpdates()
+        linked = await link_doctor_patient(session, appointment_data.doctor_id, appointment_data.patient_id)
+        if linked:
+            counters.add(appointment_data.doctor_id, "active_patients")
         session.add(new_appointment)
-        await session.commit()
-        await session.refresh(new_appointment)
-        
-        # Create audit log
+        async with booked_slots.guard(session, [new_appointment.doctor_id]):
+            await session.flush()
+        counters.add_appointment(new_appointment)
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("appointments", new_appointment)
+        if linked:
+            versions.add_link(new_appointment.doctor_id, new_appointment.patient_id)
+        await versions.apply(session)
         if actor_id:
-            audit_log = AuditLog(
+            audit_sink.add(session, AuditLog(
                 actor_id=actor_id,
                 action="CREATE_APPOINTMENT",
                 target_type="appointment",
                 target_id=new_appointment.id
-            )
-            session.add(audit_log)
-            await session.commit()
-        
+            ))
+        await session.commit()
+        await response_cache.invalidate(
+            doctor_scope("appointments", new_appointment.doctor_id),
+            *([doctor_scope("doctor_patient", new_appointment.doctor_id)] if linked else []),
+        )
+
         return new_appointment
 
     async def update_appointment(self, appointment_id: uuid.UUID, appointment_data: AppointmentUpdate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None):
@@ -97,6 +101,12 @@ class AppointmentService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
             )
 
+        counters = CounterUpdates()
+        if appointment_data.appointment_date is not None or appointment_data.status is not None:
+            slots = await booked_slots.get(session, appointment.doctor_id)
+            _update_slot(session, slots, appointment, appointment_data.appointment_date, appointment_data.status)
+        # Moving or (un)cancelling it changes which day it counts for, if any.
+        counters.add_appointment(appointment, -1)
         # Update only provided fields
         if appointment_data.appointment_date is not None:
             appointment.appointment_date = appointment_data.appointment_date
@@ -106,22 +116,26 @@ class AppointmentService:
             appointment.notes = appointment_data.notes
         if appointment_data.status is not None:
             appointment.status = appointment_data.status
+        counters.add_appointment(appointment)
 
         session.add(appointment)
-        await session.commit()
-        await session.refresh(appointment)
-        
-        # Create audit log
+        async with booked_slots.guard(session, [appointment.doctor_id]):
+            await session.flush()
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("appointments", appointment)
+        await versions.apply(session)
         if actor_id:
-            audit_log = AuditLog(
+            audit_sink.add(session, AuditLog(
                 actor_id=actor_id,
                 action="UPDATE_APPOINTMENT",
                 target_type="appointment",
                 target_id=appointment.id
-            )
-            session.add(audit_log)
-            await session.commit()
-        
+            ))
+        await session.commit()
+        await response_cache.invalidate(doctor_scope("appointments", appointment.doctor_id))
+        await session.refresh(appointment)
+
         return appointment
 
     async def delete_appointment(self, appointment_id: uuid.UUID, session: AsyncSession, actor_id: Optional[uuid.UUID] = None):
@@ -132,17 +146,163 @@ class AppointmentService:
             )
 
         await session.delete(appointment)
-        await session.commit()
-        
-        # Create audit log
+        booked_slots.release(session, appointment.doctor_id, appointment.id)
+        counters = CounterUpdates()
+        counters.add_appointment(appointment, -1)
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("appointments", appointment)
+        await versions.apply(session)
         if actor_id:
-            audit_log = AuditLog(
+            audit_sink.add(session, AuditLog(
                 actor_id=actor_id,
                 action="DELETE_APPOINTMENT",
                 target_type="appointment",
                 target_id=appointment_id
-            )
-            session.add(audit_log)
-            await session.commit()
-        
-        return {"message": "Appointment deleted successfully"}
\ No newline at end of file
+            ))
+        await session.commit()
+        await response_cache.invalidate(doctor_scope("appointments", appointment.doctor_id))
+
+        return {"message": "Appointment deleted successfully"}
+
+    async def bulk_create_appointments(self, bulk_data: AppointmentBulkCreate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None) -> BulkResponse:
+        items = bulk_data.items
+        patients, doctors = await existing_references(
+            session, {item.patient_id for item in items}, {item.doctor_id for item in items}
+        )
+
+        slots = await booked_slots.get_many(session, doctors)
+
+        results, new_appointments = [], []
+        for index, item in enumerate(items):
+            if item.patient_id not in patients:
+                results.append(BulkItemResult(index=index, status="error", error="Patient not found"))
+            elif item.doctor_id not in doctors:
+                results.append(BulkItemResult(index=index, status="error", error="Doctor not found"))
+            else:
+                appointment = Appointment(**item.model_dump())
+                try:
+                    booked_slots.book(session, slots[item.doctor_id], appointment.id, appointment.appointment_date)
+                except HTTPException as error:
+                    results.append(BulkItemResult(index=index, status="error", error=error.detail))
+                    continue
+                new_appointments.append(appointment)
+                results.append(BulkItemResult(index=index, id=appointment.id, status="created"))
+        response = await bulk_response(session, bulk_data.mode, results)
+        if not new_appointments:
+            return response
+
+        counters = CounterUpdates()
+        linked = await link_doctor_patient_pairs(session, [(appointment.doctor_id, appointment.patient_id) for appointment in new_appointments])
+        for doctor_id, _ in linked:
+            counters.add(doctor_id, "active_patients")
+        for appointment in new_appointments:
+            counters.add_appointment(appointment)
+        await counters.apply(session)
+        versions = VersionBumps()
+        for appointment in new_appointments:
+            versions.add_record("appointments", appointment)
+        for doctor_id, patient_id in linked:
+            versions.add_link(doctor_id, patient_id)
+        await versions.apply(session)
+        session.add_all(new_appointments)
+        async with booked_slots.guard(session, slots):
+            await session.flush()
+        if actor_id:
+            audit_sink.add_all(session, [
+                AuditLog(actor_id=actor_id, action="CREATE_APPOINTMENT", target_type="appointment", target_id=appointment.id)
+                for appointment in new_appointments
+            ])
+        await session.commit()
+        await response_cache.invalidate(
+            *[doctor_scope("appointments", appointment.doctor_id) for appointment in new_appointments],
+            *[doctor_scope("doctor_patient", doctor_id) for doctor_id, _ in linked],
+        )
+
+        return response
+
+    async def bulk_update_appointments(self, bulk_data: AppointmentBulkUpdate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None) -> BulkResponse:
+        ids = {item.id for item in bulk_data.items}
+        result = await session.execute(select(Appointment).where(Appointment.id.in_(ids)))
+        appointments = {appointment.id: appointment for appointment in result.scalars()}
+        slots = await booked_slots.get_many(session, {appointment.doctor_id for appointment in appointments.values()})
+
+        results, counters = [], CounterUpdates()
+        for index, item in enumerate(bulk_data.items):
+            appointment = appointments.get(item.id)
+            if appointment is None:
+                results.append(BulkItemResult(index=index, id=item.id, status="error", error="Appointment not found"))
+                continue
+            try:
+                _update_slot(session, slots[appointment.doctor_id], appointment, item.appointment_date, item.status)
+            except HTTPException as error:
+                results.append(BulkItemResult(index=index, id=item.id, status="error", error=error.detail))
+                continue
+            # Update only provided fields
+            counters.add_appointment(appointment, -1)
+            for field, value in item.model_dump(exclude={"id"}, exclude_none=True).items():
+                setattr(appointment, field, value)
+            counters.add_appointment(appointment)
+            results.append(BulkItemResult(index=index, id=item.id, status="updated"))
+        response = await bulk_response(session, bulk_data.mode, results)
+
+        updated_ids = {r.id for r in results if r.status == "updated"}
+        async with booked_slots.guard(session, slots):
+            await session.flush()
+        await counters.apply(session)
+        versions = VersionBumps()
+        for appointment_id in updated_ids:
+            versions.add_record("appointments", appointments[appointment_id])
+        await versions.apply(session)
+        if actor_id:
+            audit_sink.add_all(session, [
+                AuditLog(actor_id=actor_id, action="UPDATE_APPOINTMENT", target_type="appointment", target_id=appointment_id)
+                for appointment_id in updated_ids
+            ])
+        await session.commit()
+        await response_cache.invalidate(*[
+            doctor_scope("appointments", appointments[appointment_id].doctor_id) for appointment_id in updated_ids
+        ])
+
+        return response
+
+    async def bulk_delete_appointments(self, bulk_data: BulkDelete, session: AsyncSession, actor_id: Optional[uuid.UUID] = None) -> BulkResponse:
+        ids = set(bulk_data.ids)
+        result = await session.execute(
+            select(Appointment.id, Appointment.patient_id, Appointment.doctor_id, Appointment.appointment_date, Appointment.status)
+            .where(Appointment.id.in_(ids))
+        )
+        found = {row.id: row for row in result}
+
+        results, deleted = [], set()
+        for index, appointment_id in enumerate(bulk_data.ids):
+            if appointment_id not in found or appointment_id in deleted:
+                results.append(BulkItemResult(index=index, id=appointment_id, status="error", error="Appointment not found"))
+            else:
+                deleted.add(appointment_id)
+                results.append(BulkItemResult(index=index, id=appointment_id, status="deleted"))
+        response = await bulk_response(session, bulk_data.mode, results)
+        if not deleted:
+            return response
+
+        await session.execute(delete(Appointment).where(Appointment.id.in_(deleted)))
+        counters = CounterUpdates()
+        for appointment_id in deleted:
+            booked_slots.release(session, found[appointment_id].doctor_id, appointment_id)
+            counters.add_appointment(found[appointment_id], -1)
+        await counters.apply(session)
+        versions = VersionBumps()
+        for appointment_id in deleted:
+            versions.add_record("appointments", found[appointment_id])
+        await versions.apply(session)
+        if actor_id:
+            audit_sink.add_all(session, [
+                AuditLog(actor_id=actor_id, action="DELETE_APPOINTMENT", target_type="appointment", target_id=appointment_id)
+                for appointment_id in deleted
+            ])
+        await session.commit()
+        await response_cache.invalidate(*[
+            doctor_scope("appointments", found[appointment_id].doctor_id) for appointment_id in deleted
+        ])
+
+        return response
\ No newline at end of file
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from datetime import datetime, timezone
 from typing import Optional
@@ -6,6 +7,11 @@ import uuid
 
 class AuditLog(SQLModel, table=True):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_actor_timestamp", "actor_id", "timestamp", "id"),
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp", "id"),
+        Index("ix_audit_logs_timestamp", "timestamp", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     actor_id: uuid.UUID = Field(nullable=False)
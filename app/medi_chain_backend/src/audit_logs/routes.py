@@ -1,12 +1,15 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
 from .schemas import AuditLogCreate, AuditLogResponse
 from .service import AuditLogService
-from src.dependencies import AccessTokenBearer
+from src.dependencies import AccessTokenBearer, caller_id
+from src.exports import ExportParams, export_response
+from src.pagination import PageParams, set_next_cursor
+from src.serialization import json_response
 
 audit_log_router = APIRouter()
 
@@ -24,10 +27,28 @@ async def create_audit_log(
     return new_audit_log
 
 
+@audit_log_router.get("/export")
+async def export_audit_logs(
+    params: ExportParams = Depends(),
+    actor_id: Optional[uuid.UUID] = None,
+    action: Optional[str] = None,
+    token_data: dict = Depends(access_token_bearer)
+):
+    # There are no admin or auditor accounts, so a caller exports only
+    # their own trail: actor_id defaults to them and may not be anyone else.
+    caller = caller_id(token_data)
+    if caller is None or actor_id not in (None, caller):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to export another user's audit logs"
+        )
+    statement = audit_log_service.export_statement(caller, action, params.date_from, params.date_to)
+    return export_response(statement, params, "audit-logs")
+
+
 @audit_log_router.get("/{audit_log_id}", response_model=AuditLogResponse)
 async def get_audit_log(
     audit_log_id: str,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
     audit_log = await audit_log_service.get_audit_log_by_id(uuid.UUID(audit_log_id), session)
@@ -35,27 +56,33 @@ async def get_audit_log(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Audit log not found"
         )
-    return audit_log
+    return json_response(AuditLogResponse, audit_log)
 
 
 @audit_log_router.get("/actor/{actor_id}", response_model=List[AuditLogResponse])
 async def get_audit_logs_by_actor(
     actor_id: str,
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    audit_logs = await audit_log_service.get_audit_logs_by_actor(uuid.UUID(actor_id), session)
-    return audit_logs
+    audit_logs = await audit_log_service.get_audit_logs_by_actor(uuid.UUID(actor_id), session, page)
+    set_next_cursor(response, audit_logs)
+    return json_response(AuditLogResponse, audit_logs.items, response, many=True)
 
 
 @audit_log_router.get("/action/{action}", response_model=List[AuditLogResponse])
 async def get_audit_logs_by_action(
     action: str,
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    audit_logs = await audit_log_service.get_audit_logs_by_action(action, session)
-    return audit_logs
+    audit_logs = await audit_log_service.get_audit_logs_by_action(action, session, page)
+    set_next_cursor(response, audit_logs)
+    return json_response(AuditLogResponse, audit_logs.items, response, many=True)
 
 
 @audit_log_router.delete("/{audit_log_id}")
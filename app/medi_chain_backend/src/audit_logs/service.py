@@ -2,9 +2,11 @@ import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
+from src.pagination import Page, PageParams, paginate
 from .models import AuditLog
 from .schemas import AuditLogCreate
-from typing import List
+from typing import Optional
+from datetime import datetime
 
 
 class AuditLogService:
@@ -13,19 +15,42 @@ class AuditLogService:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_audit_logs_by_actor(self, actor_id: uuid.UUID, session: AsyncSession) -> List[AuditLog]:
+    async def get_audit_logs_by_actor(self, actor_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(AuditLog).where(AuditLog.actor_id == actor_id)
-        result = await session.execute(statement)
-        audit_logs = result.scalars().all()
-        return list(audit_logs)
+        return await paginate(session, statement, AuditLog.timestamp, AuditLog.id, page)
 
-    async def get_audit_logs_by_action(self, action: str, session: AsyncSession) -> List[AuditLog]:
+    async def get_audit_logs_by_action(self, action: str, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(AuditLog).where(AuditLog.action == action)
-        result = await session.execute(statement)
-        audit_logs = result.scalars().all()
-        return list(audit_logs)
+        return await paginate(session, statement, AuditLog.timestamp, AuditLog.id, page)
+
+    def export_statement(
+        self,
+        actor_id: Optional[uuid.UUID] = None,
+        action: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ):
+        """Matching audit logs, oldest first, as plain columns for ``src.exports``."""
+        statement = select(
+            AuditLog.id, AuditLog.timestamp, AuditLog.actor_id, AuditLog.action,
+            AuditLog.target_type, AuditLog.target_id, AuditLog.ip_address,
+        )
+        if actor_id is not None:
+            statement = statement.where(AuditLog.actor_id == actor_id)
+        if action is not None:
+            statement = statement.where(AuditLog.action == action)
+        if date_from is not None:
+            statement = statement.where(AuditLog.timestamp >= date_from)
+        if date_to is not None:
+            statement = statement.where(AuditLog.timestamp < date_to)
+        return statement.order_by(AuditLog.timestamp, AuditLog.id)
 
     async def create_audit_log(self, audit_log_data: AuditLogCreate, session: AsyncSession):
+        """Insert the row in this commit, bypassing ``audit_sink``.
+
+        The caller gets the row back and may read it by id at once, so it
+        must not sit in the write-behind queue.
+        """
         new_audit_log = AuditLog(
             actor_id=audit_log_data.actor_id,
             action=audit_log_data.action,
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from collections import deque
+from typing import List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import config
+from src.db.main import async_engine
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = ["id", "actor_id", "action", "target_type", "target_id", "timestamp", "ip_address"]
+
+
+class AuditSink:
+    """Single entry point for writing audit rows.
+
+    ``transactional`` mode adds the row to the caller's session so it is
+    written by the same commit as the business change. ``write_behind`` mode
+    queues the row once that commit succeeds and a background task inserts
+    queued rows in batches, by size or by interval, as one multi-row INSERT
+    (COPY on asyncpg). Until the flusher is started, and whenever the queue
+    is full, ``write_behind`` falls back to transactional writes so the
+    queue never drops an event; queued rows are still lost if the process
+    dies before they are flushed. ``POST /api/audit-logs/`` does not go
+    through the sink.
+    """
+
+    def __init__(self, mode: str, batch_size: int, flush_interval: float, max_queue: int):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.fallbacks = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add(self, session: AsyncSession, audit_log: AuditLog) -> AuditLog:
+        """Record ``audit_log`` as part of ``session``'s next commit."""
+        if self.mode != "write_behind" or not self.running or len(self._queue) >= self.max_queue:
+            if self.mode == "write_behind":
+                self.fallbacks += 1
+            session.add(audit_log)
+            return audit_log
+
+        pending = session.info.setdefault("pending_audit_logs", [])
+        if not session.info.get("audit_sink_hooked"):
+            event.listen(session.sync_session, "after_commit", self._after_commit)
+            event.listen(session.sync_session, "after_rollback", self._after_rollback)
+            session.info["audit_sink_hooked"] = True
+        pending.append(audit_log)
+        return audit_log
+
+    def add_all(self, session: AsyncSession, audit_logs: List[AuditLog]):
+        for audit_log in audit_logs:
+            self.add(session, audit_log)
+
+    def _after_commit(self, sync_session):
+        pending = sync_session.info.pop("pending_audit_logs", [])
+        for audit_log in pending:
+            self._queue.append({column: getattr(audit_log, column) for column in AUDIT_COLUMNS})
+        if pending and len(self._queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _after_rollback(self, sync_session):
+        sync_session.info.pop("pending_audit_logs", None)
+
+    async def _write(self, rows: List[dict]):
+        async with async_engine.connect() as conn:
+            if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    AuditLog.__tablename__,
+                    records=[tuple(row[column] for column in AUDIT_COLUMNS) for row in rows],
+                    columns=AUDIT_COLUMNS,
+                )
+            else:
+                await conn.execute(insert(AuditLog.__table__), rows)
+                await conn.commit()
+
+    async def flush(self):
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self._write(batch)
+            except asyncio.CancelledError:
+                self._queue.extendleft(reversed(batch))
+                raise
+            except Exception:
+                self.failures += 1
+                logger.exception("Audit log flush failed; %d rows requeued", len(batch))
+                self._queue.extendleft(reversed(batch))
+                return
+            self.flushed += len(batch)
+            self.batches += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        if self.mode == "write_behind" and not self.running:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "running": self.running,
+            "queued": len(self._queue),
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "fallbacks": self.fallbacks,
+        }
+
+
+audit_sink = AuditSink(
+    mode=config.AUDIT_LOG_MODE,
+    batch_size=config.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=config.AUDIT_LOG_FLUSH_INTERVAL,
+    max_queue=config.AUDIT_LOG_MAX_QUEUE,
+)
@@ -0,0 +1,236 @@
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.appointments.models import CANCELLED, Appointment
+from src.config import config
+from src.utils import to_naive_utc
+from .models import DoctorSchedule
+
+SLOT_TAKEN = "Doctor already has an appointment in this slot"
+NOT_A_SLOT = "Appointments must start on one of the doctor's slots within working hours"
+
+# Sorts after every (start, id) pair with the same start.
+_MAX_UUID = uuid.UUID(int=(1 << 128) - 1)
+
+
+class SlotIndex:
+    """One doctor's booked appointments as a sorted array of start times.
+
+    Every booking lasts ``slot`` (the doctor's slot length), so the only
+    bookings that can overlap a new one are its neighbours in start order:
+    a conflict check is two bisects. That holds because bookings start on
+    the schedule's slots and the slot grid cannot change while the doctor
+    has upcoming appointments (see ``AvailabilityService.update_schedule``).
+    """
+
+    def __init__(self, schedule: DoctorSchedule, bookings: Iterable[Tuple[uuid.UUID, datetime]] = ()):
+        self.schedule = schedule
+        self.slot = timedelta(minutes=schedule.slot_minutes)
+        self.loaded_at = time.monotonic()
+        self._entries: List[Tuple[datetime, uuid.UUID]] = sorted(
+            (to_naive_utc(start), appointment_id) for appointment_id, start in bookings
+        )
+        self._starts: Dict[uuid.UUID, datetime] = {appointment_id: start for start, appointment_id in self._entries}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def conflict(self, start: datetime, ignore: Optional[uuid.UUID] = None) -> Optional[uuid.UUID]:
+        """Id of a booking overlapping [start, start + slot), if any."""
+        start = to_naive_utc(start)
+        position = bisect_right(self._entries, (start, _MAX_UUID))
+        before = position - 1
+        if before >= 0 and self._entries[before][1] == ignore:
+            before -= 1
+        if before >= 0 and self._entries[before][0] + self.slot > start:
+            return self._entries[before][1]
+        after = position
+        if after < len(self._entries) and self._entries[after][1] == ignore:
+            after += 1
+        if after < len(self._entries) and self._entries[after][0] < start + self.slot:
+            return self._entries[after][1]
+        return None
+
+    def is_slot(self, start: datetime) -> bool:
+        """Whether ``start`` begins one of the schedule's slots on a working day."""
+        start = to_naive_utc(start)
+        if start.weekday() not in self.schedule.weekdays:
+            return False
+        offset = start - datetime.combine(start.date(), self.schedule.work_start)
+        day_end = datetime.combine(start.date(), self.schedule.work_end)
+        return offset >= timedelta(0) and offset % self.slot == timedelta(0) and start + self.slot <= day_end
+
+    def book(self, appointment_id: uuid.UUID, start: datetime):
+        """Record a booking, or raise 409 if it overlaps an existing one."""
+        if self.conflict(start, ignore=appointment_id) is not None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN)
+        self.release(appointment_id)
+        start = to_naive_utc(start)
+        insort(self._entries, (start, appointment_id))
+        self._starts[appointment_id] = start
+
+    def release(self, appointment_id: uuid.UUID):
+        start = self._starts.pop(appointment_id, None)
+        if start is not None:
+            position = bisect_left(self._entries, (start, appointment_id))
+            del self._entries[position]
+
+    def start_of(self, appointment_id: uuid.UUID) -> Optional[datetime]:
+        return self._starts.get(appointment_id)
+
+    def restore(self, appointment_id: uuid.UUID, start: Optional[datetime]):
+        """Put a booking back where it was, without a conflict check."""
+        self.release(appointment_id)
+        if start is not None:
+            insort(self._entries, (start, appointment_id))
+            self._starts[appointment_id] = start
+
+
+class BookedSlots:
+    """Per-doctor ``SlotIndex`` objects, loaded lazily and bounded in number.
+
+    The appointment service books and releases slots through ``book`` and
+    ``release``, which apply the change at once (so two requests in this
+    process cannot take the same slot) and undo it if the session's
+    transaction ends without committing. An index is reloaded after ``ttl``
+    seconds so bookings made by other workers are picked up.
+
+    Until then another worker's booking is only caught by the database: the
+    partial unique index on (doctor_id, appointment_date) is the
+    authoritative check, and ``guard`` turns its violation into a 409.
+    """
+
+    def __init__(self, ttl: int, max_doctors: int):
+        self.ttl = ttl
+        self.max_doctors = max_doctors
+        self._indexes: "OrderedDict[uuid.UUID, SlotIndex]" = OrderedDict()
+        self.loads = 0
+        self.hits = 0
+
+    def _cached(self, doctor_id: uuid.UUID) -> Optional[SlotIndex]:
+        index = self._indexes.get(doctor_id)
+        if index is not None and time.monotonic() - index.loaded_at < self.ttl:
+            self._indexes.move_to_end(doctor_id)
+            self.hits += 1
+            return index
+        return None
+
+    async def get(self, session: AsyncSession, doctor_id: uuid.UUID) -> SlotIndex:
+        return (await self.get_many(session, [doctor_id]))[doctor_id]
+
+    async def get_many(self, session: AsyncSession, doctor_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, SlotIndex]:
+        """Indexes for ``doctor_ids``; missing ones are loaded with two queries in total."""
+        indexes, missing = {}, set()
+        for doctor_id in set(doctor_ids):
+            index = self._cached(doctor_id)
+            if index is None:
+                missing.add(doctor_id)
+            else:
+                indexes[doctor_id] = index
+        if not missing:
+            return indexes
+
+        schedules = {
+            schedule.doctor_id: schedule
+            for schedule in (await session.execute(
+                select(DoctorSchedule).where(DoctorSchedule.doctor_id.in_(missing))
+            )).scalars()
+        }
+        bookings: Dict[uuid.UUID, list] = {doctor_id: [] for doctor_id in missing}
+        rows = await session.execute(
+            select(Appointment.doctor_id, Appointment.id, Appointment.appointment_date)
+            .where(Appointment.doctor_id.in_(missing), Appointment.status != CANCELLED)
+        )
+        for doctor_id, appointment_id, start in rows:
+            bookings[doctor_id].append((appointment_id, start))
+
+        for doctor_id in missing:
+            schedule = schedules.get(doctor_id) or DoctorSchedule(doctor_id=doctor_id)
+            index = SlotIndex(schedule, bookings[doctor_id])
+            self._indexes[doctor_id] = indexes[doctor_id] = index
+            self.loads += 1
+        while len(self._indexes) > self.max_doctors:
+            self._indexes.popitem(last=False)
+        return indexes
+
+    def book(self, session: AsyncSession, index: SlotIndex, appointment_id: uuid.UUID, start: datetime):
+        """Book ``start``: 409 if it overlaps a booking, 400 if it is not one of the doctor's slots."""
+        previous = index.start_of(appointment_id)
+        index.book(appointment_id, start)
+        if not index.is_slot(start):
+            index.restore(appointment_id, previous)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=NOT_A_SLOT)
+        self._track(session, index, appointment_id, previous)
+
+    @asynccontextmanager
+    async def guard(self, session: AsyncSession, doctor_ids: Iterable[uuid.UUID]):
+        """Answer 409 when the database rejects a booking this process's indexes allowed.
+
+        The doctors' indexes missed another worker's booking, so they are
+        dropped and reloaded on next use.
+        """
+        try:
+            yield
+        except IntegrityError as error:
+            await session.rollback()
+            for doctor_id in doctor_ids:
+                self.invalidate(doctor_id)
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN) from error
+
+    def release(self, session: AsyncSession, doctor_id: uuid.UUID, appointment_id: uuid.UUID):
+        # Nothing to do for doctors without a loaded index: the next load
+        # reads the table after this transaction.
+        index = self._indexes.get(doctor_id)
+        if index is None:
+            return
+        previous = index.start_of(appointment_id)
+        index.release(appointment_id)
+        self._track(session, index, appointment_id, previous)
+
+    def _track(self, session: AsyncSession, index: SlotIndex, appointment_id: uuid.UUID, previous: Optional[datetime]):
+        if not session.info.get("slot_index_hooked"):
+            event.listen(session.sync_session, "after_commit", self._after_commit)
+            event.listen(session.sync_session, "after_transaction_end", self._after_transaction_end)
+            session.info["slot_index_hooked"] = True
+        session.info.setdefault("slot_index_undo", []).append((index, appointment_id, previous))
+
+    @staticmethod
+    def _after_commit(sync_session):
+        sync_session.info.pop("slot_index_undo", None)
+
+    @staticmethod
+    def _after_transaction_end(sync_session, transaction):
+        if transaction.parent is None:
+            for index, appointment_id, previous in reversed(sync_session.info.pop("slot_index_undo", [])):
+                index.restore(appointment_id, previous)
+
+    def invalidate(self, doctor_id: uuid.UUID):
+        self._indexes.pop(doctor_id, None)
+
+    def clear(self):
+        self._indexes.clear()
+
+    def stats(self) -> dict:
+        return {
+            "doctors": len(self._indexes),
+            "bookings": sum(len(index) for index in self._indexes.values()),
+            "loads": self.loads,
+            "hits": self.hits,
+        }
+
+
+booked_slots = BookedSlots(
+    ttl=config.AVAILABILITY_INDEX_TTL_SECONDS,
+    max_doctors=config.AVAILABILITY_INDEX_MAX_DOCTORS,
+)
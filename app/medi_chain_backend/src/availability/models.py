@@ -0,0 +1,21 @@
+from sqlmodel import SQLModel, Field
+from datetime import time
+import uuid
+
+
+class DoctorSchedule(SQLModel, table=True):
+    """Working hours (UTC) and slot length; doctors without a row use the defaults."""
+    __tablename__ = "doctor_schedules"
+
+    doctor_id: uuid.UUID = Field(foreign_key="doctors.id", primary_key=True)
+    work_start: time = Field(default=time(9, 0))
+    work_end: time = Field(default=time(17, 0))
+    slot_minutes: int = Field(default=30)
+    working_days: str = Field(default="0,1,2,3,4", max_length=20)  # Monday=0
+
+    @property
+    def weekdays(self) -> set:
+        return {int(day) for day in self.working_days.split(",") if day != ""}
+
+    def __repr__(self):
+        return f"<DoctorSchedule: {self.doctor_id}>"
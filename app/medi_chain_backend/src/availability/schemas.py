@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime, time
+from typing import List
+import uuid
+
+
+class ScheduleUpdate(BaseModel):
+    work_start: time
+    work_end: time
+    slot_minutes: int = Field(..., ge=5, le=480)
+    working_days: List[int] = Field(..., min_length=1, max_length=7)
+
+    @model_validator(mode="after")
+    def check_hours(self):
+        if self.work_end <= self.work_start:
+            raise ValueError("work_end must be after work_start")
+        if any(day < 0 or day > 6 for day in self.working_days):
+            raise ValueError("working_days must be between 0 (Monday) and 6 (Sunday)")
+        return self
+
+
+class ScheduleResponse(BaseModel):
+    doctor_id: uuid.UUID
+    work_start: time
+    work_end: time
+    slot_minutes: int
+    working_days: List[int]
+
+
+class Slot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class AvailabilityResponse(BaseModel):
+    doctor_id: uuid.UUID
+    slot_minutes: int
+    slots: List[Slot]
@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.appointments.models import CANCELLED, Appointment
+from src.utils import to_naive_utc
+from src.validation import ensure_references_exist
+from .index import booked_slots
+from .models import DoctorSchedule
+from .schemas import AvailabilityResponse, ScheduleResponse, ScheduleUpdate, Slot
+
+MAX_AVAILABILITY_DAYS = 31
+GRID_IN_USE = "The slot length and start of the working day cannot change while the doctor has upcoming appointments"
+
+
+def _schedule_response(schedule: DoctorSchedule) -> ScheduleResponse:
+    return ScheduleResponse(
+        doctor_id=schedule.doctor_id,
+        work_start=schedule.work_start,
+        work_end=schedule.work_end,
+        slot_minutes=schedule.slot_minutes,
+        working_days=sorted(schedule.weekdays),
+    )
+
+
+class AvailabilityService:
+    async def update_schedule(self, doctor_id: uuid.UUID, schedule_data: ScheduleUpdate, session: AsyncSession) -> ScheduleResponse:
+        schedule = await session.get(DoctorSchedule, doctor_id)
+        if schedule is None:
+            await ensure_references_exist(session, doctor_id=doctor_id)
+            schedule = DoctorSchedule(doctor_id=doctor_id)
+        # Bookings are checked as slots of the current grid (see SlotIndex),
+        # so the grid stays put while any are upcoming.
+        grid_moves = (schedule.work_start, schedule.slot_minutes) != (schedule_data.work_start, schedule_data.slot_minutes)
+        if grid_moves and await self._has_upcoming_appointments(doctor_id, session):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=GRID_IN_USE)
+
+        schedule.work_start = schedule_data.work_start
+        schedule.work_end = schedule_data.work_end
+        schedule.slot_minutes = schedule_data.slot_minutes
+        schedule.working_days = ",".join(str(day) for day in sorted(set(schedule_data.working_days)))
+        session.add(schedule)
+        await session.commit()
+
+        # The slot length is baked into the index.
+        booked_slots.invalidate(doctor_id)
+        return _schedule_response(schedule)
+
+    async def _has_upcoming_appointments(self, doctor_id: uuid.UUID, session: AsyncSession) -> bool:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        statement = select(Appointment.id).where(
+            Appointment.doctor_id == doctor_id, Appointment.appointment_date >= now, Appointment.status != CANCELLED
+        ).limit(1)
+        return (await session.execute(statement)).first() is not None
+
+    async def get_free_slots(self, doctor_id: uuid.UUID, start: datetime, end: datetime, session: AsyncSession) -> AvailabilityResponse:
+        """Unbooked slots within working hours, answered from the slot index."""
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        if end <= start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must be after 'from'"
+            )
+        if end - start > timedelta(days=MAX_AVAILABILITY_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Availability can be queried for at most {MAX_AVAILABILITY_DAYS} days",
+            )
+
+        index = await booked_slots.get(session, doctor_id)
+        schedule = index.schedule
+
+        slots: List[Slot] = []
+        day = start.date()
+        while day <= end.date():
+            if day.weekday() in schedule.weekdays:
+                slot_start = datetime.combine(day, schedule.work_start)
+                day_end = datetime.combine(day, schedule.work_end)
+                while slot_start + index.slot <= day_end:
+                    slot_end = slot_start + index.slot
+                    if slot_start >= start and slot_end <= end and index.conflict(slot_start) is None:
+                        slots.append(Slot(start=slot_start, end=slot_end))
+                    slot_start = slot_end
+            day += timedelta(days=1)
+
+        return AvailabilityResponse(doctor_id=doctor_id, slot_minutes=schedule.slot_minutes, slots=slots)
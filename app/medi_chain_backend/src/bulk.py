@@ -0,0 +1,48 @@
+import uuid
+from typing import List, Literal, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+BulkMode = Literal["atomic", "best_effort"]
+
+MAX_BULK_ITEMS = 1000
+
+
+class BulkDelete(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[uuid.UUID] = None
+    status: Literal["created", "updated", "deleted", "error"]
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    mode: BulkMode
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+async def bulk_response(session: AsyncSession, mode: str, results: List[BulkItemResult]) -> BulkResponse:
+    """Summarise per-item results.
+
+    In atomic mode any failed item aborts the whole batch with a 422 whose
+    detail lists the failing items, after rolling ``session`` back so
+    objects the caller already changed are discarded.
+    """
+    errors = [result for result in results if result.status == "error"]
+    failed = len(errors)
+    if mode == "atomic" and failed:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=jsonable_encoder(BulkResponse(mode=mode, succeeded=0, failed=failed, results=errors)),
+        )
+    return BulkResponse(mode=mode, succeeded=len(results) - failed, failed=failed, results=results)
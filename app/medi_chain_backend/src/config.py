@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -7,11 +7,94 @@ class Settings(BaseSettings):
     JWT_SECRET: Optional[str] = None
     JWT_ALGORITHM: Optional[str] = None
     REDIS_URL: Optional[str] = None
-    
+
+    # Database engine / connection pool
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = 30000
+
+    # Read replicas (JSON list of URLs) for the list and lookup routes, used
+    # round-robin while they pass the health check; a caller's reads stay on
+    # the primary for REPLICA_STICKY_SECONDS after they write
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_HEALTH_INTERVAL_SECONDS: float = 5.0
+    REPLICA_HEALTH_TIMEOUT_SECONDS: float = 1.0
+    REPLICA_STICKY_SECONDS: float = 5.0
+
+    # Password hashing worker pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Verified JWT cache used by TokenBearer
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+
+    # Audit log sink for the audit rows written alongside other changes
+    # ("write_behind" or "transactional"). Write-behind rows are queued in
+    # memory after the business commit and inserted up to
+    # AUDIT_LOG_FLUSH_INTERVAL seconds later: a crash in between loses
+    # them (up to AUDIT_LOG_MAX_QUEUE rows). POST /api/audit-logs/ always
+    # writes in its own commit.
+    AUDIT_LOG_MODE: str = "write_behind"
+    AUDIT_LOG_BATCH_SIZE: int = 500
+    AUDIT_LOG_FLUSH_INTERVAL: float = 1.0
+    AUDIT_LOG_MAX_QUEUE: int = 50000
+
+    # In-process index of booked appointment slots
+    AVAILABILITY_INDEX_TTL_SECONDS: int = 60
+    AVAILABILITY_INDEX_MAX_DOCTORS: int = 5000
+
+    # Consent decision cache; invalidations fan out over REDIS_URL when set
+    CONSENT_CACHE_TTL_SECONDS: float = 10.0
+    CONSENT_CACHE_MAX_ENTRIES: int = 100000
+    CONSENT_INVALIDATION_CHANNEL: str = "medichain:consent-invalidations"
+
+    # Response cache for hot list endpoints; shared through REDIS_URL when set
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_PREFIX: str = "medichain:responses"
+
+    # Streaming NDJSON/CSV exports: rows fetched and encoded per chunk
+    EXPORT_CHUNK_ROWS: int = 5000
+
+    # Bulk account import: records per batch/commit, password hashing processes
+    # (default: one per CPU) and where uploaded sources are kept until imported
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_HASH_WORKERS: Optional[int] = None
+    IMPORT_DIR: str = "imports"
+
+    # Patient/doctor search without Postgres: seconds before the in-process
+    # index is reloaded to pick up rows written by other workers
+    SEARCH_INDEX_TTL_SECONDS: int = 60
+
+    # Per-route latency/DB metrics on /metrics and in a Server-Timing header
+    METRICS_ENABLED: bool = True
+
+    # Logging: records go through a bounded queue to a background writer as
+    # JSON lines; LOG_SAMPLE_RATES keeps that fraction of an event's records.
+    # Only the noisy token.rejected is sampled by default; logins and other
+    # security events must not be, since they are the audit trail
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: Dict[str, float] = {"token.rejected": 0.1}
+
+    # Startup: DB_SCHEMA_INIT "auto" skips create_all when the database is
+    # stamped at the Alembic head, "create_all" always runs it, "skip" never;
+    # LAZY_ROUTERS imports each router on the first request under its prefix
+    DB_SCHEMA_INIT: str = "auto"
+    LAZY_ROUTERS: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore"
     )
 
 
-config = Settings()
\ No newline at end of file
+config = Settings()
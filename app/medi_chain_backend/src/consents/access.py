@@ -0,0 +1,97 @@
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Set
+
+from sqlalchemy import Uuid, and_, exists, literal, not_, select, true, union
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.main import async_session_maker
+from src.db.replicas import on_replica
+from src.doctor_patient.models import DoctorPatient
+from .cache import MISSING, consent_decisions
+from .models import Consent
+
+GRANTED = "granted"
+REVOKED = "revoked"
+
+
+@dataclass(frozen=True)
+class AccessDecision:
+    """The rows that decide whether a doctor may read a patient's records.
+
+    Access is allowed with a granted consent, or with an active
+    doctor-patient link the patient created (``link_active``) unless the
+    patient has revoked consent. Links created by booking an appointment or
+    writing a prescription do not count.
+    """
+
+    link_active: bool
+    access_status: Optional[str]
+
+    @property
+    def allowed(self) -> bool:
+        if self.access_status == GRANTED:
+            return True
+        return self.link_active and self.access_status != REVOKED
+
+
+async def get_access_decision(session: AsyncSession, doctor_id: uuid.UUID, patient_id: uuid.UUID) -> AccessDecision:
+    """The pair's decision, cached; a miss is one query over both unique pair indexes, on the primary."""
+    decision = consent_decisions.get(doctor_id, patient_id)
+    if decision is not MISSING:
+        return decision
+
+    token = consent_decisions.token()
+    pair = select(
+        literal(doctor_id, Uuid).label("doctor_id"),
+        literal(patient_id, Uuid).label("patient_id"),
+    ).subquery("pair")
+    statement = (
+        select(DoctorPatient.is_active, DoctorPatient.grants_access, Consent.access_status)
+        .select_from(pair)
+        .outerjoin(DoctorPatient, and_(
+            DoctorPatient.doctor_id == pair.c.doctor_id, DoctorPatient.patient_id == pair.c.patient_id
+        ))
+        .outerjoin(Consent, and_(
+            Consent.doctor_id == pair.c.doctor_id, Consent.patient_id == pair.c.patient_id
+        ))
+    )
+    row = (await execute_on_primary(session, statement))[0]
+    decision = AccessDecision(link_active=bool(row.is_active and row.grants_access), access_status=row.access_status)
+    consent_decisions.put(doctor_id, patient_id, decision, token)
+    return decision
+
+
+async def accessible_patient_ids(session: AsyncSession, doctor_id: uuid.UUID) -> Set[uuid.UUID]:
+    """The patients whose records ``doctor_id`` may read (``AccessDecision.allowed``), on the primary.
+
+    One query over the unique (doctor_id, patient_id) indexes; the doctor-side
+    lists filter on the result and can then read their rows from a replica.
+    """
+    revoked = exists().where(
+        Consent.doctor_id == doctor_id,
+        Consent.patient_id == DoctorPatient.patient_id,
+        Consent.access_status == REVOKED,
+    )
+    statement = union(
+        select(Consent.patient_id).where(Consent.doctor_id == doctor_id, Consent.access_status == GRANTED),
+        select(DoctorPatient.patient_id).where(
+            DoctorPatient.doctor_id == doctor_id,
+            DoctorPatient.is_active == true(),
+            DoctorPatient.grants_access == true(),
+            not_(revoked),
+        ),
+    )
+    return {patient_id for patient_id, in await execute_on_primary(session, statement)}
+
+
+async def execute_on_primary(session: AsyncSession, statement) -> list:
+    """The rows of ``statement``; read on the primary when ``session`` is on a replica.
+
+    A lagging replica may still show a revoked consent as granted, so access
+    is always decided on the primary.
+    """
+    if on_replica(session):
+        async with async_session_maker() as primary:
+            return (await primary.execute(statement)).all()
+    return (await session.execute(statement)).all()
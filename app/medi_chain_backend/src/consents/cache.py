@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class ConsentDecisionCache:
+    """TTL + LRU cache of consent decisions keyed by (doctor_id, patient_id).
+
+    A lookup that misses calls ``token()`` before reading the database and
+    hands the token back to ``put``. Any invalidation in between bumps the
+    sequence and the possibly stale value is dropped instead of cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[uuid.UUID, uuid.UUID], tuple]" = OrderedDict()
+        self._sequence = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, doctor_id: uuid.UUID, patient_id: uuid.UUID, default: Any = MISSING) -> Any:
+        """Cached decision, or ``default`` (``MISSING`` unless given) on a miss."""
+        key = (doctor_id, patient_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def token(self) -> int:
+        return self._sequence
+
+    def put(self, doctor_id: uuid.UUID, patient_id: uuid.UUID, value: Any, token: int):
+        if token != self._sequence or self.max_entries <= 0:
+            return
+        key = (doctor_id, patient_id)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, doctor_id: uuid.UUID, patient_id: uuid.UUID):
+        self._sequence += 1
+        self.invalidations += 1
+        self._entries.pop((doctor_id, patient_id), None)
+
+    def clear(self):
+        self._sequence += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+class ConsentInvalidationBus:
+    """Fans consent invalidations out to every worker.
+
+    ``publish`` always invalidates this worker's cache. When ``REDIS_URL`` is
+    set and the ``redis`` package is available it also publishes on a Redis
+    channel that every worker subscribes to. Without Redis, or while the
+    connection is down, other workers converge within the cache TTL; after a
+    reconnect each worker clears its cache since messages may have been
+    missed in the meantime.
+    """
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, cache: ConsentDecisionCache, redis_url: Optional[str], channel: str):
+        self.cache = cache
+        self.redis_url = redis_url
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._redis = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        self.connected = False
+        self.published = 0
+        self.received = 0
+        self.publish_failures = 0
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis is not None else "local"
+
+    async def start(self):
+        if not self.redis_url or self._task is not None:
+            return
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; "
+                           "consent invalidations stay in-process")
+            return
+        self._redis = redis.from_url(self.redis_url)
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, doctor_id: uuid.UUID, patient_id: uuid.UUID):
+        """Invalidate the pair here and on every other worker. Call after commit."""
+        self.cache.invalidate(doctor_id, patient_id)
+        await self._publish_remote(doctor_id, patient_id)
+
+    def publish_after_commit(self, session, doctor_id: uuid.UUID, patient_id: uuid.UUID):
+        """``publish`` the pair once the session's transaction commits.
+
+        For code that changes a pair's decision without owning the commit,
+        such as linking a doctor and patient inside a larger write.
+        """
+        if not session.info.get("consent_invalidation_hooked"):
+            event.listen(session.sync_session, "after_commit", self._after_commit)
+            event.listen(session.sync_session, "after_transaction_end", self._after_transaction_end)
+            session.info["consent_invalidation_hooked"] = True
+        session.info.setdefault("consent_invalidations", set()).add((doctor_id, patient_id))
+
+    def _after_commit(self, sync_session):
+        for doctor_id, patient_id in sync_session.info.pop("consent_invalidations", ()):
+            self.cache.invalidate(doctor_id, patient_id)
+            if self._redis is not None:
+                task = asyncio.get_running_loop().create_task(self._publish_remote(doctor_id, patient_id))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    @staticmethod
+    def _after_transaction_end(sync_session, transaction):
+        if transaction.parent is None:
+            sync_session.info.pop("consent_invalidations", None)
+
+    async def _publish_remote(self, doctor_id: uuid.UUID, patient_id: uuid.UUID):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.publish(self.channel, f"{self.origin}:{doctor_id}:{patient_id}")
+            self.published += 1
+        except Exception:
+            # Other workers fall back to the TTL for this change.
+            self.publish_failures += 1
+            logger.exception("Publishing a consent invalidation failed")
+
+    def handle_message(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, doctor_id, patient_id = data.split(":")
+        if origin != self.origin:
+            self.received += 1
+            self.cache.invalidate(uuid.UUID(doctor_id), uuid.UUID(patient_id))
+
+    async def _listen(self):
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self.connected = True
+                # Invalidations published while we were not subscribed are lost.
+                self.cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Consent invalidation channel unavailable; retrying", exc_info=True)
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                self.connected = False
+                await pubsub.aclose()
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "backend": self.backend,
+            "connected": self.connected,
+            "published": self.published,
+            "received": self.received,
+            "publish_failures": self.publish_failures,
+        }
+
+
+consent_decisions = ConsentDecisionCache(
+    ttl=config.CONSENT_CACHE_TTL_SECONDS,
+    max_entries=config.CONSENT_CACHE_MAX_ENTRIES,
+)
+
+consent_invalidations = ConsentInvalidationBus(
+    consent_decisions,
+    redis_url=config.REDIS_URL,
+    channel=config.CONSENT_INVALIDATION_CHANNEL,
+)
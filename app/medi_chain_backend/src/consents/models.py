@@ -1,5 +1,6 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 import uuid
 from src.patients.models import Patient
@@ -8,6 +9,11 @@ from src.doctors.models import Doctor
 
 class Consent(SQLModel, table=True):
     __tablename__ = "consents"
+    __table_args__ = (
+        Index("uq_consents_doctor_patient", "doctor_id", "patient_id", unique=True),
+        Index("ix_consents_patient_created", "patient_id", "created_at", "id"),
+        Index("ix_consents_doctor_created", "doctor_id", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     patient_id: uuid.UUID = Field(foreign_key="patients.id", nullable=False)
@@ -15,6 +21,7 @@ class Consent(SQLModel, table=True):
     access_status: str = Field(default="pending", max_length=50)
     granted_at: Optional[datetime] = Field(default=None)
     revoked_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
 
     patient: Optional[Patient] = Relationship()
     doctor: Optional[Doctor] = Relationship()
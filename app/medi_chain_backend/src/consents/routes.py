@@ -1,12 +1,17 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
+from .models import Consent
 from .schemas import ConsentCreate, ConsentUpdate, ConsentResponse
 from .service import ConsentService
-from src.dependencies import AccessTokenBearer
+from src.dependencies import AccessTokenBearer, ensure_same_user
+from src.pagination import PageParams, set_next_cursor
+from src.serialization import json_response
+from src.versions.bumps import doctor_collection, patient_collection
+from src.versions.etags import check_collections, ensure_modified, make_etag, record_version
 
 consent_router = APIRouter()
 
@@ -14,12 +19,21 @@ consent_service = ConsentService()
 access_token_bearer = AccessTokenBearer()
 
 
+async def ensure_consent_patient(token_data: dict, consent_id: uuid.UUID, session: AsyncSession):
+    """403 unless the caller is the consent's patient; a missing consent is left to the service's 404."""
+    consent = await consent_service.get_consent_by_id(consent_id, session)
+    if consent is not None:
+        ensure_same_user(token_data, consent.patient_id)
+
+
 @consent_router.post("/", response_model=ConsentResponse)
 async def create_consent(
     consent_data: ConsentCreate,
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    # A new consent is pending: the doctor may ask, only the patient grants.
+    ensure_same_user(token_data, consent_data.patient_id, consent_data.doctor_id)
     new_consent = await consent_service.create_consent(consent_data, session)
     return new_consent
 
@@ -27,35 +41,53 @@ async def create_consent(
 @consent_router.get("/{consent_id}", response_model=ConsentResponse)
 async def get_consent(
     consent_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    version = await record_version(session, Consent, uuid.UUID(consent_id), "consents")
+    if version is not None:
+        ensure_same_user(token_data, version.patient_id, version.doctor_id)
+        ensure_modified(request, response, make_etag(request, [version.version]))
     consent = await consent_service.get_consent_by_id(uuid.UUID(consent_id), session)
     if not consent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Consent not found"
         )
-    return consent
+    return json_response(ConsentResponse, consent, response)
 
 
 @consent_router.get("/patient/{patient_id}", response_model=List[ConsentResponse])
 async def get_consents_by_patient(
     patient_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    consents = await consent_service.get_consents_by_patient(uuid.UUID(patient_id), session)
-    return consents
+    ensure_same_user(token_data, uuid.UUID(patient_id))
+    await check_collections(request, response, session, patient_collection("consents", uuid.UUID(patient_id)))
+    consents = await consent_service.get_consents_by_patient(uuid.UUID(patient_id), session, page)
+    set_next_cursor(response, consents)
+    return json_response(ConsentResponse, consents.items, response, many=True)
 
 
 @consent_router.get("/doctor/{doctor_id}", response_model=List[ConsentResponse])
 async def get_consents_by_doctor(
     doctor_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    consents = await consent_service.get_consents_by_doctor(uuid.UUID(doctor_id), session)
-    return consents
+    ensure_same_user(token_data, uuid.UUID(doctor_id))
+    await check_collections(request, response, session, doctor_collection("consents", uuid.UUID(doctor_id)))
+    consents = await consent_service.get_consents_by_doctor(uuid.UUID(doctor_id), session, page)
+    set_next_cursor(response, consents)
+    return json_response(ConsentResponse, consents.items, response, many=True)
 
 
 @consent_router.put("/{consent_id}", response_model=ConsentResponse)
@@ -65,6 +97,7 @@ async def update_consent(
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    await ensure_consent_patient(token_data, uuid.UUID(consent_id), session)
     updated_consent = await consent_service.update_consent(uuid.UUID(consent_id), consent_data, session)
     return updated_consent
 
@@ -75,5 +108,7 @@ async def delete_consent(
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    # Deleting a revoked consent would give a linked doctor access again.
+    await ensure_consent_patient(token_data, uuid.UUID(consent_id), session)
     result = await consent_service.delete_consent(uuid.UUID(consent_id), session)
     return result
\ No newline at end of file
@@ -20,6 +20,7 @@ class ConsentResponse(BaseModel):
     access_status: str
     granted_at: Optional[datetime] = None
     revoked_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -2,11 +2,16 @@ import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
+from src.pagination import Page, PageParams, paginate
 from .models import Consent
 from .schemas import ConsentCreate, ConsentUpdate
-from src.patients.models import Patient
-from src.doctors.models import Doctor
-from typing import List
+from src.validation import ensure_references_exist
+from src.dashboard.counters import CounterUpdates
+from .access import get_access_decision
+from .cache import consent_invalidations
+from src.response_cache import doctor_scope, response_cache
+from src.versions.bumps import VersionBumps
+from typing import Optional
 from datetime import datetime
 
 
@@ -16,38 +21,23 @@ class ConsentService:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_consents_by_patient(self, patient_id: uuid.UUID, session: AsyncSession) -> List[Consent]:
+    async def get_consents_by_patient(self, patient_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(Consent).where(Consent.patient_id == patient_id)
-        result = await session.execute(statement)
-        consents = result.scalars().all()
-        return list(consents)
+        return await paginate(session, statement, Consent.created_at, Consent.id, page)
 
-    async def get_consents_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession) -> List[Consent]:
+    async def get_consents_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(Consent).where(Consent.doctor_id == doctor_id)
-        result = await session.execute(statement)
-        consents = result.scalars().all()
-        return list(consents)
+        return await paginate(session, statement, Consent.created_at, Consent.id, page)
 
-    async def create_consent(self, consent_data: ConsentCreate, session: AsyncSession):
-        # Check if patient exists
-        patient_statement = select(Patient).where(Patient.id == consent_data.patient_id)
-        patient_result = await session.execute(patient_statement)
-        patient = patient_result.scalar_one_or_none()
-        
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-            )
+    async def get_access_status(self, doctor_id: uuid.UUID, patient_id: uuid.UUID, session: AsyncSession) -> Optional[str]:
+        """The pair's ``access_status`` (``None`` without a consent row), cached."""
+        decision = await get_access_decision(session, doctor_id, patient_id)
+        return decision.access_status
 
-        # Check if doctor exists
-        doctor_statement = select(Doctor).where(Doctor.id == consent_data.doctor_id)
-        doctor_result = await session.execute(doctor_statement)
-        doctor = doctor_result.scalar_one_or_none()
-        
-        if not doctor:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
-            )
+    async def create_consent(self, consent_data: ConsentCreate, session: AsyncSession):
+        await ensure_references_exist(
+            session, patient_id=consent_data.patient_id, doctor_id=consent_data.doctor_id
+        )
 
         # Check if consent already exists
         consent_statement = select(Consent).where(
@@ -67,7 +57,17 @@ class ConsentService:
             doctor_id=consent_data.doctor_id,
         )
         session.add(new_consent)
+        counters = CounterUpdates()
+        counters.add(new_consent.doctor_id, "pending_consents")
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("consents", new_consent)
+        versions.add_access_change(new_consent.doctor_id, new_consent.patient_id)
+        await versions.apply(session)
         await session.commit()
+        await consent_invalidations.publish(new_consent.doctor_id, new_consent.patient_id)
+        # Record access changed, so the doctor's filtered listings did too.
+        await response_cache.invalidate(doctor_scope("appointments", new_consent.doctor_id))
         await session.refresh(new_consent)
         return new_consent
 
@@ -78,9 +78,12 @@ class ConsentService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Consent not found"
             )
 
+        counters = CounterUpdates()
         # Update only provided fields
         if consent_data.access_status is not None:
+            counters.add(consent.doctor_id, "pending_consents", -int(consent.access_status == "pending"))
             consent.access_status = consent_data.access_status
+            counters.add(consent.doctor_id, "pending_consents", int(consent.access_status == "pending"))
             
             # Update timestamps based on status
             if consent_data.access_status == "granted":
@@ -90,7 +93,14 @@ class ConsentService:
                 consent.revoked_at = datetime.utcnow()
 
         session.add(consent)
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("consents", consent)
+        versions.add_access_change(consent.doctor_id, consent.patient_id)
+        await versions.apply(session)
         await session.commit()
+        await consent_invalidations.publish(consent.doctor_id, consent.patient_id)
+        await response_cache.invalidate(doctor_scope("appointments", consent.doctor_id))
         await session.refresh(consent)
         return consent
 
@@ -102,5 +112,14 @@ class ConsentService:
             )
 
         await session.delete(consent)
+        counters = CounterUpdates()
+        counters.add(consent.doctor_id, "pending_consents", -int(consent.access_status == "pending"))
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("consents", consent)
+        versions.add_access_change(consent.doctor_id, consent.patient_id)
+        await versions.apply(session)
         await session.commit()
+        await consent_invalidations.publish(consent.doctor_id, consent.patient_id)
+        await response_cache.invalidate(doctor_scope("appointments", consent.doctor_id))
         return {"message": "Consent deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,62 @@
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.appointments.models import CANCELLED
+from src.validation import dialect_insert
+from .models import DoctorCounters, DoctorDailyAppointments
+
+COUNTER_FIELDS = ("active_patients", "pending_consents", "prescriptions")
+
+
+class CounterUpdates:
+    """Counter deltas collected by a service method and applied in its transaction.
+
+    ``apply`` issues at most one upsert per counter table, adding the deltas
+    to the stored values (``col = col + excluded.col``), so concurrent writers
+    never overwrite each other's increments.
+    """
+
+    def __init__(self):
+        self.doctors: Dict[uuid.UUID, Counter] = defaultdict(Counter)
+        self.days: Counter = Counter()
+
+    def add(self, doctor_id: uuid.UUID, field: str, delta: int = 1):
+        self.doctors[doctor_id][field] += delta
+
+    def add_appointment(self, appointment, delta: int = 1):
+        """Count ``appointment`` on its day, unless it is cancelled."""
+        if appointment.status != CANCELLED:
+            self.days[(appointment.doctor_id, appointment.appointment_date.date())] += delta
+
+    async def apply(self, session: AsyncSession):
+        doctor_rows = [
+            {"doctor_id": doctor_id, **{field: deltas[field] for field in COUNTER_FIELDS}}
+            for doctor_id, deltas in self.doctors.items()
+            if any(deltas[field] for field in COUNTER_FIELDS)
+        ]
+        if doctor_rows:
+            await _upsert_increments(session, DoctorCounters, doctor_rows, ["doctor_id"], COUNTER_FIELDS)
+
+        day_rows = [
+            {"doctor_id": doctor_id, "day": day, "appointments": delta}
+            for (doctor_id, day), delta in self.days.items()
+            if delta
+        ]
+        if day_rows:
+            await _upsert_increments(session, DoctorDailyAppointments, day_rows, ["doctor_id", "day"], ["appointments"])
+
+        self.doctors.clear()
+        self.days.clear()
+
+
+async def _upsert_increments(session: AsyncSession, model, rows, keys, fields):
+    statement = dialect_insert(session, model).values(rows)
+    table = model.__table__
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={field: table.c[field] + statement.excluded[field] for field in fields},
+    )
+    await session.execute(statement)
@@ -0,0 +1,33 @@
+from sqlmodel import SQLModel, Field
+from datetime import date
+import uuid
+
+
+# Derived data: both tables can be recomputed with
+# ``python -m src.dashboard.rebuild``, so they carry no foreign keys that
+# would get in the way of deleting a doctor.
+
+
+class DoctorCounters(SQLModel, table=True):
+    """Per-doctor totals kept up to date by the service layer."""
+    __tablename__ = "doctor_counters"
+
+    doctor_id: uuid.UUID = Field(primary_key=True)
+    active_patients: int = Field(default=0)
+    pending_consents: int = Field(default=0)
+    prescriptions: int = Field(default=0)
+
+    def __repr__(self):
+        return f"<DoctorCounters: {self.doctor_id}>"
+
+
+class DoctorDailyAppointments(SQLModel, table=True):
+    """Number of appointments a doctor has on each day."""
+    __tablename__ = "doctor_daily_appointments"
+
+    doctor_id: uuid.UUID = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    appointments: int = Field(default=0)
+
+    def __repr__(self):
+        return f"<DoctorDailyAppointments: {self.doctor_id} {self.day}>"
@@ -0,0 +1,78 @@
+"""Recompute the dashboard counters from the source tables.
+
+Run with ``python -m src.dashboard.rebuild`` after restoring a backup,
+after the counters migration on an existing database, or whenever the
+counters are suspected to have drifted.
+"""
+import asyncio
+from collections import Counter, defaultdict
+from datetime import date
+
+from sqlalchemy import delete, func, insert, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.appointments.models import CANCELLED, Appointment
+from src.consents.models import Consent
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.prescriptions.models import Prescription
+from .counters import COUNTER_FIELDS
+from .models import DoctorCounters, DoctorDailyAppointments
+
+
+async def rebuild_counters(session: AsyncSession) -> dict:
+    """Replace both counter tables with fresh aggregates in one transaction."""
+    if session.get_bind().dialect.name == "postgresql":
+        # Writers bump counters in their own transactions; holding this lock
+        # makes them wait, so every row is counted exactly once: either in
+        # the aggregates below or by the writer's increment after we commit.
+        await session.execute(
+            text("LOCK TABLE doctor_counters, doctor_daily_appointments IN EXCLUSIVE MODE")
+        )
+    totals = defaultdict(Counter)
+    aggregates = {
+        "active_patients": select(DoctorPatient.doctor_id, func.count())
+        .where(DoctorPatient.is_active).group_by(DoctorPatient.doctor_id),
+        "pending_consents": select(Consent.doctor_id, func.count())
+        .where(Consent.access_status == "pending").group_by(Consent.doctor_id),
+        "prescriptions": select(Prescription.doctor_id, func.count()).group_by(Prescription.doctor_id),
+    }
+    for field, statement in aggregates.items():
+        for doctor_id, count in await session.execute(statement):
+            totals[doctor_id][field] = count
+
+    day = func.date(Appointment.appointment_date)
+    daily = await session.execute(
+        select(Appointment.doctor_id, day, func.count())
+        .where(Appointment.status != CANCELLED).group_by(Appointment.doctor_id, day)
+    )
+    daily_rows = [
+        # SQLite's date() returns text
+        {"doctor_id": doctor_id, "day": date.fromisoformat(value) if isinstance(value, str) else value,
+         "appointments": count}
+        for doctor_id, value, count in daily
+    ]
+
+    await session.execute(delete(DoctorCounters))
+    await session.execute(delete(DoctorDailyAppointments))
+    counter_rows = [
+        {"doctor_id": doctor_id, **{field: counts[field] for field in COUNTER_FIELDS}}
+        for doctor_id, counts in totals.items()
+    ]
+    if counter_rows:
+        await session.execute(insert(DoctorCounters), counter_rows)
+    if daily_rows:
+        await session.execute(insert(DoctorDailyAppointments), daily_rows)
+    await session.commit()
+    return {"doctors": len(counter_rows), "days": len(daily_rows)}
+
+
+async def main():
+    async with async_session_maker() as session:
+        result = await rebuild_counters(session)
+    print(f"Rebuilt counters for {result['doctors']} doctors and {result['days']} doctor-days")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+import uuid
+
+from src.prescriptions.schemas import PrescriptionResponse
+
+
+class DoctorDashboard(BaseModel):
+    doctor_id: uuid.UUID
+    day: date
+    active_patients: int
+    pending_consents: int
+    prescriptions: int
+    appointments_today: int
+    recent_prescriptions: List[PrescriptionResponse]
@@ -0,0 +1,46 @@
+import uuid
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.prescriptions.models import Prescription
+from src.validation import ensure_references_exist
+from .models import DoctorCounters, DoctorDailyAppointments
+from .schemas import DoctorDashboard
+
+RECENT_PRESCRIPTIONS = 5
+# Per-doctor collection versions (src.versions) the dashboard is built from.
+DASHBOARD_COLLECTIONS = ("appointments", "prescriptions", "consents", "doctor_patient")
+
+
+class DashboardService:
+    async def get_doctor_dashboard(self, doctor_id: uuid.UUID, session: AsyncSession, day: Optional[date] = None) -> DoctorDashboard:
+        """Counters plus the latest prescriptions; primary-key and index lookups only."""
+        day = day or datetime.now(timezone.utc).date()
+
+        counters = await session.get(DoctorCounters, doctor_id)
+        if counters is None:
+            # No activity recorded yet; make sure the doctor exists.
+            await ensure_references_exist(session, doctor_id=doctor_id)
+            counters = DoctorCounters(doctor_id=doctor_id)
+        daily = await session.get(DoctorDailyAppointments, (doctor_id, day))
+
+        statement = (
+            select(Prescription)
+            .where(Prescription.doctor_id == doctor_id)
+            .order_by(Prescription.created_at.desc(), Prescription.id.desc())
+            .limit(RECENT_PRESCRIPTIONS)
+        )
+        recent = (await session.execute(statement)).scalars().all()
+
+        return DoctorDashboard(
+            doctor_id=doctor_id,
+            day=day,
+            active_patients=counters.active_patients,
+            pending_consents=counters.pending_consents,
+            prescriptions=counters.prescriptions,
+            appointments_today=daily.appointments if daily else 0,
+            recent_prescriptions=recent,
+        )
@@ -0,0 +1,70 @@
+"""EXPLAIN helpers used to check that service queries stay on indexes."""
+import json
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# Dialects whose plans find_sequential_scans can read.
+SUPPORTED_DIALECTS = ("sqlite", "postgresql")
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine):
+    """Collect (sql, parameters) for every SELECT run on ``engine``."""
+    captured: List[Tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _postgres_seq_scans(plan: dict) -> List[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(f"Seq Scan on {plan.get('Relation Name')}")
+    for child in plan.get("Plans", []):
+        scans.extend(_postgres_seq_scans(child))
+    return scans
+
+
+async def find_sequential_scans(conn: AsyncConnection, statement: str, parameters) -> List[str]:
+    """Return the full-table scans in the plan for ``statement`` (empty if none).
+
+    Raises ``ValueError`` for a dialect not in ``SUPPORTED_DIALECTS``.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        # Rows are (id, parent, notused, detail); "SCAN t" is a full scan,
+        # "SEARCH t USING INDEX ..." is an index lookup. Scans of subqueries
+        # ("CO-ROUTINE x" / "MATERIALIZE x") read rows already produced by
+        # their own plans and are not table scans.
+        details = [row[3] for row in result]
+        subqueries = {
+            detail.split(" ", 1)[1] for detail in details
+            if detail.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+        }
+        return [
+            detail for detail in details
+            if detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW"
+            and detail[len("SCAN "):] not in subqueries
+        ]
+    if dialect == "postgresql":
+        # Small seeded tables make a seq scan the cheapest plan even when an
+        # index fits; turning it off leaves seq scans only where no index can
+        # serve the query.
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return _postgres_seq_scans(plan[0]["Plan"])
+    raise ValueError(f"Cannot read query plans for the {dialect} dialect")
@@ -1,7 +1,13 @@
 from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from src.config import config
+from sqlalchemy import DDL, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from src.config import config, Settings
+from src.db.replicas import Replica, ReplicaRouter, current_principal
+from src.db.schema import schema_at_head
+from src.metrics import instrument_engine, record_pool_wait
 from src.patients.models import Patient
 from src.doctors.models import Doctor
 from src.appointments.models import Appointment
@@ -10,22 +16,236 @@ from src.lab_reports.models import LabReport
 from src.consents.models import Consent
 from src.audit_logs.models import AuditLog
 from src.doctor_patient.models import DoctorPatient
+from src.dashboard.models import DoctorCounters, DoctorDailyAppointments
+from src.availability.models import DoctorSchedule
+from src.versions.models import CollectionVersion
+from src.imports.models import ImportJob
+import threading
+import time
 import logging
+import weakref
 
 
-async_engine = create_async_engine(config.DATABASE_URL, echo=True, future=True)
+class PoolStats:
+    """Counters describing how the connection pool is being used.
 
+    Checkout wait time is measured around ``Pool.connect()``, so it includes
+    time spent blocked on a full pool as well as opening new connections.
+    """
 
-async def init_db():
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.overflow_checkouts = 0
+            self.failed_checkouts = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += wait
+            if wait > self.wait_time_max:
+                self.wait_time_max = wait
+            if overflowed:
+                self.overflow_checkouts += 1
+
+    def record_failed_checkout(self, wait: float):
+        with self._lock:
+            self.failed_checkouts += 1
+            self.wait_time_total += wait
+            if wait > self.wait_time_max:
+                self.wait_time_max = wait
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+
+# One PoolStats per engine, so the primary and each replica are reported
+# separately.
+_engine_pool_stats: "weakref.WeakKeyDictionary[Engine, PoolStats]" = weakref.WeakKeyDictionary()
+
+
+def engine_pool_stats(engine: AsyncEngine) -> PoolStats:
+    return _engine_pool_stats[engine.sync_engine]
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports checkout wait time and overflow usage to ``stats``."""
+
+    stats: PoolStats
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        overflow = self.overflow()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            self.stats.record_failed_checkout(time.perf_counter() - start)
+            raise
+        wait = time.perf_counter() - start
+        # Only a checkout that opened a connection beyond pool_size overflowed;
+        # overflow() alone stays positive while earlier overflow connections
+        # are still out.
+        self.stats.record_checkout(wait, self.overflow() > max(overflow, 0))
+        record_pool_wait(wait)
+        return connection
+
+
+def _statement_timeout_args(url, timeout_ms) -> dict:
+    if not timeout_ms or url.get_backend_name() != "postgresql":
+        return {}
+    if url.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(timeout_ms)}}
+    return {"options": f"-c statement_timeout={timeout_ms}"}
+
+
+def build_engine(settings: Settings, url: str = None) -> AsyncEngine:
+    """Create the async engine from ``Settings``.
+
+    In-memory SQLite gets a single shared connection; every other URL uses a
+    sized, instrumented queue pool.
+    """
+    db_url = make_url(url or settings.DATABASE_URL)
+    engine_args = {
+        "echo": settings.DB_ECHO,
+        "connect_args": _statement_timeout_args(db_url, settings.DB_STATEMENT_TIMEOUT_MS),
+    }
+
+    if db_url.get_backend_name() == "sqlite" and db_url.database in (None, "", ":memory:"):
+        engine_args["poolclass"] = StaticPool
+        engine_args["connect_args"]["check_same_thread"] = False
+    else:
+        engine_args.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    engine = create_async_engine(db_url, **engine_args)
+    stats = _engine_pool_stats[engine.sync_engine] = PoolStats()
+    pool = engine.sync_engine.pool
+    if isinstance(pool, TimedQueuePool):
+        pool.stats = stats
+    event.listen(pool, "checkin", lambda *args: stats.record_checkin())
+    event.listen(pool, "connect", lambda *args: stats.record_connect())
+    return engine
+
+
+class PrimarySession(Session):
+    """Sessions on the primary; committed writes make the caller's reads sticky."""
+
+
+async_engine = build_engine(config)
+replica_engines = {url: build_engine(config, url) for url in config.DATABASE_REPLICA_URLS}
+if config.METRICS_ENABLED:
+    for engine in [async_engine, *replica_engines.values()]:
+        instrument_engine(engine)
+
+async_session_maker = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    expire_on_commit=False
+)
+
+replica_router = ReplicaRouter(
+    async_session_maker,
+    [Replica(url, engine) for url, engine in replica_engines.items()],
+    sticky_seconds=config.REPLICA_STICKY_SECONDS,
+    health_interval=config.REPLICA_HEALTH_INTERVAL_SECONDS,
+    health_timeout=config.REPLICA_HEALTH_TIMEOUT_SECONDS,
+)
+replica_router.track_writes(PrimarySession)
+pool_stats = engine_pool_stats(async_engine)
+
+
+def get_pool_stats() -> dict:
+    """Pool usage of the primary and of each replica."""
+    return {
+        "primary": describe_pool(async_engine),
+        "replicas": [
+            {"name": replica.name, **describe_pool(replica.engine)}
+            for replica in replica_router.replicas
+        ],
+    }
+
+
+def describe_pool(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    counters = engine_pool_stats(engine)
+    stats = {
+        "pool_class": type(pool).__name__,
+        "checkouts": counters.checkouts,
+        "checkins": counters.checkins,
+        "connects": counters.connects,
+        "overflow_checkouts": counters.overflow_checkouts,
+        "failed_checkouts": counters.failed_checkouts,
+        "wait_time_total_ms": round(counters.wait_time_total * 1000, 3),
+        "wait_time_max_ms": round(counters.wait_time_max * 1000, 3),
+        "wait_time_avg_ms": round(
+            counters.wait_time_total * 1000 / counters.checkouts, 3
+        ) if counters.checkouts else 0.0,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=config.DB_MAX_OVERFLOW,
+        )
+    return stats
+
+
+# The trigram search indexes on patients and doctors need pg_trgm.
+event.listen(
+    SQLModel.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+async def init_db(mode: str = None) -> str:
+    """Create missing tables according to ``DB_SCHEMA_INIT``.
+
+    Returns "created", "at_head" (migrated database, create_all skipped) or
+    "skipped".
+    """
+    mode = mode or config.DB_SCHEMA_INIT
+    if mode == "skip":
+        return "skipped"
     async with async_engine.begin() as conn:
+        if mode == "auto" and await conn.run_sync(schema_at_head):
+            return "at_head"
         await conn.run_sync(SQLModel.metadata.create_all)
+    return "created"
 
 
 async def get_session():
-    Session = sessionmaker(
-        bind=async_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
-    async with Session() as session:
-        yield session
\ No newline at end of file
+    async with async_session_maker() as session:
+        yield session
+
+
+async def get_read_session():
+    """Session for routes that only read: a replica unless the caller just wrote."""
+    async with replica_router.session_maker(current_principal())() as session:
+        yield session
@@ -0,0 +1,254 @@
+"""Read replicas for the list and lookup routes.
+
+Routes that only read take their session from ``get_read_session``, which
+``ReplicaRouter`` opens on the next healthy replica in
+``DATABASE_REPLICA_URLS`` (round-robin); everything else stays on the
+primary. A background task runs ``SELECT 1`` on each replica every
+``REPLICA_HEALTH_INTERVAL_SECONDS`` and takes failing ones out of the
+rotation until they answer again; with none healthy, reads go to the
+primary.
+
+Replication lag would hide a caller's own writes from them, so when a
+primary session commits an insert, update or delete, the caller's reads
+stay on the primary for ``REPLICA_STICKY_SECONDS``. The caller is the
+bearer token's user, which ``ReplicaRouting`` puts in a context variable
+for the duration of each request and which is only decoded when needed.
+Stickiness is per process.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class Caller:
+    """The bearer token of the current request, resolved to a user id on demand."""
+
+    __slots__ = ("token", "_resolve", "_principal", "_resolved")
+
+    def __init__(self, token: Optional[str], resolve: Callable[[str], Optional[str]]):
+        self.token = token
+        self._resolve = resolve
+        self._principal = None
+        self._resolved = False
+
+    @property
+    def principal(self) -> Optional[str]:
+        if not self._resolved:
+            self._resolved = True
+            self._principal = self._resolve(self.token) if self.token else None
+        return self._principal
+
+
+_caller: ContextVar[Optional[Caller]] = ContextVar("replica_caller", default=None)
+
+
+def on_replica(session) -> bool:
+    return "replica" in session.info
+
+
+def current_principal() -> Optional[str]:
+    caller = _caller.get()
+    return caller.principal if caller is not None else None
+
+
+class Replica:
+    def __init__(self, url: str, engine: AsyncEngine):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.session_maker = sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False, info={"replica": self.name}
+        )
+        self.healthy = True
+        self.reads = 0
+        self.failed_checks = 0
+        self.last_error: Optional[str] = None
+
+    async def check(self, timeout: float) -> bool:
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            if self.healthy:
+                logger.warning("Replica %s failed its health check: %r", self.name, e,
+                               extra={"event": "replica.unhealthy", "replica": self.name})
+            self.healthy = False
+            self.failed_checks += 1
+            self.last_error = repr(e)
+            return False
+        if not self.healthy:
+            logger.info("Replica %s is healthy again", self.name,
+                        extra={"event": "replica.healthy", "replica": self.name})
+        self.healthy = True
+        return True
+
+
+class ReplicaRouter:
+    """Picks the session maker for reads and remembers who wrote recently."""
+
+    def __init__(self, primary: sessionmaker, replicas: List[Replica], sticky_seconds: float,
+                 health_interval: float, health_timeout: float, max_sticky: int = 100000):
+        self.primary = primary
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_sticky = max_sticky
+        self._sticky: "OrderedDict[str, float]" = OrderedDict()
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.fallback_reads = 0
+        self.writes = 0
+
+    def mark_write(self, principal: Optional[str]):
+        """Keep ``principal``'s reads on the primary for ``sticky_seconds``."""
+        if principal is None or not self.replicas:
+            return
+        self.writes += 1
+        self._sticky[principal] = time.monotonic() + self.sticky_seconds
+        self._sticky.move_to_end(principal)
+        while len(self._sticky) > self.max_sticky:
+            self._sticky.popitem(last=False)
+
+    def is_sticky(self, principal: Optional[str]) -> bool:
+        if principal is None:
+            return False
+        now = time.monotonic()
+        # Entries are kept in expiry order, so expired ones are at the front.
+        while self._sticky:
+            oldest, expires_at = next(iter(self._sticky.items()))
+            if expires_at > now:
+                break
+            del self._sticky[oldest]
+        return principal in self._sticky
+
+    def pick(self, principal: Optional[str] = None) -> Optional[Replica]:
+        """The replica for the next read, or None to read from the primary."""
+        if not self.replicas:
+            self.primary_reads += 1
+            return None
+        if self.is_sticky(principal):
+            self.sticky_reads += 1
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if replica.healthy:
+                replica.reads += 1
+                return replica
+        self.fallback_reads += 1
+        return None
+
+    def session_maker(self, principal: Optional[str] = None) -> sessionmaker:
+        replica = self.pick(principal)
+        return self.primary if replica is None else replica.session_maker
+
+    def track_writes(self, session_class):
+        """Mark the caller sticky when a ``session_class`` session commits writes."""
+
+        def after_flush(session, flush_context):
+            session.info["wrote"] = True
+
+        def do_orm_execute(state):
+            if state.is_insert or state.is_update or state.is_delete:
+                state.session.info["wrote"] = True
+
+        def after_commit(session):
+            if session.info.pop("wrote", False):
+                self.mark_write(current_principal())
+
+        def after_rollback(session):
+            session.info.pop("wrote", None)
+
+        event.listen(session_class, "after_flush", after_flush)
+        event.listen(session_class, "do_orm_execute", do_orm_execute)
+        event.listen(session_class, "after_commit", after_commit)
+        event.listen(session_class, "after_rollback", after_rollback)
+
+    async def check(self) -> int:
+        """Health-check every replica; returns how many are healthy."""
+        results = await asyncio.gather(*(replica.check(self.health_timeout) for replica in self.replicas))
+        return sum(results)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.replicas and not self.running:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "sticky_seconds": self.sticky_seconds,
+            "sticky_principals": len(self._sticky),
+            "writes": self.writes,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.fallback_reads,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "reads": replica.reads,
+                    "failed_checks": replica.failed_checks,
+                    "last_error": replica.last_error,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+class ReplicaRouting:
+    """ASGI middleware making the request's bearer token the current caller."""
+
+    def __init__(self, app, resolve: Callable[[str], Optional[str]]):
+        self.app = app
+        self.resolve = resolve
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer":
+                    token = credentials.strip()
+                break
+        reset = _caller.set(Caller(token, self.resolve))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _caller.reset(reset)
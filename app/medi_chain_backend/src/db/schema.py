@@ -0,0 +1,45 @@
+"""Whether the database is at the Alembic head, without importing Alembic.
+
+Loading Alembic's script directory costs several hundred milliseconds at
+startup, so the head is found by reading the ``revision`` and
+``down_revision`` assignments of the files in ``migrations/versions``.
+"""
+import ast
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet
+
+from sqlalchemy import inspect, text
+
+VERSIONS_DIR = Path(__file__).resolve().parents[2] / "migrations" / "versions"
+VERSION_TABLE = "alembic_version"
+
+_ASSIGNMENT = re.compile(r"^(revision|down_revision)\s*(?::[^=]+)?=\s*(.+?)\s*$", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def migration_heads(directory: Path = VERSIONS_DIR) -> FrozenSet[str]:
+    """Revisions no other migration revises."""
+    revisions, revised = set(), set()
+    for path in directory.glob("*.py"):
+        values = {name: ast.literal_eval(value) for name, value in _ASSIGNMENT.findall(path.read_text())}
+        if "revision" not in values:
+            continue
+        revisions.add(values["revision"])
+        down = values.get("down_revision")
+        revised.update(down if isinstance(down, (tuple, list)) else [down] if down else [])
+    return frozenset(revisions - revised)
+
+
+def database_revisions(connection) -> FrozenSet[str]:
+    """Revisions stamped in the database; empty if Alembic never ran there."""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return frozenset()
+    return frozenset(connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}")).scalars())
+
+
+def schema_at_head(connection) -> bool:
+    """For ``AsyncConnection.run_sync``: is the database migrated to the head?"""
+    heads = migration_heads()
+    return bool(heads) and database_revisions(connection) == heads
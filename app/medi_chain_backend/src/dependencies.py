@@ -1,8 +1,116 @@
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
-from fastapi import Request, HTTPException, status
+from fastapi import Depends, Request, HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from collections import OrderedDict
 from typing import Optional
+from src.config import config
+from src.consents.access import get_access_decision
+from src.db.main import get_read_session
+from src.doctors.models import Doctor
 from src.utils import decode_token
+import hashlib
+import time
+import uuid
+
+NOT_AUTHORISED = "Not authorised to access this patient's records"
+
+
+class VerifiedTokenCache:
+    """LRU cache of successfully decoded tokens, keyed by SHA-256 digest.
+
+    Entries live for at most ``ttl`` seconds and never past the token's own
+    ``exp``. The cache is bounded both by entry count and by an estimate of
+    the memory held (digest plus encoded claims).
+    """
+
+    ENTRY_OVERHEAD = 256
+
+    def __init__(self, ttl: int, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @classmethod
+    def _entry_size(cls, token: str) -> int:
+        parts = token.split(".")
+        claims = parts[1] if len(parts) > 1 else token
+        return cls.ENTRY_OVERHEAD + len(claims)
+
+    def _remove(self, key: bytes):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, token_data, _ = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return token_data
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def put(self, token: str, token_data: dict):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if isinstance(token_data.get("exp"), (int, float)):
+            expires_at = min(expires_at, token_data["exp"])
+        key = self._digest(token)
+        if key in self._entries:
+            self._remove(key)
+        size = self._entry_size(token)
+        self._entries[key] = (expires_at, token_data, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+verified_tokens = VerifiedTokenCache(
+    ttl=config.TOKEN_CACHE_TTL_SECONDS,
+    max_entries=config.TOKEN_CACHE_MAX_ENTRIES,
+    max_bytes=config.TOKEN_CACHE_MAX_BYTES,
+)
+
+
+def verify_token(token: str) -> Optional[dict]:
+    """Return the token's claims, decoding (and caching) only on a cache miss."""
+    token_data = verified_tokens.get(token)
+    if token_data is None:
+        token_data = decode_token(token)
+        if token_data is not None:
+            verified_tokens.put(token, token_data)
+    return token_data
 
 
 class TokenBearer(HTTPBearer):
@@ -11,21 +119,19 @@ class TokenBearer(HTTPBearer):
 
     async def __call__(self, request: Request):
         creds: HTTPAuthorizationCredentials = await super().__call__(request)  # type: ignore
-        token = creds.credentials
-        token_data = decode_token(token)
+        token_data = verify_token(creds.credentials)
 
-        if not self.token_valid(token):
+        if token_data is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid or expired token",
             )
 
-        if token_data is not None:
-            self.verify_token_data(token_data)
+        self.verify_token_data(token_data)
         return token_data
 
     def token_valid(self, token: str) -> bool:
-        return decode_token(token) is not None
+        return verify_token(token) is not None
 
     def verify_token_data(self, token_data: dict):
         raise NotImplementedError("Please override in subclass")
@@ -47,3 +153,65 @@ class RefreshTokenBearer(TokenBearer):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Refresh token required, not access token",
             )
+
+
+def token_principal(token: str) -> Optional[str]:
+    """User id of a valid token, for read-your-writes routing to replicas."""
+    token_data = verify_token(token)
+    return token_data["user"].get("id") if token_data else None
+
+
+def caller_id(token_data: dict) -> Optional[uuid.UUID]:
+    user_id = token_data["user"].get("id")
+    return uuid.UUID(user_id) if user_id else None
+
+
+def ensure_same_user(token_data: dict, *user_ids: uuid.UUID):
+    """403 unless the token belongs to one of ``user_ids``."""
+    if caller_id(token_data) not in user_ids:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=NOT_AUTHORISED)
+
+
+async def ensure_doctor(session: AsyncSession, token_data: dict):
+    """403 unless the token belongs to a doctor."""
+    user_id = caller_id(token_data)
+    if user_id is None or await session.get(Doctor, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only doctors can do this")
+
+
+async def ensure_patient_access(request: Request, session: AsyncSession, token_data: dict, patient_id: uuid.UUID):
+    """403 unless the caller is the patient or a doctor allowed to read their records.
+
+    Decisions are memoized on the request, so checking many records of the
+    same patient costs one lookup (and at most one query on a cache miss).
+    """
+    user_id = caller_id(token_data)
+    if user_id == patient_id:
+        return
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=NOT_AUTHORISED)
+
+    decisions = getattr(request.state, "patient_access", None)
+    if decisions is None:
+        decisions = request.state.patient_access = {}
+    allowed = decisions.get((user_id, patient_id))
+    if allowed is None:
+        decision = await get_access_decision(session, user_id, patient_id)
+        allowed = decisions[(user_id, patient_id)] = decision.allowed
+    if not allowed:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=NOT_AUTHORISED)
+
+
+async def require_patient_access(
+    request: Request,
+    patient_id: uuid.UUID,
+    session: AsyncSession = Depends(get_read_session),
+    token_data: dict = Depends(AccessTokenBearer()),
+) -> dict:
+    """Access token dependency for routes with a ``patient_id`` path parameter.
+
+    Returns the token claims like ``AccessTokenBearer`` once
+    ``ensure_patient_access`` has passed.
+    """
+    await ensure_patient_access(request, session, token_data, patient_id)
+    return token_data
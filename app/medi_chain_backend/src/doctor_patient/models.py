@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional
@@ -8,6 +9,11 @@ from src.doctors.models import Doctor
 
 class DoctorPatient(SQLModel, table=True):
     __tablename__ = "doctor_patient"
+    __table_args__ = (
+        Index("uq_doctor_patient_pair", "doctor_id", "patient_id", unique=True),
+        Index("ix_doctor_patient_doctor_assigned", "doctor_id", "assigned_at", "id"),
+        Index("ix_doctor_patient_patient_assigned", "patient_id", "assigned_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     doctor_id: uuid.UUID = Field(foreign_key="doctors.id", nullable=False)
@@ -15,6 +21,9 @@ class DoctorPatient(SQLModel, table=True):
     assigned_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
     relationship_type: Optional[str] = Field(default="primary_care", max_length=50)  # primary_care, specialist, consultant
     is_active: bool = Field(default=True)
+    # Set when the patient created the link; links created by booking or
+    # prescribing are listed but do not open the patient's records.
+    grants_access: bool = Field(default=False)
     
     # Relationships
     doctor: Optional[Doctor] = Relationship()
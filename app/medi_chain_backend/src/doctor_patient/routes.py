@@ -1,12 +1,17 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
 from .schemas import DoctorPatientCreate, DoctorPatientUpdate, DoctorPatientResponse
 from .service import DoctorPatientService
-from src.dependencies import AccessTokenBearer
+from src.dependencies import AccessTokenBearer, ensure_same_user
+from src.pagination import PageParams, set_next_cursor
+from src.serialization import json_response
+from src.response_cache import doctor_scope, page_entry, response_cache
+from src.versions.bumps import doctor_collection, patient_collection
+from src.versions.etags import check_collections, make_etag, read_current
 
 doctor_patient_router = APIRouter()
 
@@ -20,6 +25,8 @@ async def create_doctor_patient(
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    # The link opens the patient's records to the doctor, so only the patient creates it.
+    ensure_same_user(token_data, doctor_patient_data.patient_id)
     new_doctor_patient = await doctor_patient_service.create_doctor_patient(doctor_patient_data, session)
     return new_doctor_patient
 
@@ -27,21 +34,37 @@ async def create_doctor_patient(
 @doctor_patient_router.get("/doctor/{doctor_id}", response_model=List[DoctorPatientResponse])
 async def get_patients_by_doctor(
     doctor_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    patients = await doctor_patient_service.get_patients_by_doctor(uuid.UUID(doctor_id), session)
-    return patients
+    ensure_same_user(token_data, uuid.UUID(doctor_id))
+
+    async def load():
+        versions, patients = await read_current(
+            session, [doctor_collection("doctor_patient", uuid.UUID(doctor_id))],
+            lambda current: doctor_patient_service.get_patients_by_doctor(uuid.UUID(doctor_id), current, page),
+        )
+        return page_entry(patients, DoctorPatientResponse, make_etag(request, versions))
+
+    return await response_cache.respond(request, token_data, doctor_scope("doctor_patient", uuid.UUID(doctor_id)), load)
 
 
 @doctor_patient_router.get("/patient/{patient_id}", response_model=List[DoctorPatientResponse])
 async def get_doctors_by_patient(
     patient_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    doctors = await doctor_patient_service.get_doctors_by_patient(uuid.UUID(patient_id), session)
-    return doctors
+    ensure_same_user(token_data, uuid.UUID(patient_id))
+    await check_collections(request, response, session, patient_collection("doctor_patient", uuid.UUID(patient_id)))
+    doctors = await doctor_patient_service.get_doctors_by_patient(uuid.UUID(patient_id), session, page)
+    set_next_cursor(response, doctors)
+    return json_response(DoctorPatientResponse, doctors.items, response, many=True)
 
 
 @doctor_patient_router.put("/{doctor_patient_id}", response_model=DoctorPatientResponse)
@@ -51,6 +74,13 @@ async def update_doctor_patient(
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    link = await doctor_patient_service.get_doctor_patient_by_id(uuid.UUID(doctor_patient_id), session)
+    if link is not None:
+        # Either side may edit or deactivate the link; only the patient reactivates it.
+        if doctor_patient_data.is_active and not link.is_active:
+            ensure_same_user(token_data, link.patient_id)
+        else:
+            ensure_same_user(token_data, link.patient_id, link.doctor_id)
     updated_doctor_patient = await doctor_patient_service.update_doctor_patient(uuid.UUID(doctor_patient_id), doctor_patient_data, session)
     return updated_doctor_patient
 
@@ -61,5 +91,8 @@ async def delete_doctor_patient(
     session: AsyncSession = Depends(get_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    link = await doctor_patient_service.get_doctor_patient_by_id(uuid.UUID(doctor_patient_id), session)
+    if link is not None:
+        ensure_same_user(token_data, link.patient_id, link.doctor_id)
     result = await doctor_patient_service.delete_doctor_patient(uuid.UUID(doctor_patient_id), session)
     return result
\ No newline at end of file
@@ -2,11 +2,15 @@ import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
+from src.pagination import Page, PageParams, paginate
 from .models import DoctorPatient
 from .schemas import DoctorPatientCreate, DoctorPatientUpdate
-from src.patients.models import Patient
-from src.doctors.models import Doctor
-from typing import List
+from src.validation import ensure_references_exist, link_doctor_patient
+from src.dashboard.counters import CounterUpdates
+from src.consents.cache import consent_invalidations
+from src.response_cache import link_scopes, response_cache
+from src.versions.bumps import VersionBumps
+from typing import Optional
 
 
 class DoctorPatientService:
@@ -15,69 +19,53 @@ class DoctorPatientService:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_doctors_by_patient(self, patient_id: uuid.UUID, session: AsyncSession) -> List[DoctorPatient]:
+    async def get_doctors_by_patient(self, patient_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(DoctorPatient).where(DoctorPatient.patient_id == patient_id)
-        result = await session.execute(statement)
-        doctors = result.scalars().all()
-        return list(doctors)
+        return await paginate(session, statement, DoctorPatient.assigned_at, DoctorPatient.id, page)
 
-    async def get_patients_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession) -> List[DoctorPatient]:
+    async def get_patients_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(DoctorPatient).where(DoctorPatient.doctor_id == doctor_id)
-        result = await session.execute(statement)
-        patients = result.scalars().all()
-        return list(patients)
+        return await paginate(session, statement, DoctorPatient.assigned_at, DoctorPatient.id, page)
 
     async def create_doctor_patient(self, doctor_patient_data: DoctorPatientCreate, session: AsyncSession):
-        # Check if patient exists
-        patient_statement = select(Patient).where(Patient.id == doctor_patient_data.patient_id)
-        patient_result = await session.execute(patient_statement)
-        patient = patient_result.scalar_one_or_none()
-        
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-            )
+        await ensure_references_exist(
+            session, patient_id=doctor_patient_data.patient_id, doctor_id=doctor_patient_data.doctor_id
+        )
 
-        # Check if doctor exists
-        doctor_statement = select(Doctor).where(Doctor.id == doctor_patient_data.doctor_id)
-        doctor_result = await session.execute(doctor_statement)
-        doctor = doctor_result.scalar_one_or_none()
-        
-        if not doctor:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
+        # A link booking or prescribing created may already be active; the
+        # patient creating it only makes it grant access.
+        was_active = (await session.execute(
+            select(DoctorPatient.is_active).where(
+                DoctorPatient.doctor_id == doctor_patient_data.doctor_id,
+                DoctorPatient.patient_id == doctor_patient_data.patient_id,
             )
+        )).scalar_one_or_none()
 
-        # Check if relationship already exists
-        existing_statement = select(DoctorPatient).where(
-            DoctorPatient.doctor_id == doctor_patient_data.doctor_id,
-            DoctorPatient.patient_id == doctor_patient_data.patient_id
+        # Inserts a new link or reactivates an inactive one; None means the
+        # link already exists, is active and grants access.
+        link_id = await link_doctor_patient(
+            session,
+            doctor_patient_data.doctor_id,
+            doctor_patient_data.patient_id,
+            doctor_patient_data.relationship_type,
+            grants_access=True,
         )
-        existing_result = await session.execute(existing_statement)
-        existing_relationship = existing_result.scalar_one_or_none()
-        
-        if existing_relationship:
-            # If relationship exists but is inactive, reactivate it
-            if not existing_relationship.is_active:
-                existing_relationship.is_active = True
-                session.add(existing_relationship)
-                await session.commit()
-                await session.refresh(existing_relationship)
-                return existing_relationship
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST, detail="Doctor-patient relationship already exists"
-                )
+        if link_id is None:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Doctor-patient relationship already exists"
+            )
 
-        new_doctor_patient = DoctorPatient(
-            doctor_id=doctor_patient_data.doctor_id,
-            patient_id=doctor_patient_data.patient_id,
-            relationship_type=doctor_patient_data.relationship_type,
-        )
-        session.add(new_doctor_patient)
+        counters = CounterUpdates()
+        if not was_active:
+            counters.add(doctor_patient_data.doctor_id, "active_patients")
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_link(doctor_patient_data.doctor_id, doctor_patient_data.patient_id)
+        await versions.apply(session)
         await session.commit()
-        await session.refresh(new_doctor_patient)
-        return new_doctor_patient
+        await response_cache.invalidate(*link_scopes(doctor_patient_data.doctor_id))
+        return await session.get(DoctorPatient, link_id, populate_existing=True)
 
     async def update_doctor_patient(self, doctor_patient_id: uuid.UUID, doctor_patient_data: DoctorPatientUpdate, session: AsyncSession):
         doctor_patient = await self.get_doctor_patient_by_id(doctor_patient_id, session)
@@ -89,11 +77,19 @@ class DoctorPatientService:
         # Update only provided fields
         if doctor_patient_data.relationship_type is not None:
             doctor_patient.relationship_type = doctor_patient_data.relationship_type
+        counters = CounterUpdates()
         if doctor_patient_data.is_active is not None:
+            counters.add(doctor_patient.doctor_id, "active_patients", int(doctor_patient_data.is_active) - int(doctor_patient.is_active))
             doctor_patient.is_active = doctor_patient_data.is_active
 
         session.add(doctor_patient)
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_link(doctor_patient.doctor_id, doctor_patient.patient_id)
+        await versions.apply(session)
         await session.commit()
+        await consent_invalidations.publish(doctor_patient.doctor_id, doctor_patient.patient_id)
+        await response_cache.invalidate(*link_scopes(doctor_patient.doctor_id))
         await session.refresh(doctor_patient)
         return doctor_patient
 
@@ -105,5 +101,13 @@ class DoctorPatientService:
             )
 
         await session.delete(doctor_patient)
+        counters = CounterUpdates()
+        counters.add(doctor_patient.doctor_id, "active_patients", -int(doctor_patient.is_active))
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_link(doctor_patient.doctor_id, doctor_patient.patient_id)
+        await versions.apply(session)
         await session.commit()
+        await consent_invalidations.publish(doctor_patient.doctor_id, doctor_patient.patient_id)
+        await response_cache.invalidate(*link_scopes(doctor_patient.doctor_id))
         return {"message": "Doctor-patient relationship deleted successfully"}
\ No newline at end of file
@@ -1,11 +1,31 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, text
 from datetime import datetime, timezone
 from typing import Optional
 import uuid
 
+# Weighted tsvector behind the typeahead search (src/search). Queries must
+# repeat this exact expression for Postgres to use the index on it.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(full_name, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(specialization, '')), 'B')"
+    " || setweight(to_tsvector('simple', coalesce(hospital_name, '')), 'C')"
+)
+
 
 class Doctor(SQLModel, table=True):
     __tablename__ = "doctors"
+    # Postgres only: prefix/full-text, fuzzy name and phone prefix search.
+    __table_args__ = (
+        Index("ix_doctors_search", text(SEARCH_VECTOR), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index(
+            "ix_doctors_full_name_trgm", "full_name",
+            postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_doctors_phone_prefix", "phone", postgresql_ops={"phone": "varchar_pattern_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     full_name: str = Field(max_length=255)
@@ -1,17 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime, timezone
+from typing import List, Optional
+import uuid
 
-from src.db.main import get_session
-from .schemas import DoctorRegister, DoctorLogin, DoctorAuthResponse, DoctorProfile
+from src.db.main import get_read_session, get_session
+from .schemas import DoctorRegister, DoctorLogin, DoctorAuthResponse
 from .service import DoctorService
+from src.dashboard.schemas import DoctorDashboard
+from src.dashboard.service import DASHBOARD_COLLECTIONS, DashboardService
+from src.availability.schemas import AvailabilityResponse, ScheduleResponse, ScheduleUpdate
+from src.availability.service import AvailabilityService
 from src.utils import create_access_token
 from src.dependencies import AccessTokenBearer, RefreshTokenBearer
+from src.pagination import set_next_cursor
+from src.search.schemas import DoctorSearchResult
+from src.search.service import SearchParams, SearchService
+from src.serialization import json_response
+from src.versions.bumps import doctor_collection
+from src.versions.etags import check_collections
 
 doctor_router = APIRouter()
 
 doctor_service = DoctorService()
+dashboard_service = DashboardService()
+availability_service = AvailabilityService()
+search_service = SearchService()
 access_token_bearer = AccessTokenBearer()
 
 
@@ -22,17 +37,6 @@ async def register_doctor(
 ):
     new_doctor = await doctor_service.register_doctor(doctor_data, session)
 
-    # Convert Doctor model to DoctorProfile schema
-    doctor_profile = DoctorProfile(
-        id=new_doctor.id,
-        full_name=new_doctor.full_name,
-        email=new_doctor.email,
-        specialization=new_doctor.specialization,
-        hospital_name=new_doctor.hospital_name,
-        phone=new_doctor.phone,
-        created_at=new_doctor.created_at
-    )
-
     access_token = create_access_token(
         {"email": new_doctor.email, "id": str(new_doctor.id)}
     )
@@ -42,12 +46,11 @@ async def register_doctor(
         refresh=True,
     )
 
-    return DoctorAuthResponse(
-        doctor=doctor_profile,
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer"
-    )
+    return json_response(DoctorAuthResponse, {
+        "doctor": new_doctor,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+    })
 
 
 @doctor_router.post("/login", response_model=DoctorAuthResponse)
@@ -59,17 +62,6 @@ async def login_doctor(
         doctor_login.email, doctor_login.password, session
     )
 
-    # Convert Doctor model to DoctorProfile schema
-    doctor_profile = DoctorProfile(
-        id=doctor.id,
-        full_name=doctor.full_name,
-        email=doctor.email,
-        specialization=doctor.specialization,
-        hospital_name=doctor.hospital_name,
-        phone=doctor.phone,
-        created_at=doctor.created_at
-    )
-
     access_token = create_access_token(
         {"email": doctor.email, "id": str(doctor.id)}
     )
@@ -79,12 +71,11 @@ async def login_doctor(
         refresh=True,
     )
 
-    return DoctorAuthResponse(
-        doctor=doctor_profile,
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer"
-    )
+    return json_response(DoctorAuthResponse, {
+        "doctor": doctor,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+    })
 
 
 @doctor_router.get("/refresh-token")
@@ -107,4 +98,60 @@ async def delete_doctor_account(
 ):
     doctor_id = token_data["user"]["id"]
     result = await doctor_service.delete_doctor(doctor_id, session)
-    return result
\ No newline at end of file
+    return result
+
+
+@doctor_router.get("/search", response_model=List[DoctorSearchResult])
+async def search_doctors(
+    response: Response,
+    params: SearchParams = Depends(),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    results = await search_service.search("doctors", params, session)
+    set_next_cursor(response, results)
+    return json_response(DoctorSearchResult, results.items, response, many=True)
+
+
+@doctor_router.get("/{doctor_id}/dashboard", response_model=DoctorDashboard)
+async def get_doctor_dashboard(
+    doctor_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    day: Optional[date] = Query(default=None, description="Day for appointments_today; defaults to today (UTC)"),
+    session: AsyncSession = Depends(get_read_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    day = day or datetime.now(timezone.utc).date()
+    await check_collections(
+        request, response, session,
+        *[doctor_collection(resource, doctor_id) for resource in DASHBOARD_COLLECTIONS],
+        extra=(day,),
+    )
+    dashboard = await dashboard_service.get_doctor_dashboard(doctor_id, session, day)
+    return json_response(DoctorDashboard, dashboard, response)
+
+
+@doctor_router.get("/{doctor_id}/availability", response_model=AvailabilityResponse)
+async def get_doctor_availability(
+    doctor_id: uuid.UUID,
+    date_from: datetime = Query(alias="from"),
+    date_to: datetime = Query(alias="to"),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    return await availability_service.get_free_slots(doctor_id, date_from, date_to, session)
+
+
+@doctor_router.put("/{doctor_id}/availability", response_model=ScheduleResponse)
+async def update_doctor_availability(
+    doctor_id: uuid.UUID,
+    schedule_data: ScheduleUpdate,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    if token_data["user"].get("id") != str(doctor_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Doctors can only change their own working hours"
+        )
+    return await availability_service.update_schedule(doctor_id, schedule_data, session)
\ No newline at end of file
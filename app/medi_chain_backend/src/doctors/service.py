@@ -2,7 +2,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
 from .models import Doctor
-from src.utils import generate_password_hash, verify_password
+from src.search.index import search_indexes
+from src.utils import password_hasher
 
 
 class DoctorService:
@@ -21,7 +22,7 @@ class DoctorService:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Doctor already exists"
             )
 
-        password_hash = generate_password_hash(doctor_data.password)
+        password_hash = await password_hasher.hash(doctor_data.password)
         new_doctor = Doctor(
             full_name=doctor_data.full_name,
             email=doctor_data.email,
@@ -32,12 +33,13 @@ class DoctorService:
         )
         session.add(new_doctor)
         await session.commit()
+        search_indexes.invalidate("doctors")
         await session.refresh(new_doctor)
         return new_doctor
 
     async def authenticate_doctor(self, email: str, password: str, session: AsyncSession):
         doctor = await self.get_doctor_by_email(email, session)
-        if not doctor or not verify_password(password, doctor.password_hash):
+        if not doctor or not await password_hasher.verify(password, doctor.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Invalid email or password"
             )
@@ -57,4 +59,5 @@ class DoctorService:
         
         await session.delete(doctor)
         await session.commit()
+        search_indexes.invalidate("doctors")
         return {"message": "Doctor account deleted successfully"}
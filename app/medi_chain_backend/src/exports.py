@@ -0,0 +1,79 @@
+import csv
+import io
+from datetime import datetime
+from typing import Annotated, AsyncIterator, List, Literal, Optional, Sequence
+
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+
+from src.config import config
+from src.db.main import replica_router
+from src.db.replicas import current_principal
+from src.serialization import dumps
+from src.utils import to_naive_utc
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+class ExportParams:
+    """Format and date range query parameters shared by the export endpoints."""
+
+    def __init__(
+        self,
+        format: Annotated[ExportFormat, Query()] = "ndjson",
+        date_from: Annotated[Optional[datetime], Query(alias="from")] = None,
+        date_to: Annotated[Optional[datetime], Query(alias="to")] = None,
+    ):
+        self.format = format
+        self.date_from = to_naive_utc(date_from)
+        self.date_to = to_naive_utc(date_to)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_rows(format: ExportFormat, columns: Sequence[str], rows: List[tuple]) -> bytes:
+    if format == "ndjson":
+        return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_rows(statement, format: ExportFormat, chunk_rows: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Encoded chunks of ``statement``'s rows, read through a server-side cursor.
+
+    Runs in its own session, on a replica when there is one (see
+    ``get_read_session``), since the body is sent after the route (and the
+    request's session dependency) has returned. At most ``chunk_rows`` rows
+    are held in memory at a time.
+    """
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    columns = [column.name for column in statement.selected_columns]
+    if format == "csv":
+        yield encode_rows(format, [], [columns])
+    async with replica_router.session_maker(current_principal())() as session:
+        if session.bind.dialect.name == "postgresql":
+            # A full export can outlive DB_STATEMENT_TIMEOUT_MS.
+            await session.execute(text("SET LOCAL statement_timeout = 0"))
+        result = await session.stream(statement.execution_options(yield_per=chunk_rows))
+        async for rows in result.partitions():
+            yield encode_rows(format, columns, rows)
+
+
+def export_response(statement, params: ExportParams, name: str) -> StreamingResponse:
+    """Stream ``statement`` as an ``{name}.ndjson`` or ``{name}.csv`` attachment."""
+    return StreamingResponse(
+        stream_rows(statement, params.format),
+        media_type=MEDIA_TYPES[params.format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{params.format}"'},
+    )
@@ -0,0 +1,31 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+
+
+class ImportJob(SQLModel, table=True):
+    """Progress of one bulk account import.
+
+    ``processed`` counts the source records already handled; it is updated
+    in the same transaction as each batch's inserts, so a crashed import
+    resumes right after the last committed batch.
+    """
+    __tablename__ = "import_jobs"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    kind: str = Field(max_length=20)  # "patients" or "doctors"
+    source: str = Field(max_length=500)
+    format: str = Field(max_length=10)  # "csv" or "ndjson"
+    status: str = Field(default="pending", max_length=20)  # pending, running, completed, failed
+    processed: int = Field(default=0)
+    created: int = Field(default=0)
+    skipped: int = Field(default=0)  # emails that already had an account or repeat in the file
+    failed: int = Field(default=0)  # records that did not validate
+    errors: Optional[str] = Field(default=None)
+    remove_source: bool = Field(default=False)  # uploaded copies are deleted once imported
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    def __repr__(self):
+        return f"<ImportJob: {self.id} {self.kind} {self.status}>"
@@ -0,0 +1,55 @@
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
+
+from src.db.main import get_session
+from .schemas import ImportFormat, ImportJobResponse, ImportKind
+from .service import account_importer, save_upload
+from src.dependencies import AccessTokenBearer
+
+import_router = APIRouter()
+
+access_token_bearer = AccessTokenBearer()
+
+
+@import_router.post("/{kind}", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_import(
+    kind: ImportKind,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = Query(default=None, description="Defaults to the file's extension"),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    source = await save_upload(file, format)
+    job = await account_importer.create_job(session, kind, source, format, remove_source=True)
+    background_tasks.add_task(account_importer.run, job.id)
+    return job
+
+
+@import_router.get("/{job_id}", response_model=ImportJobResponse)
+async def get_import(
+    job_id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    return await account_importer.get_job(job_id, session)
+
+
+@import_router.post("/{job_id}/resume", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resume_import(
+    job_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    job = await account_importer.get_job(job_id, session)
+    if job.status == "completed" or job_id in account_importer.running:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Import job is already {job.status}"
+        )
+    background_tasks.add_task(account_importer.run, job.id)
+    return job
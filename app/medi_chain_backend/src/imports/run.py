@@ -0,0 +1,59 @@
+"""Bulk import patient or doctor accounts from a CSV or NDJSON file.
+
+    python -m src.imports.run patients patients.csv
+    python -m src.imports.run doctors doctors.ndjson --batch-size 1000
+    python -m src.imports.run --resume JOB_ID
+
+CSV files need a header row naming the signup fields (``full_name``,
+``email``, ``password``, ...); NDJSON files hold one signup object per line.
+Progress is printed after every committed batch. If the import is
+interrupted, ``--resume`` with the printed job id continues after the last
+committed batch.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+from src.db.main import async_session_maker
+from .service import ACCOUNT_TYPES, AccountImporter, account_importer
+
+
+def report(job):
+    print(f"{job.processed} processed: {job.created} created, {job.skipped} skipped, {job.failed} failed", flush=True)
+
+
+async def main(args) -> int:
+    importer = account_importer
+    if args.batch_size:
+        importer = AccountImporter(args.batch_size, account_importer.hash_workers)
+    try:
+        if args.resume:
+            job_id = args.resume
+        else:
+            format = args.format or ("csv" if args.source.lower().endswith(".csv") else "ndjson")
+            async with async_session_maker() as session:
+                job = await importer.create_job(session, args.kind, os.path.abspath(args.source), format)
+            job_id = job.id
+        print(f"Import job {job_id}", flush=True)
+        job = await importer.run(job_id, progress=report)
+    finally:
+        importer.shutdown()
+    print(f"Import {job.status}", flush=True)
+    if job.errors:
+        print(job.errors, file=sys.stderr)
+    return 0 if job.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", nargs="?", choices=sorted(ACCOUNT_TYPES))
+    parser.add_argument("source", nargs="?", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="defaults to the file's extension")
+    parser.add_argument("--batch-size", type=int, help="records per batch (default: IMPORT_BATCH_SIZE)")
+    parser.add_argument("--resume", type=uuid.UUID, metavar="JOB_ID", help="continue an interrupted import")
+    args = parser.parse_args()
+    if not args.resume and not (args.kind and args.source):
+        parser.error("kind and source are required unless --resume is given")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Literal, Optional
+import uuid
+
+ImportKind = Literal["patients", "doctors"]
+ImportFormat = Literal["csv", "ndjson"]
+
+
+class ImportJobResponse(BaseModel):
+    id: uuid.UUID
+    kind: str
+    format: str
+    status: str
+    processed: int
+    created: int
+    skipped: int
+    failed: int
+    errors: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
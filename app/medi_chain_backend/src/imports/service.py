@@ -0,0 +1,213 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Set
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import config
+from src.db.main import async_session_maker
+from src.doctors.models import Doctor
+from src.doctors.schemas import DoctorRegister
+from src.patients.models import Patient
+from src.patients.schemas import PatientRegister
+from src.search.index import search_indexes
+from src.utils import generate_password_hash
+from src.validation import dialect_insert
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+# kind -> (table model, the schema signup validates against)
+ACCOUNT_TYPES = {"patients": (Patient, PatientRegister), "doctors": (Doctor, DoctorRegister)}
+
+# Validation errors kept on the job; later ones are only counted.
+MAX_ERRORS = 100
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def read_records(path: str, format: str) -> Iterator[dict]:
+    """Records of a CSV (with a header row) or NDJSON file, read lazily.
+
+    Empty CSV cells count as missing. An NDJSON line that is not valid JSON
+    is yielded as a ``ValueError`` so it fails on its own.
+    """
+    with open(path, newline="", encoding="utf-8") as source:
+        if format == "csv":
+            for row in csv.DictReader(source):
+                yield {key: value for key, value in row.items() if key is not None and value not in ("", None)}
+        else:
+            for line in source:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as exc:
+                    yield ValueError(f"invalid JSON ({exc})")
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}" for error in exc.errors())
+    return str(exc)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def save_upload(upload: UploadFile, format: str) -> str:
+    """Copy an uploaded source into ``IMPORT_DIR`` so a resumed job can reread it."""
+    os.makedirs(config.IMPORT_DIR, exist_ok=True)
+    path = os.path.join(config.IMPORT_DIR, f"{uuid.uuid4()}.{format}")
+    with open(path, "wb") as target:
+        while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+            target.write(chunk)
+    return path
+
+
+class AccountImporter:
+    """Creates patient or doctor accounts in bulk from a CSV or NDJSON file.
+
+    The source is read lazily in batches of ``batch_size`` records. Per
+    batch: validate with the signup schema, drop emails that already have
+    an account (one ``IN`` query), hash the remaining passwords in parallel
+    on a process pool, insert the accounts with one multi-row
+    ``INSERT ... ON CONFLICT (email) DO NOTHING`` and advance the job's
+    checkpoint, all in one commit. Running a job again continues after its
+    last committed batch.
+    """
+
+    def __init__(self, batch_size: int, hash_workers: Optional[int] = None):
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.running: Set[uuid.UUID] = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.hash_workers)
+        return self._executor
+
+    async def create_job(self, session: AsyncSession, kind: str, source: str, format: str, remove_source: bool = False) -> ImportJob:
+        job = ImportJob(kind=kind, source=source, format=format, remove_source=remove_source)
+        session.add(job)
+        await session.commit()
+        return job
+
+    async def get_job(self, job_id: uuid.UUID, session: AsyncSession) -> ImportJob:
+        job = await session.get(ImportJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+        return job
+
+    async def run(self, job_id: uuid.UUID, progress: Optional[Callable[[ImportJob], None]] = None) -> ImportJob:
+        """Import (or resume importing) a job's source; returns the final job.
+
+        Failures are logged and recorded on the job rather than raised, so
+        this can run as a background task.
+        """
+        if job_id in self.running:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import job is already running")
+        self.running.add(job_id)
+        try:
+            async with async_session_maker() as session:
+                job = await self.get_job(job_id, session)
+                if job.status == "completed":
+                    return job
+                job.status = "running"
+                job.updated_at = _now()
+                await session.commit()
+                try:
+                    records = islice(read_records(job.source, job.format), job.processed, None)
+                    while batch := list(islice(records, self.batch_size)):
+                        await self._import_batch(session, job, batch)
+                        if progress is not None:
+                            progress(job)
+                except Exception as exc:
+                    logger.exception("Import %s stopped after %d records", job_id, job.processed)
+                    await session.rollback()
+                    job = await session.get(ImportJob, job_id, populate_existing=True)
+                    job.status = "failed"
+                    job.errors = "\n".join(filter(None, [job.errors, f"stopped: {exc}"]))
+                else:
+                    job.status = "completed"
+                    if job.remove_source:
+                        os.remove(job.source)
+                job.updated_at = _now()
+                await session.commit()
+                return job
+        finally:
+            self.running.discard(job_id)
+
+    async def _import_batch(self, session: AsyncSession, job: ImportJob, batch: List):
+        model, schema = ACCOUNT_TYPES[job.kind]
+        accounts, valid, errors = {}, 0, []
+        for number, record in enumerate(batch, start=job.processed + 1):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                account = schema.model_validate(record)
+            except (ValidationError, ValueError) as exc:
+                errors.append(f"record {number}: {_describe(exc)}")
+                continue
+            valid += 1
+            # Repeats of an email within the batch are skipped.
+            accounts.setdefault(account.email, account)
+
+        existing = set()
+        if accounts:
+            result = await session.execute(select(model.email).where(model.email.in_(list(accounts))))
+            existing = set(result.scalars())
+        new_accounts = [account for email, account in accounts.items() if email not in existing]
+
+        created = 0
+        if new_accounts:
+            hashes = await self._hash([account.password for account in new_accounts])
+            rows = [
+                model(**account.model_dump(exclude={"password"}), password_hash=password_hash).model_dump()
+                for account, password_hash in zip(new_accounts, hashes)
+            ]
+            # Emails created concurrently since the lookup are skipped too.
+            statement = dialect_insert(session, model).values(rows).on_conflict_do_nothing(
+                index_elements=[model.email]
+            ).returning(model.id)
+            created = len((await session.execute(statement)).all())
+
+        job.processed += len(batch)
+        job.created += created
+        job.skipped += valid - created
+        job.failed += len(errors)
+        kept = job.errors.count("\n") + 1 if job.errors else 0
+        if errors and kept < MAX_ERRORS:
+            job.errors = "\n".join(filter(None, [job.errors, *errors[:MAX_ERRORS - kept]]))
+        job.updated_at = _now()
+        session.add(job)
+        await session.commit()
+        if created:
+            search_indexes.invalidate(job.kind)
+
+    async def _hash(self, passwords: List[str]) -> List[str]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        return await asyncio.gather(*[
+            loop.run_in_executor(executor, generate_password_hash, password) for password in passwords
+        ])
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+account_importer = AccountImporter(batch_size=config.IMPORT_BATCH_SIZE, hash_workers=config.IMPORT_HASH_WORKERS)
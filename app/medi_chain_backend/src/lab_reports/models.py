@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional
@@ -8,6 +9,10 @@ from src.doctors.models import Doctor
 
 class LabReport(SQLModel, table=True):
     __tablename__ = "lab_reports"
+    __table_args__ = (
+        Index("ix_lab_reports_patient_uploaded", "patient_id", "uploaded_at", "id"),
+        Index("ix_lab_reports_doctor_uploaded", "doctor_id", "uploaded_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     patient_id: uuid.UUID = Field(foreign_key="patients.id", nullable=False)
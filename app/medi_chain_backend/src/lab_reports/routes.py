@@ -1,12 +1,17 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
+from .models import LabReport
 from .schemas import LabReportCreate, LabReportUpdate, LabReportResponse
 from .service import LabReportService
-from src.dependencies import AccessTokenBearer
+from src.dependencies import AccessTokenBearer, ensure_patient_access, ensure_same_user, require_patient_access
+from src.pagination import PageParams, set_next_cursor
+from src.serialization import json_response
+from src.versions.bumps import doctor_collection, patient_collection
+from src.versions.etags import check_collections, ensure_modified, make_etag, record_version
 
 lab_report_router = APIRouter()
 
@@ -27,35 +32,52 @@ async def create_lab_report(
 @lab_report_router.get("/{lab_report_id}", response_model=LabReportResponse)
 async def get_lab_report(
     lab_report_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    version = await record_version(session, LabReport, uuid.UUID(lab_report_id), "lab_reports")
+    if version is not None:
+        await ensure_patient_access(request, session, token_data, version.patient_id)
+        ensure_modified(request, response, make_etag(request, [version.version]))
     lab_report = await lab_report_service.get_lab_report_by_id(uuid.UUID(lab_report_id), session)
     if not lab_report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lab report not found"
         )
-    return lab_report
+    return json_response(LabReportResponse, lab_report, response)
 
 
 @lab_report_router.get("/patient/{patient_id}", response_model=List[LabReportResponse])
 async def get_lab_reports_by_patient(
     patient_id: str,
-    session: AsyncSession = Depends(get_session),
-    token_data: dict = Depends(access_token_bearer)
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+    token_data: dict = Depends(require_patient_access)
 ):
-    lab_reports = await lab_report_service.get_lab_reports_by_patient(uuid.UUID(patient_id), session)
-    return lab_reports
+    await check_collections(request, response, session, patient_collection("lab_reports", uuid.UUID(patient_id)))
+    lab_reports = await lab_report_service.get_lab_reports_by_patient(uuid.UUID(patient_id), session, page)
+    set_next_cursor(response, lab_reports)
+    return json_response(LabReportResponse, lab_reports.items, response, many=True)
 
 
 @lab_report_router.get("/doctor/{doctor_id}", response_model=List[LabReportResponse])
 async def get_lab_reports_by_doctor(
     doctor_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    lab_reports = await lab_report_service.get_lab_reports_by_doctor(uuid.UUID(doctor_id), session)
-    return lab_reports
+    ensure_same_user(token_data, uuid.UUID(doctor_id))
+    await check_collections(request, response, session, doctor_collection("lab_reports", uuid.UUID(doctor_id)))
+    lab_reports = await lab_report_service.get_lab_reports_by_doctor(uuid.UUID(doctor_id), session, page, accessible_only=True)
+    set_next_cursor(response, lab_reports)
+    return json_response(LabReportResponse, lab_reports.items, response, many=True)
 
 
 @lab_report_router.put("/{lab_report_id}", response_model=LabReportResponse)
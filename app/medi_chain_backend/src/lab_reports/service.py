@@ -2,11 +2,13 @@ import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
+from src.pagination import Page, PageParams, paginate
+from src.consents.access import accessible_patient_ids
 from .models import LabReport
 from .schemas import LabReportCreate, LabReportUpdate
-from src.patients.models import Patient
-from src.doctors.models import Doctor
-from typing import List
+from src.validation import ensure_references_exist
+from src.versions.bumps import VersionBumps
+from typing import Optional
 
 
 class LabReportService:
@@ -15,40 +17,22 @@ class LabReportService:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_lab_reports_by_patient(self, patient_id: uuid.UUID, session: AsyncSession) -> List[LabReport]:
+    async def get_lab_reports_by_patient(self, patient_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(LabReport).where(LabReport.patient_id == patient_id)
-        result = await session.execute(statement)
-        lab_reports = result.scalars().all()
-        return list(lab_reports)
+        return await paginate(session, statement, LabReport.uploaded_at, LabReport.id, page)
 
-    async def get_lab_reports_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession) -> List[LabReport]:
+    async def get_lab_reports_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None, accessible_only: bool = False) -> Page:
+        """The doctor's lab reports; with ``accessible_only``, only those of patients they may still access."""
         statement = select(LabReport).where(LabReport.doctor_id == doctor_id)
-        result = await session.execute(statement)
-        lab_reports = result.scalars().all()
-        return list(lab_reports)
+        if accessible_only:
+            patient_ids = await accessible_patient_ids(session, doctor_id)
+            statement = statement.where(LabReport.patient_id.in_(patient_ids))
+        return await paginate(session, statement, LabReport.uploaded_at, LabReport.id, page)
 
     async def create_lab_report(self, lab_report_data: LabReportCreate, session: AsyncSession):
-        # Check if patient exists
-        patient_statement = select(Patient).where(Patient.id == lab_report_data.patient_id)
-        patient_result = await session.execute(patient_statement)
-        patient = patient_result.scalar_one_or_none()
-        
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-            )
-
-        # Check if doctor exists (if provided)
-        doctor = None
-        if lab_report_data.doctor_id:
-            doctor_statement = select(Doctor).where(Doctor.id == lab_report_data.doctor_id)
-            doctor_result = await session.execute(doctor_statement)
-            doctor = doctor_result.scalar_one_or_none()
-            
-            if not doctor:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
-                )
+        await ensure_references_exist(
+            session, patient_id=lab_report_data.patient_id, doctor_id=lab_report_data.doctor_id
+        )
 
         new_lab_report = LabReport(
             patient_id=lab_report_data.patient_id,
@@ -57,6 +41,9 @@ class LabReportService:
             report_type=lab_report_data.report_type,
         )
         session.add(new_lab_report)
+        versions = VersionBumps()
+        versions.add_record("lab_reports", new_lab_report)
+        await versions.apply(session)
         await session.commit()
         await session.refresh(new_lab_report)
         return new_lab_report
@@ -75,6 +62,9 @@ class LabReportService:
             lab_report.report_type = lab_report_data.report_type
 
         session.add(lab_report)
+        versions = VersionBumps()
+        versions.add_record("lab_reports", lab_report)
+        await versions.apply(session)
         await session.commit()
         await session.refresh(lab_report)
         return lab_report
@@ -87,5 +77,8 @@ class LabReportService:
             )
 
         await session.delete(lab_report)
+        versions = VersionBumps()
+        versions.add_record("lab_reports", lab_report)
+        await versions.apply(session)
         await session.commit()
         return {"message": "Lab report deleted successfully"}
\ No newline at end of file
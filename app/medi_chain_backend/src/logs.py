@@ -0,0 +1,186 @@
+"""JSON-lines logging through a background queue.
+
+``log_pipeline.start()`` puts a ``QueueHandler`` on the root logger, so
+every ``logging.getLogger(__name__)`` in the app goes through it. On the
+request path a record is only sampled and enqueued; formatting the message,
+redaction, JSON encoding and the write happen on the listener thread. Pass context as ``extra`` fields and keep messages ``%``-style::
+
+    logger.info("Patient registered", extra={"event": "patient.registered", "patient_id": patient.id})
+
+Records whose ``event`` has a rate in ``LOG_SAMPLE_RATES`` are kept with
+that probability (warnings and errors always are). Fields named like a
+secret (``password``, tokens, ...) are replaced with ``"[redacted]"``, also
+inside dicts and pydantic models passed as fields or message arguments.
+"""
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from src.config import config
+from src.serialization import dumps
+
+REDACTED = "[redacted]"
+SECRET_FIELDS = frozenset({
+    "password", "password_hash", "access_token", "refresh_token", "token", "authorization", "jwt_secret",
+})
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+def redact(value, depth: int = 0):
+    """``value`` with secret fields masked; models and dicts are copied, not changed."""
+    if depth > 5:
+        return value
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if isinstance(key, str) and key.lower() in SECRET_FIELDS else redact(item, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item, depth + 1) for item in value]
+    return value
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict[str, object]:
+    return {key: value for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_")}
+
+
+def redact_record(record: logging.LogRecord):
+    """Mask secrets in ``record``'s message arguments and extra fields, in place."""
+    if record.args:
+        args = record.args if isinstance(record.args, tuple) else (record.args,)
+        record.args = tuple(redact(arg) if isinstance(arg, (BaseModel, dict)) else arg for arg in args)
+    for key, value in _extra_fields(record).items():
+        setattr(record, key, REDACTED if key.lower() in SECRET_FIELDS else redact(value))
+
+
+class TextFormatter(logging.Formatter):
+    """The stock formatter, with secrets redacted like ``JsonFormatter`` does."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        redact_record(record)
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        redact_record(record)
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        try:
+            return dumps(entry).decode()
+        except TypeError:
+            # A field orjson cannot encode; log its text rather than nothing.
+            return dumps({key: value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+                          for key, value in entry.items()}).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of the INFO-and-below records of high-volume events."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(getattr(record, "event", None))
+        if rate is None or record.levelno > logging.INFO or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueues records as they are, dropping them when the queue is full.
+
+    The stock ``QueueHandler`` formats the message before enqueueing it;
+    here that is left to the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    def __init__(self, level: str, json: bool, queue_size: int, sample_rates: Dict[str, float]):
+        self.level = level
+        self.json = json
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.sampling = SamplingFilter(sample_rates)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.handler.addFilter(self.sampling)
+        self._listener: Optional[QueueListener] = None
+
+    def output_handler(self, stream=None) -> logging.Handler:
+        handler = logging.StreamHandler(stream or sys.stderr)
+        if self.json:
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        return handler
+
+    def start(self, stream=None):
+        """Route the root logger through the queue (idempotent)."""
+        if self._listener is not None:
+            return
+        root = logging.getLogger()
+        root.setLevel(self.level)
+        root.addHandler(self.handler)
+        self._listener = QueueListener(self.queue, self.output_handler(stream), respect_handler_level=True)
+        self._listener.start()
+
+    def stop(self):
+        """Write out what is queued and detach from the root logger."""
+        if self._listener is None:
+            return
+        logging.getLogger().removeHandler(self.handler)
+        self._listener.stop()
+        self._listener = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._listener is not None,
+            "queued": self.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampling.sampled_out,
+        }
+
+
+log_pipeline = LogPipeline(
+    level=config.LOG_LEVEL,
+    json=config.LOG_JSON,
+    queue_size=config.LOG_QUEUE_SIZE,
+    sample_rates=config.LOG_SAMPLE_RATES,
+)
@@ -1,17 +1,76 @@
-from fastapi import FastAPI
+import sys
+from contextlib import asynccontextmanager
+
+# First of the app's imports: importing src.startup starts the clock.
+from src.startup import RouterSpec, include_routers, startup_timings
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from src.db.main import init_db
-from src.patients.routes import patient_router
-from src.doctors.routes import doctor_router
-from src.appointments.routes import appointment_router
-from src.prescriptions.routes import prescription_router
-from src.lab_reports.routes import lab_report_router
-from src.consents.routes import consent_router
-from src.audit_logs.routes import audit_log_router
-from src.doctor_patient.routes import doctor_patient_router
+from src.config import config
+from src.db.main import init_db, get_pool_stats, replica_router
+from src.db.replicas import ReplicaRouting
+from src.utils import password_hasher
+from src.dependencies import token_principal, verified_tokens
+from src.pagination import NEXT_CURSOR_HEADER
+from src.logs import log_pipeline
+from src.versions.etags import ETAG_HEADER
+
+# The audit sink, caches, indexes and metrics are imported where they are
+# first used (the lifespan and the health handlers), so their headers are
+# spelled out here.
+CACHE_STATUS_HEADER = "X-Cache"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+ROUTERS = [
+    RouterSpec("src.patients.routes", "patient_router", "/api/patients", ["patients"]),
+    RouterSpec("src.doctors.routes", "doctor_router", "/api/doctors", ["doctors"]),
+    RouterSpec("src.appointments.routes", "appointment_router", "/api/appointments", ["appointments"]),
+    RouterSpec("src.prescriptions.routes", "prescription_router", "/api/prescriptions", ["prescriptions"]),
+    RouterSpec("src.lab_reports.routes", "lab_report_router", "/api/lab-reports", ["lab-reports"]),
+    RouterSpec("src.consents.routes", "consent_router", "/api/consents", ["consents"]),
+    RouterSpec("src.audit_logs.routes", "audit_log_router", "/api/audit-logs", ["audit-logs"]),
+    RouterSpec("src.doctor_patient.routes", "doctor_patient_router", "/api/doctor-patient", ["doctor-patient"]),
+    RouterSpec("src.imports.routes", "import_router", "/api/imports", ["imports"]),
+]
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_pipeline.start()
+    with startup_timings.step("init_db"):
+        startup_timings.schema = await init_db()
+    with startup_timings.step("replicas"):
+        await replica_router.start()
+    with startup_timings.step("audit_sink"):
+        from src.audit_logs.sink import audit_sink
+        audit_sink.start()
+    with startup_timings.step("consent_invalidations"):
+        from src.consents.cache import consent_invalidations
+        await consent_invalidations.start()
+    with startup_timings.step("response_cache"):
+        from src.response_cache import response_cache
+        await response_cache.start()
+    startup_timings.mark_ready()
+    try:
+        yield
+    finally:
+        await audit_sink.stop()
+        await consent_invalidations.stop()
+        await response_cache.stop()
+        await replica_router.stop()
+        password_hasher.shutdown()
+        # Only started if the imports router was loaded
+        imports = sys.modules.get("src.imports.service")
+        if imports is not None:
+            imports.account_importer.shutdown()
+        log_pipeline.stop()
 
-app = FastAPI(title="MediChain Healthcare Platform", version="1.0.0")
+
+app = FastAPI(title="MediChain Healthcare Platform", version="1.0.0", lifespan=lifespan)
+
+# Include routers; added before the other middleware, LazyRouters runs
+# innermost so metrics include the first request's router import
+with startup_timings.step("include_routers"):
+    include_routers(app, ROUTERS, lazy=config.LAZY_ROUTERS)
 
 # Add CORS middleware
 app.add_middleware(
@@ -20,25 +79,82 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, CACHE_STATUS_HEADER, ETAG_HEADER, SERVER_TIMING_HEADER],
 )
+app.add_middleware(ReplicaRouting, resolve=token_principal)
+if config.METRICS_ENABLED:
+    from src.metrics import MetricsMiddleware
+    app.add_middleware(MetricsMiddleware)
+
+@app.get("/")
+async def root():
+    return {"message": "Welcome to MediChain Healthcare Platform API"}
 
-# Initialize database
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    from src.metrics import CONTENT_TYPE, metrics_registry
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
 
-# Include routers
-app.include_router(patient_router, prefix="/api/patients", tags=["patients"])
-app.include_router(doctor_router, prefix="/api/doctors", tags=["doctors"])
-app.include_router(appointment_router, prefix="/api/appointments", tags=["appointments"])
-app.include_router(prescription_router, prefix="/api/prescriptions", tags=["prescriptions"])
-app.include_router(lab_report_router, prefix="/api/lab-reports", tags=["lab-reports"])
-app.include_router(consent_router, prefix="/api/consents", tags=["consents"])
-app.include_router(audit_log_router, prefix="/api/audit-logs", tags=["audit-logs"])
-app.include_router(doctor_patient_router, prefix="/api/doctor-patient", tags=["doctor-patient"])
 
+@app.get("/health/db")
+async def db_pool_health():
+    return get_pool_stats()
 
-@app.get("/")
-async def root():
-    return {"message": "Welcome to MediChain Healthcare Platform API"}
\ No newline at end of file
+
+@app.get("/health/password-hashing")
+async def password_hashing_health():
+    return password_hasher.stats()
+
+
+@app.get("/health/token-cache")
+async def token_cache_health():
+    return verified_tokens.stats()
+
+
+@app.get("/health/audit-sink")
+async def audit_sink_health():
+    from src.audit_logs.sink import audit_sink
+    return audit_sink.stats()
+
+
+@app.get("/health/slot-index")
+async def slot_index_health():
+    from src.availability.index import booked_slots
+    return booked_slots.stats()
+
+
+@app.get("/health/consent-cache")
+async def consent_cache_health():
+    from src.consents.cache import consent_invalidations
+    return consent_invalidations.stats()
+
+
+@app.get("/health/response-cache")
+async def response_cache_health():
+    from src.response_cache import response_cache
+    return response_cache.stats()
+
+
+@app.get("/health/search-index")
+async def search_index_health():
+    from src.search.index import search_indexes
+    return search_indexes.stats()
+
+
+@app.get("/health/logging")
+async def logging_health():
+    return log_pipeline.stats()
+
+
+@app.get("/health/replicas")
+async def replicas_health():
+    return replica_router.stats()
+
+
+@app.get("/health/startup")
+async def startup_health():
+    return startup_timings.stats()
+
+
+startup_timings.mark_imported()
@@ -0,0 +1,227 @@
+"""Per-route request metrics: latency, SQL statements, DB time and pool wait.
+
+``MetricsMiddleware`` times every HTTP request and, through a context
+variable, collects what the engine hooks from ``instrument_engine`` and the
+pool report while the request runs. Totals are kept per route template
+(``/api/patients/{patient_id}/timeline``, not the concrete path), exposed in
+the Prometheus text format by ``render`` and summarized for the client in a
+``Server-Timing`` header. Everything is per process.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+
+SERVER_TIMING_HEADER = "Server-Timing"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; the Prometheus client defaults plus a 25 ms step.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# Requests that do not match a route share one label, so unknown paths
+# cannot grow the series without bound.
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    """What one request spent on the database so far."""
+
+    __slots__ = ("statements", "db_time", "pool_wait")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+    def server_timing(self, elapsed: float) -> str:
+        return (
+            f'app;dur={elapsed * 1000:.2f}, db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries", '
+            f"pool;dur={self.pool_wait * 1000:.2f}"
+        )
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_pool_wait(wait: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait += wait
+
+
+class RouteMetrics:
+    """Latency histogram and DB totals of one (method, route) pair."""
+
+    __slots__ = ("buckets", "by_status", "count", "latency_sum", "statements", "db_time", "pool_wait")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.by_status: Dict[int, int] = {}
+        self.count = 0
+        self.latency_sum = 0.0
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, elapsed: float, stats: RequestStats):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        metrics.by_status[status] = metrics.by_status.get(status, 0) + 1
+        metrics.count += 1
+        metrics.latency_sum += elapsed
+        metrics.statements += stats.statements
+        metrics.db_time += stats.db_time
+        metrics.pool_wait += stats.pool_wait
+
+    def reset(self):
+        self.routes.clear()
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help: str):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        routes = sorted(self.routes.items())
+        family("http_request_duration_seconds", "histogram", "Time until the last response byte was sent, per route.")
+        for (method, route), metrics in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.latency_sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+        family("http_requests_total", "counter", "Requests per route and response status.")
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.by_status.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        for name, attribute, help in (
+            ("http_request_db_statements_total", "statements", "SQL statements executed while serving the route."),
+            ("http_request_db_seconds_total", "db_time", "Time spent executing SQL statements for the route."),
+            ("http_request_pool_wait_seconds_total", "pool_wait", "Time spent waiting for a pooled connection for the route."),
+        ):
+            family(name, "counter", help)
+            for (method, route), metrics in routes:
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {getattr(metrics, attribute)}')
+        return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """The full path template of the route that served ``scope``.
+
+    An included router's route may only know its own part of the path
+    (``/patient/{patient_id}``); the rest is the matching prefix of the
+    request path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    depth = template.count("/")
+    prefix = scope["path"].rsplit("/", depth)[0] if scope["path"].count("/") > depth else ""
+    return prefix + template
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics_registry = MetricsRegistry()
+
+
+def instrument_engine(engine: AsyncEngine) -> Callable[[], None]:
+    """Count and time every statement ``engine`` runs on behalf of a request.
+
+    Returns a function that removes the hooks again.
+    """
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            context._metrics_start = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        stats = _current.get()
+        if start is not None and stats is not None:
+            stats.statements += 1
+            stats.db_time += time.perf_counter() - start
+
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute.
+        context = exception_context.execution_context
+        if context is not None:
+            after_cursor_execute(None, None, None, None, context, False)
+
+    hooks = [
+        ("before_cursor_execute", before_cursor_execute),
+        ("after_cursor_execute", after_cursor_execute),
+        ("handle_error", handle_error),
+    ]
+    for name, hook in hooks:
+        event.listen(engine.sync_engine, name, hook)
+
+    def uninstrument():
+        for name, hook in hooks:
+            event.remove(engine.sync_engine, name, hook)
+
+    return uninstrument
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording ``metrics_registry`` and the ``Server-Timing`` header.
+
+    A request's latency runs until its last body chunk is sent, so it
+    covers streamed bodies but not background tasks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            recorded = True
+            metrics_registry.observe(scope["method"], route_template(scope), status, time.perf_counter() - start, stats)
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(SERVER_TIMING_HEADER, stats.server_timing(time.perf_counter() - start))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not recorded:
+                record()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current.reset(token)
+            if not recorded:
+                record()
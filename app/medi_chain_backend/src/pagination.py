@@ -0,0 +1,108 @@
+import base64
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Annotated, Any, List, Literal, Optional
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_LIMIT = 100
+
+
+class PageParams:
+    """Keyset pagination query parameters shared by the list endpoints.
+
+    Without ``limit`` or ``cursor`` the whole list is returned, as it was
+    before the endpoints were paginated; a ``cursor`` without ``limit``
+    continues in pages of ``DEFAULT_PAGE_LIMIT``.
+    """
+
+    def __init__(
+        self,
+        limit: Annotated[Optional[int], Query(ge=1, le=500)] = None,
+        cursor: Annotated[Optional[str], Query()] = None,
+        order: Annotated[Literal["desc", "asc"], Query()] = "desc",
+    ):
+        if limit is None and cursor:
+            limit = DEFAULT_PAGE_LIMIT
+        self.limit = limit
+        self.cursor = cursor
+        self.order = order
+
+
+@dataclass
+class Page:
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _encode(position: str, row_id: uuid.UUID) -> str:
+    raw = f"{position}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str, parse_position):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return parse_position(position), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+        )
+
+
+def encode_cursor(position: datetime, row_id: uuid.UUID) -> str:
+    return _encode(position.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str):
+    return _decode(cursor, datetime.fromisoformat)
+
+
+def encode_rank_cursor(score: float, row_id: uuid.UUID) -> str:
+    """Cursor for results ordered by (score, id) descending, e.g. search."""
+    return _encode(repr(score), row_id)
+
+
+def decode_rank_cursor(cursor: str):
+    return _decode(cursor, float)
+
+
+def apply_keyset(statement, position_column, id_column, page: PageParams):
+    """Order ``statement`` by (position, id) and resume after ``page.cursor``."""
+    key = tuple_(position_column, id_column)
+    if page.cursor:
+        after = tuple_(*decode_cursor(page.cursor))
+        statement = statement.where(key < after if page.order == "desc" else key > after)
+    if page.order == "desc":
+        statement = statement.order_by(position_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(position_column.asc(), id_column.asc())
+    if page.limit is None:
+        return statement
+    return statement.limit(page.limit + 1)
+
+
+async def paginate(
+    session: AsyncSession, statement, position_column, id_column, page: Optional[PageParams] = None
+) -> Page:
+    page = page or PageParams()
+    result = await session.execute(apply_keyset(statement, position_column, id_column, page))
+    items = list(result.scalars().all())
+    next_cursor = None
+    if page.limit is not None and len(items) > page.limit:
+        items = items[:page.limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, position_column.key), getattr(last, id_column.key)
+        )
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def set_next_cursor(response: Response, page: Page):
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import timedelta, datetime
+from typing import List, Literal, Optional
 import logging
+import uuid
 
-from src.db.main import get_session
-from .schemas import PatientRegister, PatientLogin, PatientAuthResponse, PatientProfile
+from src.db.main import get_read_session, get_session
+from .schemas import PatientRegister, PatientLogin, PatientAuthResponse, TimelineEntry
 from .service import PatientService
+from .timeline import TIMELINE_COLLECTIONS, TimelineService
 from src.utils import create_access_token
-from src.dependencies import AccessTokenBearer, RefreshTokenBearer
+from src.dependencies import AccessTokenBearer, RefreshTokenBearer, ensure_doctor, require_patient_access
+from src.exports import ExportParams, export_response
+from src.pagination import PageParams, set_next_cursor
+from src.search.schemas import PatientSearchResult
+from src.search.service import SearchParams, SearchService
+from src.serialization import json_response
+from src.versions.bumps import patient_collection
+from src.versions.etags import check_collections
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 patient_router = APIRouter()
 
 patient_service = PatientService()
+timeline_service = TimelineService()
+search_service = SearchService()
 access_token_bearer = AccessTokenBearer()
 
 
@@ -25,43 +35,23 @@ async def register_patient(
     patient_data: PatientRegister,
     session: AsyncSession = Depends(get_session),
 ):
-    logger.info(f"Received signup request: {patient_data}")
-    try:
-        new_patient = await patient_service.register_patient(patient_data, session)
-        logger.info(f"Patient registered successfully: {new_patient}")
-
-        # Convert Patient model to PatientProfile schema
-        patient_profile = PatientProfile(
-            id=new_patient.id,
-            full_name=new_patient.full_name,
-            email=new_patient.email,
-            date_of_birth=new_patient.date_of_birth,
-            gender=new_patient.gender,
-            address=new_patient.address,
-            phone=new_patient.phone,
-            created_at=new_patient.created_at
-        )
-
-        access_token = create_access_token(
-            {"email": new_patient.email, "id": str(new_patient.id)}
-        )
-        refresh_token = create_access_token(
-            {"email": new_patient.email, "id": str(new_patient.id)},
-            expiry=timedelta(days=2),
-            refresh=True,
-        )
-
-        response = PatientAuthResponse(
-            patient=patient_profile,
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer"
-        )
-        logger.info(f"Returning response: {response}")
-        return response
-    except Exception as e:
-        logger.error(f"Error during patient registration: {str(e)}", exc_info=True)
-        raise
+    new_patient = await patient_service.register_patient(patient_data, session)
+
+    access_token = create_access_token(
+        {"email": new_patient.email, "id": str(new_patient.id)}
+    )
+    refresh_token = create_access_token(
+        {"email": new_patient.email, "id": str(new_patient.id)},
+        expiry=timedelta(days=2),
+        refresh=True,
+    )
+
+    # The row is serialized as PatientProfile without validating it again.
+    return json_response(PatientAuthResponse, {
+        "patient": new_patient,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+    })
 
 
 @patient_router.post("/login", response_model=PatientAuthResponse)
@@ -72,18 +62,7 @@ async def login_patient(
     patient = await patient_service.authenticate_patient(
         patient_login.email, patient_login.password, session
     )
-
-    # Convert Patient model to PatientProfile schema
-    patient_profile = PatientProfile(
-        id=patient.id,
-        full_name=patient.full_name,
-        email=patient.email,
-        date_of_birth=patient.date_of_birth,
-        gender=patient.gender,
-        address=patient.address,
-        phone=patient.phone,
-        created_at=patient.created_at
-    )
+    logger.info("Patient logged in", extra={"event": "patient.login", "patient_id": patient.id})
 
     access_token = create_access_token(
         {"email": patient.email, "id": str(patient.id)}
@@ -94,12 +73,11 @@ async def login_patient(
         refresh=True,
     )
 
-    return PatientAuthResponse(
-        patient=patient_profile,
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer"
-    )
+    return json_response(PatientAuthResponse, {
+        "patient": patient,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+    })
 
 
 @patient_router.get("/refresh-token")
@@ -122,4 +100,50 @@ async def delete_patient_account(
 ):
     patient_id = token_data["user"]["id"]
     result = await patient_service.delete_patient(patient_id, session)
-    return result
\ No newline at end of file
+    return result
+
+
+@patient_router.get("/search", response_model=List[PatientSearchResult])
+async def search_patients(
+    response: Response,
+    params: SearchParams = Depends(),
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    await ensure_doctor(session, token_data)
+    results = await search_service.search("patients", params, session)
+    set_next_cursor(response, results)
+    return json_response(PatientSearchResult, results.items, response, many=True)
+
+
+@patient_router.get("/{patient_id}/timeline", response_model=List[TimelineEntry])
+async def get_patient_timeline(
+    patient_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    types: Optional[List[Literal["appointment", "prescription", "lab_report", "consent", "doctor_patient"]]] = Query(default=None, alias="type"),
+    date_from: Optional[datetime] = Query(default=None, alias="from"),
+    date_to: Optional[datetime] = Query(default=None, alias="to"),
+    session: AsyncSession = Depends(get_read_session),
+    token_data: dict = Depends(require_patient_access)
+):
+    await check_collections(request, response, session, *[
+        patient_collection(resource, patient_id) for resource in TIMELINE_COLLECTIONS
+    ])
+    timeline = await timeline_service.get_patient_timeline(
+        patient_id, session, page, types=types, date_from=date_from, date_to=date_to
+    )
+    set_next_cursor(response, timeline)
+    return json_response(TimelineEntry, timeline.items, response, many=True)
+
+
+@patient_router.get("/{patient_id}/export")
+async def export_patient_history(
+    patient_id: uuid.UUID,
+    params: ExportParams = Depends(),
+    types: Optional[List[Literal["appointment", "prescription", "lab_report", "consent", "doctor_patient"]]] = Query(default=None, alias="type"),
+    token_data: dict = Depends(require_patient_access)
+):
+    statement = timeline_service.export_statement(patient_id, types, params.date_from, params.date_to)
+    return export_response(statement, params, f"patient-{patient_id}-history")
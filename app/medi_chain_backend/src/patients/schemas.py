@@ -60,4 +60,13 @@ class PatientAuthResponse(BaseModel):
     patient: PatientProfile
     access_token: str
     refresh_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    token_type: str = "bearer"
+
+
+class TimelineEntry(BaseModel):
+    type: str
+    id: uuid.UUID
+    occurred_at: datetime
+    doctor_id: Optional[uuid.UUID] = None
+    summary: Optional[str] = None
+    status: Optional[str] = None
@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import String, case, cast, literal, null, select, union_all
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.appointments.models import Appointment
+from src.consents.models import Consent
+from src.doctor_patient.models import DoctorPatient
+from src.lab_reports.models import LabReport
+from src.pagination import DEFAULT_PAGE_LIMIT, Page, PageParams, apply_keyset, encode_cursor
+from src.prescriptions.models import Prescription
+from src.utils import to_naive_utc
+
+TIMELINE_TYPES = ("appointment", "prescription", "lab_report", "consent", "doctor_patient")
+# Per-patient collection versions (src.versions) the timeline is built from.
+TIMELINE_COLLECTIONS = ("appointments", "prescriptions", "lab_reports", "consents", "doctor_patient")
+
+NO_TEXT = cast(null(), String)
+
+# type -> (model, position column, summary, status). Each position column
+# leads a (patient_id, position, id) index.
+_SOURCES = {
+    "appointment": (Appointment, Appointment.created_at, Appointment.reason, Appointment.status),
+    "prescription": (Prescription, Prescription.created_at, Prescription.medication, NO_TEXT),
+    "lab_report": (LabReport, LabReport.uploaded_at, LabReport.report_type, NO_TEXT),
+    "consent": (Consent, Consent.created_at, NO_TEXT, Consent.access_status),
+    "doctor_patient": (
+        DoctorPatient,
+        DoctorPatient.assigned_at,
+        DoctorPatient.relationship_type,
+        case((DoctorPatient.is_active, "active"), else_="inactive"),
+    ),
+}
+
+
+def _branch(record_type: str, patient_id: uuid.UUID, date_from: Optional[datetime], date_to: Optional[datetime]):
+    """The patient's records of one type as timeline columns, date-filtered."""
+    model, position, summary, record_status = _SOURCES[record_type]
+    branch = select(
+        literal(record_type, String).label("type"),
+        model.id.label("id"),
+        position.label("occurred_at"),
+        model.doctor_id.label("doctor_id"),
+        summary.label("summary"),
+        record_status.label("status"),
+    ).where(model.patient_id == patient_id)
+    if date_from is not None:
+        branch = branch.where(position >= date_from)
+    if date_to is not None:
+        branch = branch.where(position < date_to)
+    return branch
+
+
+class TimelineService:
+    async def get_patient_timeline(
+        self,
+        patient_id: uuid.UUID,
+        session: AsyncSession,
+        page: Optional[PageParams] = None,
+        types: Optional[Iterable[str]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Page:
+        """Merged, time-ordered feed of a patient's records in one query.
+
+        Every branch applies the filters and the keyset cursor and keeps only
+        ``limit + 1`` rows from its own index, so the UNION ALL merges at most
+        ``5 * (limit + 1)`` rows whatever the size of the history, so unlike
+        the list endpoints the feed always pages (by ``DEFAULT_PAGE_LIMIT``
+        when no ``limit`` is given).
+        """
+        page = page or PageParams()
+        if page.limit is None:
+            page = PageParams(limit=DEFAULT_PAGE_LIMIT, cursor=page.cursor, order=page.order)
+        date_from, date_to = to_naive_utc(date_from), to_naive_utc(date_to)
+        selected = [t for t in TIMELINE_TYPES if not types or t in set(types)]
+
+        branches = []
+        for record_type in selected:
+            branch = _branch(record_type, patient_id, date_from, date_to)
+            model, position, _, _ = _SOURCES[record_type]
+            branches.append(select(apply_keyset(branch, position, model.id, page).subquery()))
+        if not branches:
+            return Page()
+
+        feed = union_all(*branches).subquery()
+        statement = apply_keyset(select(feed), feed.c.occurred_at, feed.c.id, PageParams(limit=page.limit, order=page.order))
+        rows = (await session.execute(statement)).mappings().all()
+
+        items = [dict(row) for row in rows[:page.limit]]
+        next_cursor = None
+        if len(rows) > page.limit:
+            next_cursor = encode_cursor(items[-1]["occurred_at"], items[-1]["id"])
+        return Page(items=items, next_cursor=next_cursor)
+
+    def export_statement(
+        self,
+        patient_id: uuid.UUID,
+        types: Optional[Iterable[str]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ):
+        """The patient's whole filtered history, oldest first, for ``src.exports``.
+
+        Each branch is read in index order, so the database can merge them
+        without sorting the full history.
+        """
+        date_from, date_to = to_naive_utc(date_from), to_naive_utc(date_to)
+        selected = [t for t in TIMELINE_TYPES if not types or t in set(types)]
+        feed = union_all(*[_branch(t, patient_id, date_from, date_to) for t in selected]).subquery()
+        return select(feed).order_by(feed.c.occurred_at, feed.c.id)
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional
@@ -8,6 +9,10 @@ from src.doctors.models import Doctor
 
 class Prescription(SQLModel, table=True):
     __tablename__ = "prescriptions"
+    __table_args__ = (
+        Index("ix_prescriptions_patient_created", "patient_id", "created_at", "id"),
+        Index("ix_prescriptions_doctor_created", "doctor_id", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     patient_id: uuid.UUID = Field(foreign_key="patients.id", nullable=False)
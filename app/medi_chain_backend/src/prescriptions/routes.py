@@ -1,12 +1,18 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from src.db.main import get_session
-from .schemas import PrescriptionCreate, PrescriptionUpdate, PrescriptionResponse
+from src.db.main import get_read_session, get_session
+from .models import Prescription
+from .schemas import PrescriptionBulkCreate, PrescriptionBulkUpdate, PrescriptionCreate, PrescriptionUpdate, PrescriptionResponse
 from .service import PrescriptionService
-from src.dependencies import AccessTokenBearer
+from src.dependencies import AccessTokenBearer, ensure_patient_access, ensure_same_user, require_patient_access
+from src.pagination import PageParams, set_next_cursor
+from src.serialization import json_response
+from src.versions.bumps import doctor_collection, patient_collection
+from src.versions.etags import check_collections, ensure_modified, make_etag, record_version
+from src.bulk import BulkDelete, BulkResponse
 
 prescription_router = APIRouter()
 
@@ -26,38 +32,85 @@ async def create_prescription(
     return new_prescription
 
 
+@prescription_router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_prescriptions(
+    bulk_data: PrescriptionBulkCreate,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    actor_id = uuid.UUID(token_data["user"]["id"]) if "id" in token_data["user"] else None
+    return await prescription_service.bulk_create_prescriptions(bulk_data, session, actor_id)
+
+
+@prescription_router.put("/bulk", response_model=BulkResponse)
+async def bulk_update_prescriptions(
+    bulk_data: PrescriptionBulkUpdate,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    actor_id = uuid.UUID(token_data["user"]["id"]) if "id" in token_data["user"] else None
+    return await prescription_service.bulk_update_prescriptions(bulk_data, session, actor_id)
+
+
+@prescription_router.post("/bulk-delete", response_model=BulkResponse)
+async def bulk_delete_prescriptions(
+    bulk_data: BulkDelete,
+    session: AsyncSession = Depends(get_session),
+    token_data: dict = Depends(access_token_bearer)
+):
+    actor_id = uuid.UUID(token_data["user"]["id"]) if "id" in token_data["user"] else None
+    return await prescription_service.bulk_delete_prescriptions(bulk_data, session, actor_id)
+
+
 @prescription_router.get("/{prescription_id}", response_model=PrescriptionResponse)
 async def get_prescription(
     prescription_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
+    version = await record_version(session, Prescription, uuid.UUID(prescription_id), "prescriptions")
+    if version is not None:
+        await ensure_patient_access(request, session, token_data, version.patient_id)
+        ensure_modified(request, response, make_etag(request, [version.version]))
     prescription = await prescription_service.get_prescription_by_id(uuid.UUID(prescription_id), session)
     if not prescription:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found"
         )
-    return prescription
+    return json_response(PrescriptionResponse, prescription, response)
 
 
 @prescription_router.get("/patient/{patient_id}", response_model=List[PrescriptionResponse])
 async def get_prescriptions_by_patient(
     patient_id: str,
-    session: AsyncSession = Depends(get_session),
-    token_data: dict = Depends(access_token_bearer)
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+    token_data: dict = Depends(require_patient_access)
 ):
-    prescriptions = await prescription_service.get_prescriptions_by_patient(uuid.UUID(patient_id), session)
-    return prescriptions
+    await check_collections(request, response, session, patient_collection("prescriptions", uuid.UUID(patient_id)))
+    prescriptions = await prescription_service.get_prescriptions_by_patient(uuid.UUID(patient_id), session, page)
+    set_next_cursor(response, prescriptions)
+    return json_response(PrescriptionResponse, prescriptions.items, response, many=True)
 
 
 @prescription_router.get("/doctor/{doctor_id}", response_model=List[PrescriptionResponse])
 async def get_prescriptions_by_doctor(
     doctor_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     token_data: dict = Depends(access_token_bearer)
 ):
-    prescriptions = await prescription_service.get_prescriptions_by_doctor(uuid.UUID(doctor_id), session)
-    return prescriptions
+    ensure_same_user(token_data, uuid.UUID(doctor_id))
+    await check_collections(request, response, session, doctor_collection("prescriptions", uuid.UUID(doctor_id)))
+    prescriptions = await prescription_service.get_prescriptions_by_doctor(uuid.UUID(doctor_id), session, page, accessible_only=True)
+    set_next_cursor(response, prescriptions)
+    return json_response(PrescriptionResponse, prescriptions.items, response, many=True)
 
 
 @prescription_router.put("/{prescription_id}", response_model=PrescriptionResponse)
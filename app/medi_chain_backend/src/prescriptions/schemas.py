@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
+from src.bulk import MAX_BULK_ITEMS, BulkMode
+
 
 class PrescriptionCreate(BaseModel):
     patient_id: uuid.UUID
@@ -18,6 +20,20 @@ class PrescriptionUpdate(BaseModel):
     instructions: Optional[str] = None
 
 
+class PrescriptionBulkCreate(BaseModel):
+    items: List[PrescriptionCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
+class PrescriptionBulkUpdateItem(PrescriptionUpdate):
+    id: uuid.UUID
+
+
+class PrescriptionBulkUpdate(BaseModel):
+    items: List[PrescriptionBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
 class PrescriptionResponse(BaseModel):
     id: uuid.UUID
     patient_id: uuid.UUID
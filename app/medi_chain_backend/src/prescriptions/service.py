@@ -1,70 +1,47 @@
 import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import delete, select
 from fastapi import HTTPException, status
+from src.pagination import Page, PageParams, paginate
+from src.consents.access import accessible_patient_ids
 from .models import Prescription
-from .schemas import PrescriptionCreate, PrescriptionUpdate
-from src.patients.models import Patient
-from src.doctors.models import Doctor
-from src.doctor_patient.models import DoctorPatient
-from src.doctor_patient.service import DoctorPatientService
+from .schemas import PrescriptionBulkCreate, PrescriptionBulkUpdate, PrescriptionCreate, PrescriptionUpdate
+from src.bulk import BulkDelete, BulkItemResult, BulkResponse, bulk_response
+from src.validation import ensure_references_exist, existing_references, link_doctor_patient, link_doctor_patient_pairs
 from src.audit_logs.models import AuditLog
-from typing import List, Optional
+from src.audit_logs.sink import audit_sink
+from src.dashboard.counters import CounterUpdates
+from src.response_cache import link_scopes, response_cache
+from src.versions.bumps import VersionBumps
+from typing import Optional
 
 
 class PrescriptionService:
-    def __init__(self):
-        self.doctor_patient_service = DoctorPatientService()
-
     async def get_prescription_by_id(self, prescription_id: uuid.UUID, session: AsyncSession):
         statement = select(Prescription).where(Prescription.id == prescription_id)
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_prescriptions_by_patient(self, patient_id: uuid.UUID, session: AsyncSession) -> List[Prescription]:
+    async def get_prescriptions_by_patient(self, patient_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None) -> Page:
         statement = select(Prescription).where(Prescription.patient_id == patient_id)
-        result = await session.execute(statement)
-        prescriptions = result.scalars().all()
-        return list(prescriptions)
+        return await paginate(session, statement, Prescription.created_at, Prescription.id, page)
 
-    async def get_prescriptions_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession) -> List[Prescription]:
+    async def get_prescriptions_by_doctor(self, doctor_id: uuid.UUID, session: AsyncSession, page: Optional[PageParams] = None, accessible_only: bool = False) -> Page:
+        """The doctor's prescriptions; with ``accessible_only``, only those of patients they may still access."""
         statement = select(Prescription).where(Prescription.doctor_id == doctor_id)
-        result = await session.execute(statement)
-        prescriptions = result.scalars().all()
-        return list(prescriptions)
+        if accessible_only:
+            patient_ids = await accessible_patient_ids(session, doctor_id)
+            statement = statement.where(Prescription.patient_id.in_(patient_ids))
+        return await paginate(session, statement, Prescription.created_at, Prescription.id, page)
 
     async def create_prescription(self, prescription_data: PrescriptionCreate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None):
-        # Check if patient exists
-        patient_statement = select(Patient).where(Patient.id == prescription_data.patient_id)
-        patient_result = await session.execute(patient_statement)
-        patient = patient_result.scalar_one_or_none()
-        
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-            )
-
-        # Check if doctor exists
-        doctor_statement = select(Doctor).where(Doctor.id == prescription_data.doctor_id)
-        doctor_result = await session.execute(doctor_statement)
-        doctor = doctor_result.scalar_one_or_none()
-        
-        if not doctor:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
-            )
-
-        # Create doctor-patient relationship if it doesn't exist
-        try:
-            from src.doctor_patient.schemas import DoctorPatientCreate
-            doctor_patient_data = DoctorPatientCreate(
-                doctor_id=prescription_data.doctor_id,
-                patient_id=prescription_data.patient_id
-            )
-            await self.doctor_patient_service.create_doctor_patient(doctor_patient_data, session)
-        except Exception as e:
-            # If relationship already exists, that's fine
-            pass
+        await ensure_references_exist(
+            session, patient_id=prescription_data.patient_id, doctor_id=prescription_data.doctor_id
+        )
+        counters = CounterUpdates()
+        linked = await link_doctor_patient(session, prescription_data.doctor_id, prescription_data.patient_id)
+        if linked:
+            counters.add(prescription_data.doctor_id, "active_patients")
 
         new_prescription = Prescription(
             patient_id=prescription_data.patient_id,
@@ -74,20 +51,24 @@ class PrescriptionService:
             instructions=prescription_data.instructions,
         )
         session.add(new_prescription)
-        await session.commit()
-        await session.refresh(new_prescription)
-        
-        # Create audit log
+        counters.add(new_prescription.doctor_id, "prescriptions")
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("prescriptions", new_prescription)
+        if linked:
+            versions.add_link(new_prescription.doctor_id, new_prescription.patient_id)
+        await versions.apply(session)
         if actor_id:
-            audit_log = AuditLog(
+            audit_sink.add(session, AuditLog(
                 actor_id=actor_id,
                 action="CREATE_PRESCRIPTION",
                 target_type="prescription",
                 target_id=new_prescription.id
-            )
-            session.add(audit_log)
-            await session.commit()
-        
+            ))
+        await session.commit()
+        if linked:
+            await response_cache.invalidate(*link_scopes(new_prescription.doctor_id))
+
         return new_prescription
 
     async def update_prescription(self, prescription_id: uuid.UUID, prescription_data: PrescriptionUpdate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None):
@@ -110,20 +91,19 @@ class PrescriptionService:
             prescription.instructions = prescription_data.instructions
 
         session.add(prescription)
-        await session.commit()
-        await session.refresh(prescription)
-        
-        # Create audit log
+        versions = VersionBumps()
+        versions.add_record("prescriptions", prescription)
+        await versions.apply(session)
         if actor_id:
-            audit_log = AuditLog(
+            audit_sink.add(session, AuditLog(
                 actor_id=actor_id,
                 action="UPDATE_PRESCRIPTION",
                 target_type="prescription",
                 target_id=prescription.id
-            )
-            session.add(audit_log)
-            await session.commit()
-        
+            ))
+        await session.commit()
+        await session.refresh(prescription)
+
         return prescription
 
     async def delete_prescription(self, prescription_id: uuid.UUID, session: AsyncSession, actor_id: Optional[uuid.UUID] = None):
@@ -134,17 +114,130 @@ class PrescriptionService:
             )
 
         await session.delete(prescription)
-        await session.commit()
-        
-        # Create audit log
+        counters = CounterUpdates()
+        counters.add(prescription.doctor_id, "prescriptions", -1)
+        await counters.apply(session)
+        versions = VersionBumps()
+        versions.add_record("prescriptions", prescription)
+        await versions.apply(session)
         if actor_id:
-            audit_log = AuditLog(
+            audit_sink.add(session, AuditLog(
                 actor_id=actor_id,
                 action="DELETE_PRESCRIPTION",
                 target_type="prescription",
                 target_id=prescription_id
-            )
-            session.add(audit_log)
-            await session.commit()
-        
-        return {"message": "Prescription deleted successfully"}
\ No newline at end of file
+            ))
+        await session.commit()
+
+        return {"message": "Prescription deleted successfully"}
+
+    async def bulk_create_prescriptions(self, bulk_data: PrescriptionBulkCreate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None) -> BulkResponse:
+        items = bulk_data.items
+        patients, doctors = await existing_references(
+            session, {item.patient_id for item in items}, {item.doctor_id for item in items}
+        )
+
+        results, new_prescriptions = [], []
+        for index, item in enumerate(items):
+            if item.patient_id not in patients:
+                results.append(BulkItemResult(index=index, status="error", error="Patient not found"))
+            elif item.doctor_id not in doctors:
+                results.append(BulkItemResult(index=index, status="error", error="Doctor not found"))
+            else:
+                prescription = Prescription(**item.model_dump())
+                new_prescriptions.append(prescription)
+                results.append(BulkItemResult(index=index, id=prescription.id, status="created"))
+        response = await bulk_response(session, bulk_data.mode, results)
+        if not new_prescriptions:
+            return response
+
+        counters = CounterUpdates()
+        linked = await link_doctor_patient_pairs(session, [(prescription.doctor_id, prescription.patient_id) for prescription in new_prescriptions])
+        for doctor_id, _ in linked:
+            counters.add(doctor_id, "active_patients")
+        for prescription in new_prescriptions:
+            counters.add(prescription.doctor_id, "prescriptions")
+        await counters.apply(session)
+        versions = VersionBumps()
+        for prescription in new_prescriptions:
+            versions.add_record("prescriptions", prescription)
+        for doctor_id, patient_id in linked:
+            versions.add_link(doctor_id, patient_id)
+        await versions.apply(session)
+        session.add_all(new_prescriptions)
+        if actor_id:
+            audit_sink.add_all(session, [
+                AuditLog(actor_id=actor_id, action="CREATE_PRESCRIPTION", target_type="prescription", target_id=prescription.id)
+                for prescription in new_prescriptions
+            ])
+        await session.commit()
+        await response_cache.invalidate(*[scope for doctor_id, _ in linked for scope in link_scopes(doctor_id)])
+
+        return response
+
+    async def bulk_update_prescriptions(self, bulk_data: PrescriptionBulkUpdate, session: AsyncSession, actor_id: Optional[uuid.UUID] = None) -> BulkResponse:
+        ids = {item.id for item in bulk_data.items}
+        result = await session.execute(select(Prescription).where(Prescription.id.in_(ids)))
+        prescriptions = {prescription.id: prescription for prescription in result.scalars()}
+
+        results = []
+        for index, item in enumerate(bulk_data.items):
+            prescription = prescriptions.get(item.id)
+            if prescription is None:
+                results.append(BulkItemResult(index=index, id=item.id, status="error", error="Prescription not found"))
+                continue
+            # Update only provided fields
+            for field, value in item.model_dump(exclude={"id"}, exclude_none=True).items():
+                setattr(prescription, field, value)
+            results.append(BulkItemResult(index=index, id=item.id, status="updated"))
+        response = await bulk_response(session, bulk_data.mode, results)
+
+        updated_ids = {r.id for r in results if r.status == "updated"}
+        versions = VersionBumps()
+        for prescription_id in updated_ids:
+            versions.add_record("prescriptions", prescriptions[prescription_id])
+        await versions.apply(session)
+        if actor_id:
+            audit_sink.add_all(session, [
+                AuditLog(actor_id=actor_id, action="UPDATE_PRESCRIPTION", target_type="prescription", target_id=prescription_id)
+                for prescription_id in updated_ids
+            ])
+        await session.commit()
+
+        return response
+
+    async def bulk_delete_prescriptions(self, bulk_data: BulkDelete, session: AsyncSession, actor_id: Optional[uuid.UUID] = None) -> BulkResponse:
+        ids = set(bulk_data.ids)
+        result = await session.execute(
+            select(Prescription.id, Prescription.patient_id, Prescription.doctor_id).where(Prescription.id.in_(ids))
+        )
+        found = {row.id: row for row in result}
+
+        results, deleted = [], set()
+        for index, prescription_id in enumerate(bulk_data.ids):
+            if prescription_id not in found or prescription_id in deleted:
+                results.append(BulkItemResult(index=index, id=prescription_id, status="error", error="Prescription not found"))
+            else:
+                deleted.add(prescription_id)
+                results.append(BulkItemResult(index=index, id=prescription_id, status="deleted"))
+        response = await bulk_response(session, bulk_data.mode, results)
+        if not deleted:
+            return response
+
+        await session.execute(delete(Prescription).where(Prescription.id.in_(deleted)))
+        counters = CounterUpdates()
+        for prescription_id in deleted:
+            counters.add(found[prescription_id].doctor_id, "prescriptions", -1)
+        await counters.apply(session)
+        versions = VersionBumps()
+        for prescription_id in deleted:
+            versions.add_record("prescriptions", found[prescription_id])
+        await versions.apply(session)
+        if actor_id:
+            audit_sink.add_all(session, [
+                AuditLog(actor_id=actor_id, action="DELETE_PRESCRIPTION", target_type="prescription", target_id=prescription_id)
+                for prescription_id in deleted
+            ])
+        await session.commit()
+
+        return response
\ No newline at end of file
@@ -0,0 +1,257 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from src.config import config
+from src.pagination import NEXT_CURSOR_HEADER, Page
+from src.serialization import serializer_for
+from src.versions.etags import ETAG_HEADER, etag_matches
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+# (JSON body, extra response headers)
+Entry = Tuple[bytes, Dict[str, str]]
+
+
+def doctor_scope(resource: str, doctor_id: uuid.UUID) -> str:
+    """Invalidation scope for one doctor's ``resource`` listing."""
+    return f"{resource}:doctor:{doctor_id}"
+
+
+def link_scopes(doctor_id: uuid.UUID) -> Tuple[str, str]:
+    """Scopes a doctor-patient link change affects: the doctor's patient
+    listing and, through record access, their appointment listing."""
+    return doctor_scope("doctor_patient", doctor_id), doctor_scope("appointments", doctor_id)
+
+
+def page_entry(page: Page, model: Type[BaseModel], etag: Optional[str] = None) -> Entry:
+    """Serialize a page the way the route's ``response_model`` would."""
+    body = serializer_for(model).dumps_many(page.items)
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if etag:
+        headers[ETAG_HEADER] = etag
+    return body, headers
+
+
+class LocalCacheBackend:
+    """In-process stand-in for the Redis commands the response cache uses.
+
+    ``get``, ``set`` (with ``ex``) and ``incr`` behave like their Redis
+    namesakes. Plain values are LRU-bounded; counters are never evicted,
+    since losing a scope version could resurrect entries it invalidated.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._values: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        expires_at = time.monotonic() + ex if ex else None
+        self._values[key] = (expires_at, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def aclose(self):
+        pass
+
+    def __len__(self):
+        return len(self._values)
+
+
+class ResponseCache:
+    """Caches serialized list responses keyed by route, principal and query.
+
+    Each key embeds the current version of an invalidation scope (for
+    example one doctor's appointments); services bump the version after
+    committing a change, which orphans every cached variant of that scope at
+    once and lets them expire. Concurrent misses for the same key inside a
+    worker share a single load. With ``REDIS_URL`` the entries and versions
+    are shared by all workers; otherwise each worker caches on its own and
+    other workers see a change within ``ttl``. Entries that carry an ETag
+    answer a matching ``If-None-Match`` with 304.
+
+    Responses filtered by record access are only cached when the cache is
+    shared: a worker-local entry would keep showing records for up to
+    ``ttl`` after another worker committed a revocation, longer than the
+    consent decision cache allows.
+    """
+
+    def __init__(self, ttl: int, max_entries: int, redis_url: Optional[str], prefix: str):
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self.backend = LocalCacheBackend(max_entries)
+        self.backend_name = "local"
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.errors = 0
+        self.bypasses = 0
+
+    @property
+    def shared(self) -> bool:
+        return self.backend_name == "redis"
+
+    async def start(self):
+        if not self.redis_url or self.backend_name == "redis":
+            return
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; "
+                           "the response cache stays in-process")
+            return
+        self.backend = redis.from_url(self.redis_url)
+        self.backend_name = "redis"
+
+    async def stop(self):
+        await self.backend.aclose()
+        self.backend = LocalCacheBackend(self.max_entries)
+        self.backend_name = "local"
+
+    def _version_key(self, scope: str) -> str:
+        return f"{self.prefix}:version:{scope}"
+
+    def _entry_key(self, request: Request, principal: str, version: bytes) -> str:
+        query = sorted(request.query_params.multi_items())
+        digest = hashlib.sha256(json.dumps(query).encode()).hexdigest()[:32]
+        return f"{self.prefix}:entry:{request.url.path}:{principal}:{version.decode()}:{digest}"
+
+    async def respond(
+        self,
+        request: Request,
+        token_data: dict,
+        scope: str,
+        load: Callable[[], Awaitable[Entry]],
+        access_filtered: bool = False,
+    ) -> Response:
+        """Serve the cached response for this request, loading it on a miss.
+
+        ``access_filtered`` responses bypass an unshared cache.
+        """
+        if access_filtered and not self.shared:
+            self.bypasses += 1
+            return self._response(request, await load(), "BYPASS")
+        user = token_data["user"]
+        principal = str(user.get("id") or user.get("email"))
+        try:
+            version = await self.backend.get(self._version_key(scope)) or b"0"
+            key = self._entry_key(request, principal, version)
+            cached = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Response cache unavailable; serving from the database", exc_info=True)
+            return self._response(request, await load(), "BYPASS")
+
+        if cached is not None:
+            self.hits += 1
+            headers, body = cached.split(b"\n", 1)
+            return self._response(request, (body, json.loads(headers)), "HIT")
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            entry = await asyncio.shield(flight)
+            if entry is not None:
+                self.hits += 1
+                self.coalesced += 1
+                return self._response(request, entry, "HIT")
+            self.misses += 1
+            return self._response(request, await load(), "MISS")
+
+        self.misses += 1
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        entry = None
+        try:
+            entry = await load()
+            body, headers = entry
+            try:
+                await self.backend.set(key, json.dumps(headers).encode() + b"\n" + body, ex=self.ttl)
+            except Exception:
+                self.errors += 1
+                logger.warning("Storing a cached response failed", exc_info=True)
+        finally:
+            # Waiters load for themselves if this load failed.
+            flight.set_result(entry)
+            del self._flights[key]
+        return self._response(request, entry, "MISS")
+
+    @staticmethod
+    def _response(request: Request, entry: Entry, cache_status: str) -> Response:
+        body, headers = entry
+        etag = headers.get(ETAG_HEADER)
+        if etag and etag_matches(request, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={ETAG_HEADER: etag, CACHE_STATUS_HEADER: cache_status},
+            )
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, CACHE_STATUS_HEADER: cache_status},
+        )
+
+    async def invalidate(self, *scopes: str):
+        """Drop every cached response of ``scopes``. Call after commit."""
+        for scope in set(scopes):
+            try:
+                await self.backend.incr(self._version_key(scope))
+                self.invalidations += 1
+            except Exception:
+                # Entries of this scope go stale for at most ``ttl``.
+                self.errors += 1
+                logger.exception("Invalidating cached responses for %s failed", scope)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend_name,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "invalidations": self.invalidations,
+            "bypasses": self.bypasses,
+            "errors": self.errors,
+        }
+
+
+response_cache = ResponseCache(
+    ttl=config.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    redis_url=config.REDIS_URL,
+    prefix=config.RESPONSE_CACHE_PREFIX,
+)
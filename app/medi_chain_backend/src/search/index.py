@@ -0,0 +1,194 @@
+import heapq
+import re
+import time
+import uuid
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import config
+
+WORD = re.compile(r"\w+")
+
+
+def _prefix_range(entries: Sequence[str], prefix: str) -> range:
+    """Positions in a sorted list of strings of the ones starting with ``prefix``."""
+    return range(bisect_left(entries, prefix), bisect_left(entries, prefix + "\U0010ffff"))
+
+
+class PrefixIndex:
+    """One table's searchable rows, with their words and phones kept sorted.
+
+    Rows are kept in id order, so a row's position doubles as its rank in
+    the (score, id) result order. Every distinct word maps each field
+    weight it appears under to the positions of its rows, highest first;
+    the words starting with a prefix are a bisected range of the sorted
+    vocabulary.
+
+    A query term scores the weight of the best field it matches (half of it
+    for a prefix of a word rather than the whole word) and a row must match
+    every term; a phone prefix match adds 1. A single term, the usual
+    typeahead case, is answered by merging the already ordered position
+    lists score level by score level until the page is full, so its cost
+    depends on the page size rather than on how many rows match.
+    """
+
+    def __init__(self, columns: List[str], rows: List[tuple], weights: Dict[str, float]):
+        self.columns = columns
+        self.loaded_at = time.monotonic()
+        id_column = columns.index("id")
+        self._rows = sorted(rows, key=lambda row: row[id_column].int)
+        self._ids = [row[id_column] for row in self._rows]
+        self._positions = {row_id: position for position, row_id in enumerate(self._ids)}
+
+        fields = [(columns.index(field), weight) for field, weight in weights.items()]
+        postings: Dict[str, Dict[float, List[int]]] = {}
+        self._row_words: List[Dict[str, float]] = []
+        for position, row in enumerate(self._rows):
+            words: Dict[str, float] = {}
+            for column, weight in fields:
+                for word in WORD.findall((row[column] or "").lower()):
+                    if weight > words.get(word, 0):
+                        words[word] = weight
+            self._row_words.append(words)
+            for word, weight in words.items():
+                postings.setdefault(word, {}).setdefault(weight, []).append(position)
+        self._vocabulary = sorted(postings)
+        self._postings = [postings[word] for word in self._vocabulary]
+        for by_weight in self._postings:
+            for positions in by_weight.values():
+                positions.reverse()
+
+        phone_column = columns.index("phone")
+        phones = sorted((row[phone_column], position) for position, row in enumerate(self._rows) if row[phone_column])
+        self._phones = [phone for phone, _ in phones]
+        self._phone_rows = [position for _, position in phones]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def row(self, row_id: uuid.UUID) -> dict:
+        return dict(zip(self.columns, self._rows[self._positions[row_id]]))
+
+    @staticmethod
+    def _term_score(words: Dict[str, float], term: str) -> float:
+        best = 0.0
+        for word, weight in words.items():
+            if word.startswith(term):
+                best = max(best, weight if word == term else weight / 2)
+        return best
+
+    def scores(self, terms: List[str], phone: Optional[str]) -> Dict[uuid.UUID, float]:
+        return {self._ids[position]: score for position, score in self._scores(terms, phone).items()}
+
+    def _scores(self, terms: List[str], phone: Optional[str]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        if terms:
+            # Start from the term with the fewest rows, check the rest per row.
+            ranges = sorted(
+                ((_prefix_range(self._vocabulary, term), term) for term in terms),
+                key=lambda entry: sum(len(positions) for i in entry[0] for positions in self._postings[i].values()),
+            )
+            words, first = ranges[0]
+            for i in words:
+                exact = self._vocabulary[i] == first
+                for weight, positions in self._postings[i].items():
+                    score = weight if exact else weight / 2
+                    for position in positions:
+                        if score > scores.get(position, 0):
+                            scores[position] = score
+            for _, term in ranges[1:]:
+                remaining = {}
+                for position, score in scores.items():
+                    term_score = self._term_score(self._row_words[position], term)
+                    if term_score:
+                        remaining[position] = score + term_score
+                scores = remaining
+        if phone:
+            for i in _prefix_range(self._phones, phone):
+                position = self._phone_rows[i]
+                scores[position] = scores.get(position, 0) + 1.0
+        return scores
+
+    def _top_for_term(self, term: str, limit: int, after: Optional[Tuple[float, int]]) -> List[Tuple[float, int]]:
+        levels: Dict[float, List[List[int]]] = {}
+        for i in _prefix_range(self._vocabulary, term):
+            exact = self._vocabulary[i] == term
+            for weight, positions in self._postings[i].items():
+                levels.setdefault(weight if exact else weight / 2, []).append(positions)
+        results = []
+        for score in sorted(levels, reverse=True):
+            if after is not None and score > after[0]:
+                continue
+            previous = None
+            for position in heapq.merge(*levels[score], reverse=True):
+                if position == previous:
+                    continue
+                previous = position
+                if after is not None and (score, position) >= after:
+                    continue
+                # Rows matching better under another word were ranked at that level.
+                if self._term_score(self._row_words[position], term) != score:
+                    continue
+                results.append((score, position))
+                if len(results) == limit:
+                    return results
+        return results
+
+    def search(self, terms: List[str], phone: Optional[str], limit: int,
+               after: Optional[Tuple[float, uuid.UUID]] = None) -> List[Tuple[float, uuid.UUID]]:
+        """Up to ``limit`` (score, id) pairs, best first, following ``after``."""
+        if after is not None:
+            # Positions follow id order, for ids no longer in the index too.
+            after = (after[0], bisect_left(self._ids, after[1]))
+        if len(terms) == 1 and not phone:
+            ranked = self._top_for_term(terms[0], limit, after)
+        else:
+            ranked = ((score, position) for position, score in self._scores(terms, phone).items())
+            if after is not None:
+                ranked = (entry for entry in ranked if entry < after)
+            ranked = heapq.nlargest(limit, ranked)
+        return [(score, self._ids[position]) for score, position in ranked]
+
+
+class SearchIndexes:
+    """Per-table ``PrefixIndex`` objects for databases without Postgres search.
+
+    An index is loaded with one query on first use, rebuilt after ``ttl``
+    seconds so rows written by other workers show up, and dropped by
+    ``invalidate`` when this process adds or removes rows.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._indexes: Dict[str, PrefixIndex] = {}
+        self.loads = 0
+        self.hits = 0
+
+    async def get(self, session: AsyncSession, name: str, columns: list, weights: Dict[str, float]) -> PrefixIndex:
+        index = self._indexes.get(name)
+        if index is not None and time.monotonic() - index.loaded_at < self.ttl:
+            self.hits += 1
+            return index
+        rows = (await session.execute(select(*columns))).all()
+        index = self._indexes[name] = PrefixIndex([column.key for column in columns], rows, weights)
+        self.loads += 1
+        return index
+
+    def invalidate(self, name: str):
+        self._indexes.pop(name, None)
+
+    def clear(self):
+        self._indexes.clear()
+
+    def stats(self) -> dict:
+        return {
+            "rows": {name: len(index) for name, index in self._indexes.items()},
+            "loads": self.loads,
+            "hits": self.hits,
+        }
+
+
+search_indexes = SearchIndexes(ttl=config.SEARCH_INDEX_TTL_SECONDS)
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+import uuid
+
+
+class PatientSearchResult(BaseModel):
+    id: uuid.UUID
+    full_name: str
+    email: str
+    phone: Optional[str] = None
+    date_of_birth: Optional[datetime] = None
+    score: float
+
+
+class DoctorSearchResult(BaseModel):
+    id: uuid.UUID
+    full_name: str
+    specialization: str
+    hospital_name: str
+    phone: Optional[str] = None
+    score: float
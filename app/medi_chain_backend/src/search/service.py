@@ -0,0 +1,128 @@
+import re
+from dataclasses import dataclass
+from typing import Annotated, Dict, List, Optional, Type
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import Float, case, cast, func, literal, literal_column, or_, tuple_
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.doctors.models import SEARCH_VECTOR as DOCTOR_VECTOR, Doctor
+from src.pagination import Page, decode_rank_cursor, encode_rank_cursor
+from src.patients.models import SEARCH_VECTOR as PATIENT_VECTOR, Patient
+from .index import WORD, search_indexes
+from .schemas import DoctorSearchResult, PatientSearchResult
+
+MAX_TERMS = 5
+PHONE = re.compile(r"\+?[\d\s().-]{3,}")
+
+
+class SearchParams:
+    """Query, page size and cursor for the search endpoints."""
+
+    def __init__(
+        self,
+        q: Annotated[str, Query(min_length=2, max_length=100)],
+        limit: Annotated[int, Query(ge=1, le=50)] = 10,
+        cursor: Annotated[Optional[str], Query()] = None,
+    ):
+        self.q = q
+        self.limit = limit
+        self.cursor = cursor
+
+
+@dataclass
+class Searchable:
+    model: Type[SQLModel]
+    vector: str
+    # Field weights, as Postgres ranks tsvector weights A, B and C.
+    weights: Dict[str, float]
+    result: Type[BaseModel]
+
+    @property
+    def columns(self) -> list:
+        return [getattr(self.model, name) for name in self.result.model_fields if name != "score"]
+
+
+SEARCHABLE = {
+    "patients": Searchable(Patient, PATIENT_VECTOR, {"full_name": 1.0}, PatientSearchResult),
+    "doctors": Searchable(
+        Doctor, DOCTOR_VECTOR, {"full_name": 1.0, "specialization": 0.4, "hospital_name": 0.2}, DoctorSearchResult
+    ),
+}
+
+
+@dataclass
+class SearchQuery:
+    text: str
+    terms: List[str]
+    # Set when the query looks like (the start of) a phone number.
+    phone: Optional[str] = None
+
+
+def parse_query(q: str) -> SearchQuery:
+    text = " ".join(q.split())
+    phone = text.replace(" ", "") if PHONE.fullmatch(text) else None
+    terms = WORD.findall(text.lower())[:MAX_TERMS]
+    if not terms and not phone:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Search query has no words to match"
+        )
+    return SearchQuery(text=text, terms=terms, phone=phone)
+
+
+def postgres_statement(searchable: Searchable, query: SearchQuery, limit: int, after=None):
+    """Ranked matches on the tsvector, trigram and phone indexes.
+
+    A row matches if every term prefixes one of its words, if its name is
+    trigram-similar to the query (typos) or if its phone starts with the
+    query. The score is ``ts_rank`` plus name similarity, plus 1 for a
+    phone match.
+    """
+    model = searchable.model
+    conditions, score = [], literal(0.0)
+    if query.terms:
+        # Must stay textually identical to the indexed expression.
+        vector = literal_column(f"({searchable.vector})")
+        tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in query.terms))
+        conditions += [vector.op("@@")(tsquery), model.full_name.op("%")(query.text)]
+        score = func.ts_rank(vector, tsquery) + func.similarity(model.full_name, query.text)
+    if query.phone:
+        phone_match = model.phone.like(f"{query.phone}%")
+        conditions.append(phone_match)
+        score = score + case((phone_match, 1.0), else_=0.0)
+    score = cast(score, Float)
+
+    statement = select(*searchable.columns, score.label("score")).where(or_(*conditions))
+    if after is not None:
+        statement = statement.where(tuple_(score, model.id) < tuple_(*after))
+    return statement.order_by(score.desc(), model.id.desc()).limit(limit)
+
+
+class SearchService:
+    async def search(self, kind: str, params: SearchParams, session: AsyncSession) -> Page:
+        """A page of ``kind`` ranked by relevance; rows are dicts shaped like the result schema.
+
+        Postgres answers from its search indexes; other databases (SQLite
+        in development and tests) from the in-process ``search_indexes``.
+        """
+        searchable = SEARCHABLE[kind]
+        query = parse_query(params.q)
+        after = decode_rank_cursor(params.cursor) if params.cursor else None
+
+        if session.get_bind().dialect.name == "postgresql":
+            result = await session.execute(postgres_statement(searchable, query, params.limit + 1, after))
+            rows = [dict(row) for row in result.mappings()]
+        else:
+            index = await search_indexes.get(session, kind, searchable.columns, searchable.weights)
+            rows = [
+                {**index.row(row_id), "score": score}
+                for score, row_id in index.search(query.terms, query.phone, params.limit + 1, after)
+            ]
+
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            next_cursor = encode_rank_cursor(rows[-1]["score"], rows[-1]["id"])
+        return Page(items=rows, next_cursor=next_cursor)
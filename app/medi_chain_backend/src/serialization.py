@@ -0,0 +1,157 @@
+"""JSON rendering with orjson, and a fast path for ORM rows.
+
+``FastJSONResponse`` is the API routers' default response class (set as
+they are included, see ``src.startup.include_router``). Routes whose
+``response_model`` is built from rows the service layer just loaded can
+return ``json_response(Model, rows)`` instead: the rows go straight to bytes
+through a ``RowSerializer`` and FastAPI skips validating them against the
+response model again. Only use it for trusted internal objects (ORM rows,
+dicts built by the services), never for client input.
+"""
+import typing
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_MISSING = object()
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson with pydantic's JSON conventions ("Z" for UTC)."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson instead of ``json.dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _nested_model(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """``(Model, many)`` for ``Model``, ``Optional[Model]`` and ``List[Model]`` fields."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        (item,) = typing.get_args(annotation) or (None,)
+        model, _ = _nested_model(item)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _tuple_getter(getter, names: List[str]):
+    get = getter(*names)
+    return get if len(names) > 1 else lambda obj: (get(obj),)
+
+
+class RowSerializer:
+    """Dumps objects to the JSON ``model`` would produce, without validating them.
+
+    Reads the model's fields from attributes (ORM rows, pydantic models) or
+    keys (dicts); missing ones fall back to the field default. Nested
+    ``Model``, ``Optional[Model]`` and ``List[Model]`` fields are handled by
+    their own serializers; every other value is passed to orjson as is.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields = []
+        for name, field in model.model_fields.items():
+            nested, many = _nested_model(field.annotation)
+            self.fields.append((name, field.serialization_alias or field.alias or name, field, nested, many))
+        self._keys = [key for _, key, _, _, _ in self.fields]
+        self._flat = all(nested is None for _, _, _, nested, _ in self.fields)
+        # Fetch every field of an object in one call (a tuple for 2+ fields).
+        # Loaded ORM columns and pydantic fields live in the instance
+        # ``__dict__``, which is much cheaper to read than the instrumented
+        # attributes; anything else falls back to ``getattr``.
+        names = [name for name, _, _, _, _ in self.fields]
+        self._from_dict = _tuple_getter(itemgetter, names)
+        self._from_attributes = _tuple_getter(attrgetter, names)
+
+    def _values(self, obj) -> tuple:
+        state = getattr(obj, "__dict__", None)
+        if state is not None:
+            try:
+                return self._from_dict(state)
+            except KeyError:
+                pass
+        return self._from_attributes(obj)
+
+    def to_python(self, obj) -> dict:
+        if not isinstance(obj, Mapping):
+            try:
+                values = self._values(obj)
+            except AttributeError:
+                pass
+            else:
+                if self._flat:
+                    return dict(zip(self._keys, values))
+                return {
+                    key: self._nested(nested, many, value)
+                    for (_, key, _, nested, many), value in zip(self.fields, values)
+                }
+        get = obj.get if isinstance(obj, Mapping) else lambda name, default: getattr(obj, name, default)
+        data = {}
+        for name, key, field, nested, many in self.fields:
+            value = get(name, _MISSING)
+            if value is _MISSING:
+                value = field.get_default(call_default_factory=True)
+            data[key] = self._nested(nested, many, value)
+        return data
+
+    @staticmethod
+    def _nested(nested: Optional[Type[BaseModel]], many: bool, value):
+        if nested is None or value is None:
+            return value
+        serializer = serializer_for(nested)
+        return [serializer.to_python(item) for item in value] if many else serializer.to_python(value)
+
+    def dumps(self, obj) -> bytes:
+        return dumps(self.to_python(obj))
+
+    def dumps_many(self, rows: Iterable) -> bytes:
+        to_python = self.to_python
+        return dumps([to_python(row) for row in rows])
+
+
+@lru_cache(maxsize=None)
+def serializer_for(model: Type[BaseModel]) -> RowSerializer:
+    return RowSerializer(model)
+
+
+def json_response(model: Type[BaseModel], content, response: Optional[Response] = None, many: bool = False) -> Response:
+    """A response with ``content`` dumped as ``model`` (a list of them with ``many``).
+
+    Headers already set on the route's injected ``response`` (cursor, ETag)
+    are carried over, since FastAPI ignores it when a route returns its own
+    ``Response``.
+    """
+    serializer = serializer_for(model)
+    body = serializer.dumps_many(content) if many else serializer.dumps(content)
+    result = Response(content=body, media_type="application/json")
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                result.headers[name] = value
+    return result
@@ -0,0 +1,116 @@
+"""Startup timing and lazily included routers.
+
+``startup_timings`` records how long ``src.main`` took to import, how long
+each router module took to import and each startup step took, and when the
+app was ready; ``GET /health/startup`` shows them.
+
+With ``LAZY_ROUTERS`` the router modules (and the schemas, services and
+route signatures they build) are not imported at startup. ``LazyRouters``
+includes a router on the first request under its prefix instead, and all
+of them before the OpenAPI schema or docs are served, so the first request
+to each prefix pays that import once per worker.
+"""
+import time
+
+# Taken before anything else is imported so ``import_ms`` covers
+# FastAPI, SQLAlchemy and the models as well as src.main itself.
+STARTED = time.perf_counter()
+
+import importlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+
+@dataclass
+class RouterSpec:
+    module: str
+    attribute: str
+    prefix: str
+    tags: List[str] = field(default_factory=list)
+
+
+class StartupTimings:
+    def __init__(self):
+        self.started = STARTED
+        self.imported: Optional[float] = None
+        self.ready: Optional[float] = None
+        self.modules: Dict[str, float] = {}
+        self.steps: Dict[str, float] = {}
+        self.schema: Optional[str] = None
+
+    def import_module(self, name: str):
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.modules[name] = time.perf_counter() - start
+        return module
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - start
+
+    def mark_imported(self):
+        self.imported = time.perf_counter()
+
+    def mark_ready(self):
+        self.ready = time.perf_counter()
+
+    def stats(self) -> dict:
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 2)
+
+        return {
+            "import_ms": ms(self.imported and self.imported - self.started),
+            "ready_ms": ms(self.ready and self.ready - self.started),
+            "schema": self.schema,
+            "steps_ms": {name: ms(seconds) for name, seconds in self.steps.items()},
+            "router_imports_ms": {name: ms(seconds) for name, seconds in self.modules.items()},
+        }
+
+
+startup_timings = StartupTimings()
+
+
+def include_router(app: "FastAPI", spec: RouterSpec):
+    from src.serialization import FastJSONResponse
+
+    router = getattr(startup_timings.import_module(spec.module), spec.attribute)
+    app.include_router(router, prefix=spec.prefix, tags=spec.tags, default_response_class=FastJSONResponse)
+    # A schema generated before this router was included would lack it.
+    app.openapi_schema = None
+
+
+class LazyRouters:
+    """ASGI middleware including each pending router on first use."""
+
+    def __init__(self, app, specs: List[RouterSpec]):
+        self.app = app
+        self.pending = list(specs)
+
+    def _load(self, app: "FastAPI", path: str):
+        docs_paths = {app.openapi_url, app.docs_url, app.redoc_url}
+        load_all = path in docs_paths
+        for spec in list(self.pending):
+            if load_all or path == spec.prefix or path.startswith(spec.prefix + "/"):
+                self.pending.remove(spec)
+                include_router(app, spec)
+
+    async def __call__(self, scope, receive, send):
+        if self.pending and scope["type"] in ("http", "websocket"):
+            self._load(scope["app"], scope["path"])
+        await self.app(scope, receive, send)
+
+
+def include_routers(app: "FastAPI", specs: List[RouterSpec], lazy: bool = False):
+    if lazy:
+        app.add_middleware(LazyRouters, specs=specs)
+        return
+    for spec in specs:
+        include_router(app, spec)
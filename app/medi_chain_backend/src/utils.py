@@ -1,11 +1,25 @@
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from src.config import config
+from fastapi import HTTPException, status
 from passlib.hash import argon2
+import asyncio
+import time
 import uuid
 import logging
 import jwt
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; convert aware input to match."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 
 def generate_password_hash(password: str) -> str:
     return argon2.hash(password)
@@ -15,6 +29,88 @@ def verify_password(password: str, hash: str) -> bool:
     return argon2.verify(password, hash)
 
 
+class PasswordHasherPool:
+    """Runs argon2 off the event loop on a bounded worker pool.
+
+    At most ``max_pending`` calls may be queued or running at once; beyond
+    that callers get a 503 instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int, kind: str = "thread"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        self._latencies = {"hash": deque(maxlen=1024), "verify": deque(maxlen=1024)}
+        self._counts = {"hash": 0, "verify": 0}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _submit(self, operation: str, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            self._counts[operation] += 1
+            self._latencies[operation].append(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", generate_password_hash, password)
+
+    async def verify(self, password: str, hash: str) -> bool:
+        return await self._submit("verify", verify_password, password, hash)
+
+    def stats(self) -> dict:
+        stats = {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+        for operation, samples in self._latencies.items():
+            ordered = sorted(samples)
+            stats[operation] = {
+                "count": self._counts[operation],
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3) if ordered else None,
+                "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 3) if ordered else None,
+                "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+            }
+        return stats
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    workers=config.PASSWORD_HASH_WORKERS,
+    max_pending=config.PASSWORD_HASH_MAX_PENDING,
+    kind=config.PASSWORD_HASH_EXECUTOR,
+)
+
+
 ACCESS_TOKEN_EXPIRY = 3600
 
 
@@ -42,5 +138,5 @@ def decode_token(token: str) -> Optional[dict]:
         )
         return token_data
     except jwt.PyJWTError as e:
-        logging.exception(e)
-        return None
\ No newline at end of file
+        logger.info("Rejected token: %s", e, extra={"event": "token.rejected"})
+        return None
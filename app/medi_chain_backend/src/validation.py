@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import exists, false, literal, or_, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.consents.cache import consent_invalidations
+from src.doctor_patient.models import DoctorPatient
+from src.doctors.models import Doctor
+from src.patients.models import Patient
+
+
+async def ensure_references_exist(
+    session: AsyncSession,
+    patient_id: Optional[uuid.UUID] = None,
+    doctor_id: Optional[uuid.UUID] = None,
+):
+    """Check the referenced patient and doctor in a single SELECT.
+
+    Raises the same 404s the services used to raise after fetching each row.
+    """
+    checks = []
+    if patient_id is not None:
+        checks.append(exists().where(Patient.id == patient_id).label("patient"))
+    if doctor_id is not None:
+        checks.append(exists().where(Doctor.id == doctor_id).label("doctor"))
+    if not checks:
+        return
+
+    row = (await session.execute(select(*checks))).one()
+    if patient_id is not None and not row.patient:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+    if doctor_id is not None and not row.doctor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found"
+        )
+
+
+async def existing_references(
+    session: AsyncSession,
+    patient_ids: Iterable[uuid.UUID],
+    doctor_ids: Iterable[uuid.UUID],
+) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+    """Return which of the given patient and doctor ids exist, in one query."""
+    patient_ids, doctor_ids = set(patient_ids), set(doctor_ids)
+    parts = []
+    if patient_ids:
+        parts.append(select(literal("patient").label("kind"), Patient.id).where(Patient.id.in_(patient_ids)))
+    if doctor_ids:
+        parts.append(select(literal("doctor").label("kind"), Doctor.id).where(Doctor.id.in_(doctor_ids)))
+    if not parts:
+        return set(), set()
+
+    found_patients, found_doctors = set(), set()
+    for kind, row_id in await session.execute(union_all(*parts)):
+        (found_patients if kind == "patient" else found_doctors).add(row_id)
+    return found_patients, found_doctors
+
+
+def dialect_insert(session: AsyncSession, table):
+    """INSERT construct for the session's dialect, so ON CONFLICT is available."""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def _link_statement(session: AsyncSession, rows: List[dict], grants_access: bool = False):
+    statement = dialect_insert(session, DoctorPatient).values(rows)
+    if grants_access:
+        return statement.on_conflict_do_update(
+            index_elements=[DoctorPatient.doctor_id, DoctorPatient.patient_id],
+            set_={"is_active": True, "grants_access": True},
+            where=or_(DoctorPatient.is_active == false(), DoctorPatient.grants_access == false()),
+        )
+    return statement.on_conflict_do_update(
+        index_elements=[DoctorPatient.doctor_id, DoctorPatient.patient_id],
+        set_={"is_active": True},
+        where=DoctorPatient.is_active == false(),
+    )
+
+
+def _link_row(doctor_id, patient_id, relationship_type="primary_care", grants_access=False) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "doctor_id": doctor_id,
+        "patient_id": patient_id,
+        "relationship_type": relationship_type,
+        "assigned_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        "is_active": True,
+        "grants_access": grants_access,
+    }
+
+
+async def link_doctor_patient(
+    session: AsyncSession,
+    doctor_id: uuid.UUID,
+    patient_id: uuid.UUID,
+    relationship_type: Optional[str] = "primary_care",
+    grants_access: bool = False,
+) -> Optional[uuid.UUID]:
+    """Create or reactivate the doctor-patient link in one statement.
+
+    Does not commit. Returns the link id when the link became active (new or
+    reactivated), or with ``grants_access`` started granting access, and
+    ``None`` when there was nothing to change. Only the patient's own
+    request may pass ``grants_access``.
+    """
+    statement = _link_statement(
+        session, [_link_row(doctor_id, patient_id, relationship_type, grants_access)], grants_access
+    ).returning(DoctorPatient.id)
+    result = await session.execute(statement)
+    link_id = result.scalar_one_or_none()
+    if link_id is not None:
+        consent_invalidations.publish_after_commit(session, doctor_id, patient_id)
+    return link_id
+
+
+async def link_doctor_patient_pairs(
+    session: AsyncSession, pairs: Iterable[Tuple[uuid.UUID, uuid.UUID]]
+) -> List[Tuple[uuid.UUID, uuid.UUID]]:
+    """Multi-row version of ``link_doctor_patient`` for (doctor_id, patient_id) pairs.
+
+    Returns the pairs whose link became active.
+    """
+    rows = [_link_row(doctor_id, patient_id) for doctor_id, patient_id in set(pairs)]
+    if not rows:
+        return []
+    statement = _link_statement(session, rows).returning(DoctorPatient.doctor_id, DoctorPatient.patient_id)
+    result = await session.execute(statement)
+    activated = [tuple(row) for row in result]
+    for doctor_id, patient_id in activated:
+        consent_invalidations.publish_after_commit(session, doctor_id, patient_id)
+    return activated
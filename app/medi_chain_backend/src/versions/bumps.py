@@ -0,0 +1,63 @@
+import uuid
+from typing import Set, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.validation import dialect_insert
+from .models import CollectionVersion
+
+CollectionKey = Tuple[str, uuid.UUID]
+
+# Doctor listings filtered by record access (see src.consents.access): they
+# change whenever the doctor's access to any patient changes.
+ACCESS_FILTERED = ("appointments", "prescriptions", "lab_reports")
+
+
+def patient_collection(resource: str, patient_id: uuid.UUID) -> CollectionKey:
+    return f"{resource}:patient", patient_id
+
+
+def doctor_collection(resource: str, doctor_id: uuid.UUID) -> CollectionKey:
+    return f"{resource}:doctor", doctor_id
+
+
+class VersionBumps:
+    """Collections changed by a service method, bumped in its transaction.
+
+    ``apply`` issues one upsert that increments every collected version
+    (``version = version + 1``); keys are sorted so concurrent writers lock
+    rows in the same order.
+    """
+
+    def __init__(self):
+        self.keys: Set[CollectionKey] = set()
+
+    def add_record(self, resource: str, record):
+        """A row with ``patient_id`` and ``doctor_id`` was created, changed or deleted."""
+        self.keys.add(patient_collection(resource, record.patient_id))
+        self.keys.add(doctor_collection(resource, record.doctor_id))
+
+    def add_access_change(self, doctor_id: uuid.UUID, patient_id: uuid.UUID):
+        """A consent or doctor-patient link of the pair changed."""
+        for resource in ACCESS_FILTERED:
+            self.keys.add(doctor_collection(resource, doctor_id))
+
+    def add_link(self, doctor_id: uuid.UUID, patient_id: uuid.UUID):
+        self.keys.add(patient_collection("doctor_patient", patient_id))
+        self.keys.add(doctor_collection("doctor_patient", doctor_id))
+        self.add_access_change(doctor_id, patient_id)
+
+    async def apply(self, session: AsyncSession):
+        if not self.keys:
+            return
+        rows = [
+            {"resource": resource, "owner_id": owner_id, "version": 1}
+            for resource, owner_id in sorted(self.keys, key=lambda key: (key[0], str(key[1])))
+        ]
+        statement = dialect_insert(session, CollectionVersion).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["resource", "owner_id"],
+            set_={"version": CollectionVersion.__table__.c.version + 1},
+        )
+        await session.execute(statement)
+        self.keys.clear()
@@ -0,0 +1,105 @@
+import hashlib
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import and_, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.main import async_session_maker
+from src.db.replicas import on_replica
+from .bumps import CollectionKey
+from .models import CollectionVersion
+
+ETAG_HEADER = "ETag"
+
+T = TypeVar("T")
+
+
+@dataclass
+class RecordVersion:
+    patient_id: uuid.UUID
+    doctor_id: uuid.UUID
+    version: int
+
+
+async def collection_versions(session: AsyncSession, keys: Sequence[CollectionKey]) -> List[int]:
+    """Current version of each key (0 if never bumped), read by primary key."""
+    statement = select(CollectionVersion.resource, CollectionVersion.owner_id, CollectionVersion.version).where(
+        or_(*[
+            and_(CollectionVersion.resource == resource, CollectionVersion.owner_id == owner_id)
+            for resource, owner_id in keys
+        ])
+    )
+    found = {(resource, owner_id): version for resource, owner_id, version in await session.execute(statement)}
+    return [found.get(key, 0) for key in keys]
+
+
+async def read_current(
+    session: AsyncSession, keys: Sequence[CollectionKey], read: Callable[[AsyncSession], Awaitable[T]]
+) -> Tuple[List[int], T]:
+    """``collection_versions`` of ``keys`` and ``read(session)``, never behind the primary.
+
+    On a replica the versions are compared with the primary's. A replica
+    that has not caught up with these collections is skipped and ``read``
+    runs on the primary, so a response cached from it is not older than the
+    invalidation that emptied the cache.
+    """
+    versions = await collection_versions(session, keys)
+    if on_replica(session):
+        async with async_session_maker() as primary:
+            current = await collection_versions(primary, keys)
+            if current != versions:
+                return current, await read(primary)
+    return versions, await read(session)
+
+
+async def record_version(session: AsyncSession, model, record_id: uuid.UUID, resource: str) -> Optional[RecordVersion]:
+    """A record's patient and doctor and the version of that patient's ``resource`` collection.
+
+    One query over two primary keys, without loading the record itself;
+    ``None`` if the record does not exist.
+    """
+    statement = (
+        select(model.patient_id, model.doctor_id, CollectionVersion.version)
+        .outerjoin(CollectionVersion, and_(
+            CollectionVersion.resource == f"{resource}:patient",
+            CollectionVersion.owner_id == model.patient_id,
+        ))
+        .where(model.id == record_id)
+    )
+    row = (await session.execute(statement)).one_or_none()
+    if row is None:
+        return None
+    return RecordVersion(patient_id=row.patient_id, doctor_id=row.doctor_id, version=row.version or 0)
+
+
+def make_etag(request: Request, versions: Iterable[int], *extra) -> str:
+    """Strong ETag for this path and query string at the given versions."""
+    query = sorted(request.query_params.multi_items())
+    raw = "|".join([request.url.path, repr(query), *map(str, versions), *map(str, extra)])
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison: W/"x" matches "x".
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def ensure_modified(request: Request, response: Response, etag: str):
+    """Put ``etag`` on the response, or answer 304 if the client already has it."""
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
+    response.headers[ETAG_HEADER] = etag
+
+
+async def check_collections(request: Request, response: Response, session: AsyncSession, *keys: CollectionKey, extra=()) -> str:
+    """``ensure_modified`` for a response built from the given collections."""
+    etag = make_etag(request, await collection_versions(session, keys), *extra)
+    ensure_modified(request, response, etag)
+    return etag
@@ -0,0 +1,19 @@
+from sqlmodel import SQLModel, Field
+import uuid
+
+
+class CollectionVersion(SQLModel, table=True):
+    """Change counter for one collection, e.g. ("appointments:patient", patient_id).
+
+    Bumped by the service layer in the same transaction as every write that
+    changes the collection; ETags are derived from it. No foreign keys, so
+    rows can outlive the patient or doctor they describe.
+    """
+    __tablename__ = "collection_versions"
+
+    resource: str = Field(primary_key=True, max_length=50)
+    owner_id: uuid.UUID = Field(primary_key=True)
+    version: int = Field(default=0)
+
+    def __repr__(self):
+        return f"<CollectionVersion: {self.resource} {self.owner_id} v{self.version}>"
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from sqlalchemy import event, func, select
+
+from src.appointments.schemas import AppointmentCreate
+from src.appointments.service import AppointmentService
+from src.audit_logs.models import AuditLog
+from src.audit_logs.sink import audit_sink
+from src.db.main import async_session_maker
+
+
+async def audit_count():
+    async with async_session_maker() as session:
+        return (await session.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+
+
+def book(seed, hour=9):
+    return AppointmentCreate(
+        patient_id=seed["patient_id"], doctor_id=seed["doctor_id"], appointment_date=datetime(2026, 3, 2, hour)
+    )
+
+
+def test_transactional_mode_writes_audit_with_business_commit(run, seed, monkeypatch):
+    monkeypatch.setattr(audit_sink, "mode", "transactional")
+
+    async def create():
+        async with async_session_maker() as session:
+            commits = []
+            event.listen(session.sync_session, "after_commit", lambda s: commits.append(1))
+            await AppointmentService().create_appointment(book(seed), session, actor_id=seed["doctor_id"])
+            return len(commits)
+
+    commits = run(create())
+    assert run(audit_count()) == 1
+    assert commits == 1
+
+
+def test_write_behind_flushes_batches_on_stop(run, seed, db, monkeypatch):
+    monkeypatch.setattr(audit_sink, "mode", "write_behind")
+    monkeypatch.setattr(audit_sink, "flush_interval", 60)
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO audit_logs"):
+            inserts.append(statement)
+
+    async def scenario():
+        audit_sink.start()
+        service = AppointmentService()
+        for hour in (9, 10, 11):
+            async with async_session_maker() as session:
+                await service.create_appointment(book(seed, hour), session, actor_id=seed["doctor_id"])
+        before_flush = await audit_count()
+        event.listen(db.sync_engine, "before_cursor_execute", count_inserts)
+        try:
+            await audit_sink.stop()
+        finally:
+            event.remove(db.sync_engine, "before_cursor_execute", count_inserts)
+        return before_flush, await audit_count()
+
+    before_flush, after_flush = run(scenario())
+    assert before_flush == 0
+    assert after_flush == 3
+    assert len(inserts) == 1
+
+
+def test_write_behind_drops_events_from_rolled_back_sessions(run, seed, monkeypatch):
+    monkeypatch.setattr(audit_sink, "mode", "write_behind")
+
+    async def scenario():
+        audit_sink.start()
+        async with async_session_maker() as session:
+            audit_sink.add(session, AuditLog(actor_id=seed["doctor_id"], action="X", target_type="t"))
+            await session.rollback()
+        await audit_sink.stop()
+        return await audit_count()
+
+    assert run(scenario()) == 0
+
+
+def test_audit_log_route_writes_before_answering(client, run, seed, monkeypatch):
+    monkeypatch.setattr(audit_sink, "mode", "write_behind")
+    monkeypatch.setattr(audit_sink, "flush_interval", 60)
+
+    async def scenario():
+        audit_sink.start()
+        try:
+            created = await client.post("/api/audit-logs/", headers=seed["doctor_headers"], json={
+                "actor_id": str(seed["doctor_id"]), "action": "VIEW_RECORD", "target_type": "patient",
+            })
+            fetched = await client.get(f"/api/audit-logs/{created.json()['id']}", headers=seed["doctor_headers"])
+        finally:
+            await audit_sink.stop()
+        return created, fetched
+
+    created, fetched = run(scenario())
+    assert created.status_code == 200 and created.json()["action"] == "VIEW_RECORD"
+    assert fetched.status_code == 200 and fetched.json()["id"] == created.json()["id"]
+    assert run(audit_count()) == 1
@@ -0,0 +1,188 @@
+"""Slot availability and double-booking checks: the in-memory index, backed by a unique index."""
+import uuid
+from datetime import datetime, time
+
+from src.appointments.models import Appointment
+from src.availability.index import SlotIndex, booked_slots
+from src.availability.models import DoctorSchedule
+from src.db.main import async_session_maker
+
+
+def test_slot_index_conflicts():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    index = SlotIndex(DoctorSchedule(doctor_id=uuid.uuid4(), slot_minutes=30), [(first, datetime(2026, 5, 4, 9))])
+
+    assert index.conflict(datetime(2026, 5, 4, 9, 15)) == first
+    assert index.conflict(datetime(2026, 5, 4, 8, 45)) == first
+    assert index.conflict(datetime(2026, 5, 4, 8, 30)) is None
+    assert index.conflict(datetime(2026, 5, 4, 9, 30)) is None
+
+    index.book(second, datetime(2026, 5, 4, 9, 30))
+    # Moving a booking ignores its own current slot.
+    index.book(second, datetime(2026, 5, 4, 9, 45))
+    assert index.conflict(datetime(2026, 5, 4, 9, 30)) in (first, second)
+    index.release(first)
+    assert index.conflict(datetime(2026, 5, 4, 9)) is None
+    assert len(index) == 1
+
+
+def test_double_booking_is_rejected(client, run, seed):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+
+    async def flow():
+        first = await client.post("/api/appointments/", json={**pair, "appointment_date": "2026-05-04T09:00:00"},
+                                  headers=seed["doctor_headers"])
+        clash = await client.post("/api/appointments/", json={**pair, "appointment_date": "2026-05-04T09:10:00"},
+                                  headers=seed["doctor_headers"])
+        later = await client.post("/api/appointments/", json={**pair, "appointment_date": "2026-05-04T09:30:00"},
+                                  headers=seed["doctor_headers"])
+        moved = await client.put(f"/api/appointments/{later.json()['id']}",
+                                 json={"appointment_date": "2026-05-04T09:00:00"}, headers=seed["doctor_headers"])
+        return first, clash, later, moved
+
+    first, clash, later, moved = run(flow())
+    assert first.status_code == 200 and later.status_code == 200
+    assert clash.status_code == 409
+    assert moved.status_code == 409
+
+
+def test_cancelled_appointment_frees_its_slot(client, run, seed):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    slot = {**pair, "appointment_date": "2026-05-04T09:00:00"}
+    headers = seed["doctor_headers"]
+
+    async def flow():
+        first = (await client.post("/api/appointments/", json=slot, headers=headers)).json()
+        cancelled = await client.put(f"/api/appointments/{first['id']}", json={"status": "cancelled"}, headers=headers)
+        rebooked = await client.post("/api/appointments/", json=slot, headers=headers)
+        booked_slots.clear()  # the table alone must not hold the cancelled slot either
+        uncancel = await client.put(f"/api/appointments/{first['id']}", json={"status": "scheduled"}, headers=headers)
+        bulk_cancel = await client.put("/api/appointments/bulk", headers=headers, json={
+            "items": [{"id": rebooked.json()["id"], "status": "cancelled"}], "mode": "best_effort",
+        })
+        return cancelled, rebooked, uncancel, await client.put(
+            f"/api/appointments/{first['id']}", json={"status": "scheduled"}, headers=headers
+        ), bulk_cancel
+
+    cancelled, rebooked, uncancel, retry, bulk_cancel = run(flow())
+    assert cancelled.status_code == 200 and rebooked.status_code == 200
+    assert uncancel.status_code == 409
+    assert [r["status"] for r in bulk_cancel.json()["results"]] == ["updated"]
+    assert retry.status_code == 200
+
+
+def test_bulk_create_reports_conflicts_per_item(client, run, seed):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    items = [{**pair, "appointment_date": f"2026-05-04T{hour}"} for hour in ("09:00:00", "09:00:00", "10:00:00")]
+
+    response = run(client.post("/api/appointments/bulk", json={"items": items, "mode": "best_effort"},
+                               headers=seed["doctor_headers"]))
+
+    assert [r["status"] for r in response.json()["results"]] == ["created", "error", "created"]
+
+
+def test_uncommitted_booking_is_released(run, seed):
+    async def flow():
+        async with async_session_maker() as session:
+            index = await booked_slots.get(session, seed["doctor_id"])
+            booked_slots.book(session, index, uuid.uuid4(), datetime(2026, 5, 4, 9))
+            held = index.conflict(datetime(2026, 5, 4, 9))
+            await session.rollback()
+        return held, index.conflict(datetime(2026, 5, 4, 9))
+
+    held, after_rollback = run(flow())
+    assert held is not None
+    assert after_rollback is None
+
+
+def test_availability_lists_free_slots_from_the_index(client, run, seed, db, count_round_trips):
+    doctor_id = seed["doctor_id"]
+    schedule = {"work_start": "09:00:00", "work_end": "11:00:00", "slot_minutes": 30, "working_days": [0, 1, 2, 3, 4]}
+
+    async def flow():
+        updated = await client.put(f"/api/doctors/{doctor_id}/availability", json=schedule,
+                                   headers=seed["doctor_headers"])
+        forbidden = await client.put(f"/api/doctors/{doctor_id}/availability", json=schedule,
+                                     headers=seed["patient_headers"])
+        await client.post("/api/appointments/", headers=seed["doctor_headers"], json={
+            "patient_id": str(seed["patient_id"]), "doctor_id": str(doctor_id), "appointment_date": "2026-05-04T09:30:00",
+        })
+        # Monday 4 May to Sunday 10 May: five working days of four slots.
+        params = {"from": "2026-05-04T00:00:00", "to": "2026-05-11T00:00:00"}
+        with count_round_trips(db) as (statements, _):
+            free = await client.get(f"/api/doctors/{doctor_id}/availability", params=params,
+                                    headers=seed["doctor_headers"])
+        return updated, forbidden, free, statements
+
+    updated, forbidden, free, statements = run(flow())
+    assert updated.status_code == 200 and updated.json()["slot_minutes"] == 30
+    assert forbidden.status_code == 403
+    assert free.status_code == 200
+    starts = [slot["start"] for slot in free.json()["slots"]]
+    assert len(starts) == 5 * 4 - 1
+    assert starts[:3] == ["2026-05-04T09:00:00", "2026-05-04T10:00:00", "2026-05-04T10:30:00"]
+    assert statements == []
+
+
+def test_availability_rejects_long_ranges(client, run, seed):
+    params = {"from": "2026-01-01T00:00:00", "to": "2026-03-01T00:00:00"}
+    response = run(client.get(f"/api/doctors/{seed['doctor_id']}/availability", params=params,
+                              headers=seed["doctor_headers"]))
+    assert response.status_code == 400
+
+
+def test_default_schedule():
+    schedule = DoctorSchedule(doctor_id=uuid.uuid4())
+    assert (schedule.work_start, schedule.work_end, schedule.slot_minutes) == (time(9), time(17), 30)
+    assert schedule.weekdays == {0, 1, 2, 3, 4}
+
+
+def test_bookings_must_fall_on_the_doctors_slots(client, run, seed):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+
+    def book(start):
+        return run(client.post("/api/appointments/", json={**pair, "appointment_date": start},
+                               headers=seed["doctor_headers"])).status_code
+
+    # Sunday, before and after working hours, and between two slots.
+    for start in ("2026-05-03T10:00:00", "2026-05-04T08:30:00", "2026-05-04T17:00:00", "2026-05-04T09:15:00"):
+        assert book(start) == 400, start
+    assert book("2026-05-04T16:30:00") == 200
+
+
+def test_the_database_rejects_a_slot_another_worker_booked(client, run, seed):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    slot = {**pair, "appointment_date": "2026-05-04T10:00:00"}
+    first = run(client.post("/api/appointments/", json={**pair, "appointment_date": "2026-05-04T09:00:00"},
+                            headers=seed["doctor_headers"]))
+    assert first.status_code == 200
+
+    async def book_elsewhere():
+        # Committed by another worker: this process's index has not seen it.
+        async with async_session_maker() as session:
+            session.add(Appointment(patient_id=seed["patient_id"], doctor_id=seed["doctor_id"],
+                                    appointment_date=datetime(2026, 5, 4, 10)))
+            await session.commit()
+
+    run(book_elsewhere())
+    clash = run(client.post("/api/appointments/", json=slot, headers=seed["doctor_headers"]))
+    assert clash.status_code == 409
+    # The stale index was dropped, so the next attempt is refused by the index.
+    loads = booked_slots.loads
+    assert run(client.post("/api/appointments/", json=slot, headers=seed["doctor_headers"])).status_code == 409
+    assert booked_slots.loads == loads + 1
+
+
+def test_slot_grid_is_fixed_while_appointments_are_upcoming(client, run, seed):
+    url = f"/api/doctors/{seed['doctor_id']}/availability"
+    schedule = {"work_start": "09:00:00", "work_end": "17:00:00", "slot_minutes": 30, "working_days": [0, 1, 2, 3, 4]}
+    run(client.post("/api/appointments/", headers=seed["doctor_headers"], json={
+        "patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"]), "appointment_date": "2030-01-01T09:00:00",
+    }))
+
+    def update(**changes):
+        return run(client.put(url, json={**schedule, **changes}, headers=seed["doctor_headers"])).status_code
+
+    assert update(slot_minutes=60) == 409
+    assert update(work_start="09:15:00") == 409
+    assert update(work_end="12:00:00", working_days=[0, 1]) == 200
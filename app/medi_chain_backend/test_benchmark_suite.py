@@ -0,0 +1,27 @@
+"""The micro-benchmark suite in benchmarks/suite.py: cases and baseline check."""
+from benchmarks.suite import compare, run_cases
+
+
+def test_cases_run_on_the_test_database(db, run):
+    result = run(run_cases([10], scale=0.01))
+
+    assert result["dialect"] == db.dialect.name
+    names = set(result["cases"])
+    assert {"auth.create_access_token", "auth.decode_token", "auth.verify_password"} <= names
+    assert {f"create.{kind}" for kind in ("appointment", "audit_log", "consent", "doctor_patient", "lab_report", "prescription")} <= names
+    assert {"list.prescriptions_by_patient[10]", "serialize.appointments[10]"} <= names
+
+    only = run(run_cases([10], only="list.audit_logs", scale=0.01))
+    assert list(only["cases"]) == ["list.audit_logs_by_actor[10]"]
+
+
+def test_compare_flags_regressions_over_the_threshold():
+    baseline = {"sqlite": {"slow": {"p50_ms": 10.0}, "steady": {"p50_ms": 10.0}, "tiny": {"p50_ms": 0.01}}}
+    results = {"sqlite": {"cases": {
+        "slow": {"p50_ms": 16.0}, "steady": {"p50_ms": 14.0}, "tiny": {"p50_ms": 0.03}, "new": {"p50_ms": 1.0},
+    }}, "postgres": {"skipped": "no initdb"}}
+
+    comparison = compare(results, baseline, threshold=50.0)
+    assert [regression["case"] for regression in comparison["regressions"]] == ["sqlite:slow"]
+    assert comparison["regressions"][0]["change_percent"] == 60.0
+    assert comparison["missing_from_baseline"] == ["sqlite:new"]
@@ -0,0 +1,136 @@
+"""Bulk create/update/delete endpoints for appointments and prescriptions."""
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from src.appointments.models import Appointment
+from src.audit_logs.models import AuditLog
+from src.audit_logs.sink import audit_sink
+from src.db.main import async_session_maker
+from src.prescriptions.models import Prescription
+from src.prescriptions.schemas import PrescriptionBulkUpdate
+from src.prescriptions.service import PrescriptionService
+
+
+@pytest.fixture(autouse=True)
+def transactional_audit(monkeypatch):
+    monkeypatch.setattr(audit_sink, "mode", "transactional")
+
+
+def count(run, model):
+    async def query():
+        async with async_session_maker() as session:
+            return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+    return run(query())
+
+
+def appointment(seed, day=1, **overrides):
+    item = {
+        "patient_id": str(seed["patient_id"]),
+        "doctor_id": str(seed["doctor_id"]),
+        "appointment_date": f"2026-05-{day:02d}T10:00:00",
+    }
+    item.update(overrides)
+    return item
+
+
+def test_bulk_create_uses_batched_statements(client, run, seed, db, count_round_trips):
+    # The weekdays of 1-28 May.
+    items = [appointment(seed, day) for day in range(1, 29) if date(2026, 5, day).weekday() < 5]
+
+    with count_round_trips(db) as (statements, commits):
+        response = run(client.post("/api/appointments/bulk", json={"items": items}, headers=seed["doctor_headers"]))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["succeeded"] == 20 and body["failed"] == 0
+    assert [r["index"] for r in body["results"]] == list(range(20))
+    assert all(r["status"] == "created" and r["id"] for r in body["results"])
+    # One reference query plus the slot index load (schedules, bookings),
+    # and the inserts (collection versions included) do not grow with the
+    # batch size.
+    assert statements.count("SELECT") == 3
+    assert statements.count("INSERT") <= 6
+    assert len(commits) == 1
+    assert count(run, Appointment) == 20
+    assert count(run, AuditLog) == 20
+
+
+def test_atomic_mode_writes_nothing_on_failure(client, run, seed):
+    items = [appointment(seed), appointment(seed, patient_id=str(uuid.uuid4()))]
+
+    response = run(client.post("/api/appointments/bulk", json={"items": items}, headers=seed["doctor_headers"]))
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["failed"] == 1
+    assert detail["results"] == [{"index": 1, "id": None, "status": "error", "error": "Patient not found"}]
+    assert count(run, Appointment) == 0
+
+
+def test_best_effort_mode_applies_valid_items(client, run, seed):
+    body = {
+        "mode": "best_effort",
+        "items": [
+            {"patient_id": str(seed["patient_id"]), "doctor_id": str(uuid.uuid4()), "medication": "[]", "dosage": "1"},
+            {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"]), "medication": "[]", "dosage": "2"},
+        ],
+    }
+
+    response = run(client.post("/api/prescriptions/bulk", json=body, headers=seed["doctor_headers"]))
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["status"] == "error" and results[0]["error"] == "Doctor not found"
+    assert results[1]["status"] == "created"
+    assert count(run, Prescription) == 1
+
+
+def test_bulk_update_and_delete(client, run, seed):
+    async def flow():
+        created = await client.post(
+            "/api/prescriptions/bulk",
+            json={"items": [
+                {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"]), "medication": "[]", "dosage": "1"}
+                for _ in range(3)
+            ]},
+            headers=seed["doctor_headers"],
+        )
+        ids = [r["id"] for r in created.json()["results"]]
+        missing = str(uuid.uuid4())
+        updated = await client.put(
+            "/api/prescriptions/bulk",
+            json={"mode": "best_effort", "items": [{"id": ids[0], "dosage": "3"}, {"id": missing, "dosage": "3"}]},
+            headers=seed["doctor_headers"],
+        )
+        fetched = await client.get(f"/api/prescriptions/{ids[0]}", headers=seed["patient_headers"])
+        deleted = await client.post(
+            "/api/prescriptions/bulk-delete", json={"ids": ids[:2]}, headers=seed["doctor_headers"]
+        )
+        return updated, fetched, deleted
+
+    updated, fetched, deleted = run(flow())
+    assert [r["status"] for r in updated.json()["results"]] == ["updated", "error"]
+    assert fetched.json()["dosage"] == "3" and fetched.json()["medication"] == "[]"
+    assert deleted.status_code == 200 and deleted.json()["succeeded"] == 2
+    assert count(run, Prescription) == 1
+
+
+def test_atomic_update_rolls_back_items_it_already_changed(run, seed):
+    async def flow():
+        async with async_session_maker() as session:
+            prescription = Prescription(patient_id=seed["patient_id"], doctor_id=seed["doctor_id"], medication="[]", dosage="1")
+            session.add(prescription)
+            await session.commit()
+            bulk = PrescriptionBulkUpdate(items=[{"id": prescription.id, "dosage": "2"}, {"id": uuid.uuid4(), "dosage": "2"}])
+            with pytest.raises(HTTPException) as raised:
+                await PrescriptionService().bulk_update_prescriptions(bulk, session)
+            # The same session must not still hold, or flush, the first item's change.
+            fetched = (await session.execute(select(Prescription.dosage))).scalar_one()
+            return raised.value.status_code, fetched
+
+    assert run(flow()) == (422, "1")
@@ -0,0 +1,90 @@
+"""Consent decision cache: hits, invalidation and cross-worker messages."""
+import time
+import uuid
+
+from src.consents.cache import ConsentDecisionCache, ConsentInvalidationBus, MISSING, consent_decisions
+from src.consents.service import ConsentService
+from src.db.main import async_session_maker
+
+
+def test_status_changes_are_visible_immediately(client, run, seed, db, count_round_trips):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    doctor_id, patient_id = seed["doctor_id"], seed["patient_id"]
+
+    async def status():
+        async with async_session_maker() as session:
+            return await ConsentService().get_access_status(doctor_id, patient_id, session)
+
+    assert run(status()) is None
+    consent = run(client.post("/api/consents/", json=pair, headers=seed["doctor_headers"])).json()
+    assert run(status()) == "pending"
+
+    with count_round_trips(db) as (statements, _):
+        assert run(status()) == "pending"
+    assert statements == []
+
+    run(client.put(f"/api/consents/{consent['id']}", json={"access_status": "revoked"}, headers=seed["patient_headers"]))
+    assert run(status()) == "revoked"
+    run(client.delete(f"/api/consents/{consent['id']}", headers=seed["patient_headers"]))
+    assert run(status()) is None
+
+
+def test_value_loaded_across_an_invalidation_is_not_cached():
+    cache = ConsentDecisionCache(ttl=60, max_entries=10)
+    doctor_id, patient_id = uuid.uuid4(), uuid.uuid4()
+
+    token = cache.token()
+    cache.invalidate(doctor_id, patient_id)  # e.g. a revocation committed mid-read
+    cache.put(doctor_id, patient_id, "granted", token)
+    assert cache.get(doctor_id, patient_id) is MISSING
+
+    cache.put(doctor_id, patient_id, "revoked", cache.token())
+    assert cache.get(doctor_id, patient_id) == "revoked"
+
+
+def test_entries_expire_and_are_bounded():
+    cache = ConsentDecisionCache(ttl=0.05, max_entries=2)
+    ids = [(uuid.uuid4(), uuid.uuid4()) for _ in range(3)]
+    for doctor_id, patient_id in ids:
+        cache.put(doctor_id, patient_id, "granted", cache.token())
+    assert cache.get(*ids[0]) is MISSING
+    assert cache.get(*ids[2]) == "granted"
+    time.sleep(0.06)
+    assert cache.get(*ids[2]) is MISSING
+
+
+def test_messages_from_other_workers_invalidate():
+    cache = ConsentDecisionCache(ttl=60, max_entries=10)
+    bus = ConsentInvalidationBus(cache, redis_url=None, channel="test")
+    doctor_id, patient_id = uuid.uuid4(), uuid.uuid4()
+
+    cache.put(doctor_id, patient_id, "granted", cache.token())
+    bus.handle_message(f"{bus.origin}:{doctor_id}:{patient_id}".encode())
+    assert cache.get(doctor_id, patient_id) == "granted"
+
+    bus.handle_message(f"{uuid.uuid4().hex}:{doctor_id}:{patient_id}".encode())
+    assert cache.get(doctor_id, patient_id) is MISSING
+    assert bus.stats()["received"] == 1
+
+
+def test_local_fallback_without_redis(run):
+    cache = ConsentDecisionCache(ttl=60, max_entries=10)
+    bus = ConsentInvalidationBus(cache, redis_url=None, channel="test")
+    doctor_id, patient_id = uuid.uuid4(), uuid.uuid4()
+    cache.put(doctor_id, patient_id, "granted", cache.token())
+
+    run(bus.start())
+    run(bus.publish(doctor_id, patient_id))
+    run(bus.stop())
+
+    assert bus.backend == "local"
+    assert cache.get(doctor_id, patient_id) is MISSING
+
+
+def test_cached_lookup_is_sub_millisecond():
+    doctor_id, patient_id = uuid.uuid4(), uuid.uuid4()
+    consent_decisions.put(doctor_id, patient_id, "granted", consent_decisions.token())
+    start = time.perf_counter()
+    for _ in range(10000):
+        consent_decisions.get(doctor_id, patient_id)
+    assert (time.perf_counter() - start) / 10000 < 0.001
@@ -0,0 +1,112 @@
+"""Doctor dashboard counters stay equal to a full recount."""
+import uuid
+
+from src.dashboard.rebuild import rebuild_counters
+from src.db.main import async_session_maker
+
+
+def dashboard(client, run, seed, day="2026-05-01"):
+    response = run(client.get(
+        f"/api/doctors/{seed['doctor_id']}/dashboard", params={"day": day}, headers=seed["doctor_headers"]
+    ))
+    assert response.status_code == 200
+    body = response.json()
+    return {key: value for key, value in body.items() if key != "recent_prescriptions"}, body["recent_prescriptions"]
+
+
+def rebuild(run):
+    async def recount():
+        async with async_session_maker() as session:
+            await rebuild_counters(session)
+
+    run(recount())
+
+
+def test_counters_follow_mutations_and_match_rebuild(client, run, seed):
+    headers = seed["doctor_headers"]
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+
+    async def mutate():
+        appointments = [
+            (await client.post("/api/appointments/", json={**pair, "appointment_date": f"2026-05-0{day}T{hour:02d}:00:00"},
+                               headers=headers)).json()["id"]
+            for day, hour in ((1, 9), (1, 10), (4, 9))
+        ]
+        await client.put(f"/api/appointments/{appointments[2]}", json={"appointment_date": "2026-05-01T15:00:00"},
+                         headers=headers)
+        await client.delete(f"/api/appointments/{appointments[0]}", headers=headers)
+
+        prescriptions = await client.post(
+            "/api/prescriptions/bulk",
+            json={"items": [{**pair, "medication": f"m{i}", "dosage": "1"} for i in range(7)]},
+            headers=headers,
+        )
+        ids = [r["id"] for r in prescriptions.json()["results"]]
+        await client.post("/api/prescriptions/bulk-delete", json={"ids": ids[:1]}, headers=headers)
+
+        consent = (await client.post("/api/consents/", json=pair, headers=headers)).json()["id"]
+        return consent
+
+    consent_id = run(mutate())
+
+    counters, recent = dashboard(client, run, seed)
+    assert counters == {
+        "doctor_id": str(seed["doctor_id"]),
+        "day": "2026-05-01",
+        "active_patients": 1,
+        "pending_consents": 1,
+        "prescriptions": 6,
+        "appointments_today": 2,
+    }
+    # Bounded payload: only the latest few prescriptions.
+    assert len(recent) == 5
+
+    run(client.put(f"/api/consents/{consent_id}", json={"access_status": "granted"}, headers=seed["patient_headers"]))
+    assert dashboard(client, run, seed)[0]["pending_consents"] == 0
+
+    before = dashboard(client, run, seed)[0]
+    rebuild(run)
+    assert dashboard(client, run, seed)[0] == before
+
+
+def test_link_deactivation_and_rebuild_from_scratch(client, run, seed):
+    headers = seed["doctor_headers"]
+    body = {"doctor_id": str(seed["doctor_id"]), "patient_id": str(seed["patient_id"])}
+    link = run(client.post("/api/doctor-patient/", json=body, headers=seed["patient_headers"])).json()
+    assert dashboard(client, run, seed)[0]["active_patients"] == 1
+
+    run(client.put(f"/api/doctor-patient/{link['id']}", json={"is_active": False}, headers=headers))
+    assert dashboard(client, run, seed)[0]["active_patients"] == 0
+
+    run(client.put(f"/api/doctor-patient/{link['id']}", json={"is_active": True}, headers=seed["patient_headers"]))
+    rebuild(run)
+    assert dashboard(client, run, seed)[0]["active_patients"] == 1
+
+
+def test_unknown_doctor_is_404(client, run, seed):
+    response = run(client.get(f"/api/doctors/{uuid.uuid4()}/dashboard", headers=seed["doctor_headers"]))
+    assert response.status_code == 404
+
+
+def test_cancelled_appointments_do_not_count(client, run, seed):
+    headers = seed["doctor_headers"]
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+
+    async def create(hour):
+        response = await client.post("/api/appointments/", json={**pair, "appointment_date": f"2026-05-01T{hour:02d}:00:00"},
+                                     headers=headers)
+        return response.json()["id"]
+
+    first, second = run(create(9)), run(create(10))
+    run(client.put(f"/api/appointments/{first}", json={"status": "cancelled"}, headers=headers))
+    assert dashboard(client, run, seed)[0]["appointments_today"] == 1
+    rebuild(run)
+    assert dashboard(client, run, seed)[0]["appointments_today"] == 1
+
+    run(client.put(f"/api/appointments/{first}", json={"status": "scheduled"}, headers=headers))
+    assert dashboard(client, run, seed)[0]["appointments_today"] == 2
+
+    run(client.put("/api/appointments/bulk", json={"items": [{"id": second, "status": "cancelled"}]}, headers=headers))
+    assert dashboard(client, run, seed)[0]["appointments_today"] == 1
+    run(client.delete(f"/api/appointments/{second}", headers=headers))
+    assert dashboard(client, run, seed)[0]["appointments_today"] == 1
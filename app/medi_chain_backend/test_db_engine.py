@@ -0,0 +1,88 @@
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+
+from src.config import Settings
+from src.db.main import (
+    TimedQueuePool,
+    _statement_timeout_args,
+    async_session_maker,
+    build_engine,
+    engine_pool_stats,
+    get_pool_stats,
+    get_session,
+    pool_stats,
+    replica_router,
+)
+from src.db.replicas import Replica
+
+
+def test_engine_factory_applies_pool_settings(tmp_path):
+    settings = Settings(
+        DATABASE_URL=f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        DB_POOL_SIZE=3,
+        DB_MAX_OVERFLOW=2,
+        DB_ECHO=False,
+    )
+    engine = build_engine(settings)
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, TimedQueuePool)
+    assert pool.size() == 3
+    assert engine.echo is False
+
+
+def test_in_memory_sqlite_uses_static_pool():
+    engine = build_engine(Settings(DATABASE_URL="sqlite+aiosqlite://"))
+    assert isinstance(engine.sync_engine.pool, StaticPool)
+
+
+def test_statement_timeout_only_applies_to_postgres():
+    asyncpg_args = _statement_timeout_args(make_url("postgresql+asyncpg://u:p@localhost/db"), 1500)
+    assert asyncpg_args == {"server_settings": {"statement_timeout": "1500"}}
+    assert _statement_timeout_args(make_url("sqlite+aiosqlite:///x.db"), 1500) == {}
+
+
+def test_sessions_share_factory_and_record_checkouts(db, run):
+    pool_stats.reset()
+
+    async def use_session():
+        sessions = []
+        for _ in range(2):
+            async for session in get_session():
+                await session.execute(text("SELECT 1"))
+                sessions.append(session)
+        return sessions
+
+    first, second = run(use_session())
+    assert first is not second
+    assert first.bind is second.bind is async_session_maker.kw["bind"]
+
+    stats = get_pool_stats()["primary"]
+    assert stats["checkouts"] >= 2
+    assert stats["checked_out"] == 0
+    assert stats["wait_time_max_ms"] >= 0
+
+
+def test_overflow_is_counted_per_engine_when_a_checkout_opens_it(db, run, tmp_path, monkeypatch):
+    settings = Settings(DATABASE_URL=f"sqlite+aiosqlite:///{tmp_path}/overflow.db", DB_POOL_SIZE=1, DB_MAX_OVERFLOW=2)
+    engine = build_engine(settings)
+    monkeypatch.setattr(replica_router, "replicas", [Replica(settings.DATABASE_URL, engine)])
+    primary_checkouts = pool_stats.checkouts
+
+    async def check_out():
+        async with engine.connect(), engine.connect():
+            async with engine.connect():
+                pass
+            # Reuses the connection just returned: not a new overflow.
+            async with engine.connect():
+                pass
+
+    run(check_out())
+    stats = engine_pool_stats(engine)
+    assert (stats.checkouts, stats.overflow_checkouts) == (4, 2)
+    assert pool_stats.checkouts == primary_checkouts
+
+    replicas = get_pool_stats()["replicas"]
+    assert [replica["name"] for replica in replicas] == [settings.DATABASE_URL]
+    assert replicas[0]["overflow_checkouts"] == 2
+    run(engine.dispose())
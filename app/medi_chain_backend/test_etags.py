@@ -0,0 +1,96 @@
+"""ETags from collection versions: 304s, what changes them, what they cost."""
+import uuid
+
+from src.response_cache import CACHE_STATUS_HEADER
+from src.utils import create_access_token
+
+
+def prescribe(client, run, seed, dosage="1"):
+    body = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"]), "medication": "m", "dosage": dosage}
+    response = run(client.post("/api/prescriptions/", json=body, headers=seed["doctor_headers"]))
+    assert response.status_code == 200
+    return response.json()
+
+
+def revalidate(client, run, url, headers, etag):
+    return run(client.get(url, headers={**headers, "If-None-Match": etag}))
+
+
+def test_matching_list_is_not_reloaded(client, run, seed, db, count_round_trips):
+    prescribe(client, run, seed)
+    url = f"/api/prescriptions/patient/{seed['patient_id']}"
+    first = run(client.get(url, headers=seed["patient_headers"]))
+    etag = first.headers["ETag"]
+
+    with count_round_trips(db) as (statements, _):
+        again = revalidate(client, run, url, seed["patient_headers"], etag)
+
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == etag
+    # Only the version lookup: the rows are neither loaded nor serialized.
+    assert statements == ["SELECT"]
+    assert revalidate(client, run, url, seed["patient_headers"], f"W/{etag}").status_code == 304
+
+
+def test_writes_change_the_etag(client, run, seed):
+    prescribe(client, run, seed)
+    url = f"/api/prescriptions/patient/{seed['patient_id']}"
+    etag = run(client.get(url, headers=seed["patient_headers"])).headers["ETag"]
+
+    prescribe(client, run, seed, dosage="2")
+    changed = revalidate(client, run, url, seed["patient_headers"], etag)
+
+    assert changed.status_code == 200 and len(changed.json()) == 2
+    assert changed.headers["ETag"] != etag
+    # The query string is part of the tag.
+    paged = run(client.get(url, params={"limit": 1}, headers=seed["patient_headers"]))
+    assert paged.headers["ETag"] != changed.headers["ETag"]
+
+
+def test_single_records(client, run, seed, grant_access):
+    prescription = prescribe(client, run, seed)
+    grant_access()
+    url = f"/api/prescriptions/{prescription['id']}"
+    etag = run(client.get(url, headers=seed["doctor_headers"])).headers["ETag"]
+
+    assert revalidate(client, run, url, seed["doctor_headers"], etag).status_code == 304
+    run(client.put(url, json={"dosage": "3"}, headers=seed["doctor_headers"]))
+    updated = revalidate(client, run, url, seed["doctor_headers"], etag)
+    assert updated.status_code == 200 and updated.json()["dosage"] == "3"
+
+    # Access is checked before the tag is compared.
+    token = create_access_token({"email": "user@example.com", "id": str(uuid.uuid4())})
+    stranger = {"Authorization": f"Bearer {token}"}
+    assert revalidate(client, run, url, stranger, updated.headers["ETag"]).status_code == 403
+    assert run(client.get(f"/api/prescriptions/{uuid.uuid4()}", headers=seed["doctor_headers"])).status_code == 404
+
+
+def test_cached_listing_answers_304_without_queries(client, run, seed, db, count_round_trips, shared_response_cache):
+    prescribe(client, run, seed)
+    url = f"/api/appointments/doctor/{seed['doctor_id']}"
+    etag = run(client.get(url, headers=seed["doctor_headers"])).headers["ETag"]
+
+    with count_round_trips(db) as (statements, _):
+        again = revalidate(client, run, url, seed["doctor_headers"], etag)
+    assert again.status_code == 304
+    assert again.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert statements == []
+
+    # Consent changes can change what the doctor's filtered listing shows.
+    consent = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    run(client.post("/api/consents/", json=consent, headers=seed["patient_headers"]))
+    assert revalidate(client, run, url, seed["doctor_headers"], etag).status_code == 200
+
+
+def test_dashboard_and_timeline(client, run, seed):
+    dashboard = f"/api/doctors/{seed['doctor_id']}/dashboard"
+    timeline = f"/api/patients/{seed['patient_id']}/timeline"
+    tags = [run(client.get(url, headers=headers)).headers["ETag"] for url, headers in (
+        (dashboard, seed["doctor_headers"]), (timeline, seed["patient_headers"]),
+    )]
+    assert revalidate(client, run, dashboard, seed["doctor_headers"], tags[0]).status_code == 304
+    assert revalidate(client, run, timeline, seed["patient_headers"], tags[1]).status_code == 304
+
+    prescribe(client, run, seed)
+    assert revalidate(client, run, dashboard, seed["doctor_headers"], tags[0]).status_code == 200
+    assert revalidate(client, run, timeline, seed["patient_headers"], tags[1]).status_code == 200
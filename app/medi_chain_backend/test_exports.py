@@ -0,0 +1,95 @@
+"""Streaming NDJSON/CSV exports of audit logs and patient histories."""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from src.audit_logs.models import AuditLog
+from src.audit_logs.service import AuditLogService
+from src.db.main import async_session_maker
+from src.exports import stream_rows
+from src.utils import create_access_token
+
+BASE = datetime(2026, 3, 1)
+
+
+def insert_audit_logs(run, actor_id, count=5):
+    async def insert():
+        async with async_session_maker() as session:
+            session.add_all([
+                AuditLog(actor_id=actor_id, action="CREATE_APPOINTMENT" if i % 2 else "DELETE_APPOINTMENT",
+                         target_type="appointment", timestamp=BASE + timedelta(days=i))
+                for i in range(count)
+            ])
+            session.add(AuditLog(actor_id=uuid.uuid4(), action="CREATE_APPOINTMENT", target_type="appointment", timestamp=BASE))
+            await session.commit()
+
+    run(insert())
+
+
+def test_audit_log_export_filters(client, run, seed):
+    insert_audit_logs(run, seed["doctor_id"])
+    params = {"actor_id": str(seed["doctor_id"]), "action": "CREATE_APPOINTMENT", "from": "2026-03-01T00:00:00"}
+    response = run(client.get("/api/audit-logs/export", params=params, headers=seed["doctor_headers"]))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="audit-logs.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["timestamp"] for row in rows] == ["2026-03-02T00:00:00", "2026-03-04T00:00:00"]
+    assert {row["actor_id"] for row in rows} == {str(seed["doctor_id"])}
+
+    to = run(client.get("/api/audit-logs/export", params={**params, "to": "2026-03-03T00:00:00"}, headers=seed["doctor_headers"]))
+    assert len(to.text.splitlines()) == 1
+
+
+def test_csv_export(client, run, seed):
+    insert_audit_logs(run, seed["doctor_id"], count=2)
+    response = run(client.get("/api/audit-logs/export", params={"format": "csv"}, headers=seed["doctor_headers"]))
+
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "timestamp", "actor_id", "action", "target_type", "target_id", "ip_address"]
+    # Only the caller's own rows, not the other actor's.
+    assert len(rows) == 3
+    assert rows[1][1] == "2026-03-01T00:00:00" and rows[1][5] == ""
+
+
+def test_audit_log_export_is_limited_to_the_caller(client, run, seed):
+    insert_audit_logs(run, seed["doctor_id"], count=2)
+    url = "/api/audit-logs/export"
+
+    others = run(client.get(url, params={"actor_id": str(seed["doctor_id"])}, headers=seed["patient_headers"]))
+    assert others.status_code == 403
+    own = run(client.get(url, headers=seed["patient_headers"]))
+    assert own.status_code == 200 and own.text == ""
+
+
+def test_rows_are_encoded_chunk_by_chunk(run, seed):
+    insert_audit_logs(run, seed["doctor_id"], count=5)
+
+    async def collect():
+        statement = AuditLogService().export_statement(actor_id=seed["doctor_id"])
+        return [chunk async for chunk in stream_rows(statement, "ndjson", chunk_rows=2)]
+
+    chunks = run(collect())
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+
+def test_patient_history_export(client, run, seed, grant_access):
+    body = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"]), "medication": "m", "dosage": "1"}
+    run(client.post("/api/prescriptions/", json=body, headers=seed["doctor_headers"]))
+    url = f"/api/patients/{seed['patient_id']}/export"
+
+    response = run(client.get(url, headers=seed["patient_headers"]))
+    types = [json.loads(line)["type"] for line in response.text.splitlines()]
+    assert sorted(types) == ["doctor_patient", "prescription"]
+    assert response.headers["content-disposition"].endswith(f'patient-{seed["patient_id"]}-history.ndjson"')
+
+    grant_access()
+    only = run(client.get(url, params={"type": "prescription", "format": "csv"}, headers=seed["doctor_headers"]))
+    assert [row[0] for row in csv.reader(io.StringIO(only.text))] == ["type", "prescription"]
+
+    token = create_access_token({"email": "user@example.com", "id": str(uuid.uuid4())})
+    assert run(client.get(url, headers={"Authorization": f"Bearer {token}"})).status_code == 403
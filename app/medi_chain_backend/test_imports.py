@@ -0,0 +1,120 @@
+"""Bulk patient/doctor imports: batching, de-duplication and resuming."""
+import json
+
+import pytest
+from sqlmodel import select
+
+from src.db.main import async_session_maker
+from src.imports.models import ImportJob
+from src.imports.service import AccountImporter
+from src.patients.models import Patient
+from src.utils import verify_password
+
+
+@pytest.fixture
+def importer():
+    importer = AccountImporter(batch_size=2, hash_workers=2)
+    yield importer
+    importer.shutdown()
+
+
+def patient(n, **fields):
+    return {"full_name": f"Patient {n}", "email": f"p{n}@example.com", "password": f"secret-{n}", **fields}
+
+
+def write_ndjson(path, records):
+    path.write_text("".join((record if isinstance(record, str) else json.dumps(record)) + "\n" for record in records))
+    return str(path)
+
+
+def start(run, importer, kind, source, format):
+    async def create():
+        async with async_session_maker() as session:
+            return (await importer.create_job(session, kind, source, format)).id
+
+    return run(create())
+
+
+def emails(run):
+    async def load():
+        async with async_session_maker() as session:
+            return {p.email: p for p in (await session.execute(select(Patient))).scalars()}
+
+    return run(load())
+
+
+def test_import_counts_duplicates_and_invalid_records(run, seed, importer, tmp_path):
+    source = write_ndjson(tmp_path / "patients.ndjson", [
+        patient(1, date_of_birth="1990-02-03"),
+        patient(2),
+        patient(1),  # repeated in the file
+        {"full_name": "Pat Ient", "email": "patient@example.com", "password": "already-here"},
+        {"full_name": "No Email", "password": "secret-x"},
+        "{not json",
+        patient(3),
+    ])
+    job = run(importer.run(start(run, importer, "patients", source, "ndjson")))
+
+    assert (job.status, job.processed, job.created, job.skipped, job.failed) == ("completed", 7, 3, 2, 2)
+    assert job.errors.splitlines()[0].startswith("record 5: email:")
+    assert job.errors.splitlines()[1].startswith("record 6: invalid JSON")
+    accounts = emails(run)
+    assert {"p1@example.com", "p2@example.com", "p3@example.com"} <= set(accounts)
+    assert verify_password("secret-1", accounts["p1@example.com"].password_hash)
+    assert accounts["p1@example.com"].date_of_birth.year == 1990
+    assert accounts["patient@example.com"].password_hash == "x"
+
+
+def test_csv_doctor_import_commits_once_per_batch(run, db, importer, tmp_path, count_round_trips):
+    source = tmp_path / "doctors.csv"
+    source.write_text("full_name,email,password,specialization,hospital_name,phone\n" + "".join(
+        f"Doc {n},d{n}@example.com,secret-{n},Cardiology,General,\n" for n in range(5)
+    ))
+    job_id = start(run, importer, "doctors", str(source), "csv")
+    with count_round_trips(db) as (statements, commits):
+        job = run(importer.run(job_id))
+
+    assert (job.status, job.created) == ("completed", 5)
+    # the status change, three batches of two, two and one, and completion
+    assert len(commits) == 5
+    assert statements.count("INSERT") == 3
+
+
+def test_resume_after_crash(run, seed, importer, tmp_path, monkeypatch):
+    source = write_ndjson(tmp_path / "patients.ndjson", [patient(n) for n in range(5)])
+    job_id = start(run, importer, "patients", source, "ndjson")
+
+    original = AccountImporter._hash
+    calls = []
+
+    async def crash_on_second_batch(self, passwords):
+        calls.append(passwords)
+        if len(calls) == 2:
+            raise RuntimeError("worker died")
+        return await original(self, passwords)
+
+    monkeypatch.setattr(AccountImporter, "_hash", crash_on_second_batch)
+    job = run(importer.run(job_id))
+    assert (job.status, job.processed, job.created) == ("failed", 2, 2)
+    assert job.errors == "stopped: worker died"
+
+    job = run(importer.run(job_id))
+    assert (job.status, job.processed, job.created, job.skipped) == ("completed", 5, 5, 0)
+    assert len(emails(run)) == 6  # plus the seeded patient
+
+
+def test_import_endpoint(client, run, seed, tmp_path, monkeypatch):
+    from src.config import config
+    monkeypatch.setattr(config, "IMPORT_DIR", str(tmp_path))
+    body = "".join(json.dumps(patient(n)) + "\n" for n in range(3)).encode()
+    response = run(client.post(
+        "/api/imports/patients", files={"file": ("patients.ndjson", body)}, headers=seed["doctor_headers"]
+    ))
+
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    job = run(client.get(f"/api/imports/{job_id}", headers=seed["doctor_headers"])).json()
+    assert (job["status"], job["created"]) == ("completed", 3)
+    # the uploaded copy is removed once imported
+    assert list(tmp_path.iterdir()) == []
+    assert run(client.post(f"/api/imports/{job_id}/resume", headers=seed["doctor_headers"])).status_code == 409
@@ -0,0 +1,30 @@
+"""The load test harness in benchmarks/load.py, at a tiny scale."""
+import random
+
+from benchmarks.load import DEFAULT_MIX, Dataset, parse_mix, run_load, seed
+
+
+def test_seed_is_reproducible(db, run):
+    run(seed(patients=20, doctors=4, links=2, rng=random.Random(3)))
+    first = run(Dataset.load())
+    run(seed(patients=20, doctors=4, links=2, rng=random.Random(3)))
+    second = run(Dataset.load())
+
+    assert len(first.patients) == 20 and len(first.doctors) == 4 and len(first.consents) == 40
+    assert first.patients == second.patients and first.doctors == second.doctors
+    assert sum(len(patients) for patients in first.patients_of.values()) == 40
+
+
+def test_every_scenario_runs_without_errors(client, run):
+    run(seed(patients=20, doctors=4, links=2, rng=random.Random(3)))
+    dataset = run(Dataset.load())
+    mix = dict.fromkeys(DEFAULT_MIX, 1.0)
+    result = run(run_load(client, dataset, users=4, duration=1.5, mix=mix, seed=1))
+
+    assert set(result["scenarios"]) == set(DEFAULT_MIX)
+    assert {
+        "GET /api/doctors/{doctor_id}/dashboard", "POST /api/appointments/",
+        "POST /api/prescriptions/", "PUT /api/consents/{consent_id}",
+    } <= set(result["routes"])
+    assert result["total"]["requests"] > 0 and result["total"]["error_rate"] == 0
+    assert parse_mix("login=3,consent") == {"login": 3.0, "consent": 1.0}
@@ -0,0 +1,77 @@
+"""The queued JSON-lines logging pipeline."""
+import io
+import json
+import logging
+
+from src.logs import LogPipeline
+from src.patients.schemas import PatientRegister
+
+logger = logging.getLogger("medichain.test")
+
+
+def collect(pipeline, emit):
+    stream = io.StringIO()
+    pipeline.start(stream)
+    try:
+        emit()
+    finally:
+        pipeline.stop()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_json_lines_with_secrets_redacted():
+    pipeline = LogPipeline(level="INFO", json=True, queue_size=100, sample_rates={})
+    signup = PatientRegister(full_name="Pat Ient", email="p@example.com", password="hunter22", date_of_birth="1990-01-01")
+
+    def emit():
+        logger.info("Signup %s", signup, extra={"event": "patient.signup", "access_token": "abc"})
+        logger.info("Payload", extra={"event": "x", "body": {"email": "p@example.com", "password": "hunter22"}})
+        logger.debug("not at INFO")
+
+    first, second = collect(pipeline, emit)
+    assert first["level"] == "INFO" and first["logger"] == "medichain.test" and first["event"] == "patient.signup"
+    assert "hunter22" not in first["message"] and "[redacted]" in first["message"]
+    assert first["access_token"] == "[redacted]"
+    assert second["body"] == {"email": "p@example.com", "password": "[redacted]"}
+
+
+def test_plain_text_records_are_redacted_too():
+    pipeline = LogPipeline(level="INFO", json=False, queue_size=100, sample_rates={})
+    signup = PatientRegister(full_name="Pat Ient", email="p@example.com", password="hunter22", date_of_birth="1990-01-01")
+    stream = io.StringIO()
+    pipeline.start(stream)
+    try:
+        logger.info("Signup %s", signup, extra={"event": "patient.signup"})
+        logger.info("Payload %s", {"password": "hunter22"})
+    finally:
+        pipeline.stop()
+
+    output = stream.getvalue()
+    assert "hunter22" not in output and output.count("[redacted]") == 2
+    assert "Signup" in output and "p@example.com" in output
+
+
+def test_sampling_keeps_warnings_and_unlisted_events():
+    pipeline = LogPipeline(level="INFO", json=True, queue_size=100, sample_rates={"noisy": 0.0})
+
+    def emit():
+        for _ in range(5):
+            logger.info("noisy", extra={"event": "noisy"})
+        logger.warning("noisy but important", extra={"event": "noisy"})
+        logger.info("other", extra={"event": "other"})
+
+    records = collect(pipeline, emit)
+    assert [record["message"] for record in records] == ["noisy but important", "other"]
+    assert pipeline.stats()["sampled_out"] == 5
+
+
+def test_full_queue_drops_instead_of_blocking():
+    pipeline = LogPipeline(level="INFO", json=True, queue_size=2, sample_rates={})
+    logging.getLogger().addHandler(pipeline.handler)
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logging.getLogger().removeHandler(pipeline.handler)
+    assert pipeline.stats()["queued"] == 2
+    assert pipeline.stats()["dropped"] == 3
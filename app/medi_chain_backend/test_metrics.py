@@ -0,0 +1,68 @@
+"""Per-route latency and DB metrics: /metrics and the Server-Timing header."""
+import re
+
+import pytest
+
+from src.metrics import LATENCY_BUCKETS, RequestStats, metrics_registry, route_template
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    metrics_registry.reset()
+    yield
+    metrics_registry.reset()
+
+
+def sample(text, name, **labels):
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    for line in text.splitlines():
+        if line.startswith(f"{name}{{{wanted}}} "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"no {name}{{{wanted}}} in:\n{text}")
+
+
+def test_route_metrics_and_server_timing(client, run, seed):
+    url = f"/api/prescriptions/patient/{seed['patient_id']}"
+    for _ in range(2):
+        response = run(client.get(url, headers=seed["patient_headers"]))
+    assert response.status_code == 200
+
+    timing = response.headers["Server-Timing"]
+    match = re.fullmatch(r'app;dur=([\d.]+), db;dur=([\d.]+);desc="(\d+) queries", pool;dur=([\d.]+)', timing)
+    assert match, timing
+    assert int(match.group(3)) >= 1
+    assert float(match.group(2)) <= float(match.group(1))
+
+    run(client.get("/no/such/path"))
+    text = run(client.get("/metrics")).text
+    route = {"method": "GET", "route": "/api/prescriptions/patient/{patient_id}"}
+    assert sample(text, "http_request_duration_seconds_count", **route) == 2
+    assert sample(text, "http_request_duration_seconds_bucket", **route, le="+Inf") == 2
+    assert sample(text, "http_requests_total", **route, status="200") == 2
+    assert sample(text, "http_request_db_statements_total", **route) == 2 * int(match.group(3))
+    assert sample(text, "http_request_db_seconds_total", **route) > 0
+    assert sample(text, "http_requests_total", method="GET", route="unmatched", status="404") == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    for elapsed in (0.001, 0.02, 0.02, 30.0):
+        metrics_registry.observe("GET", "/x", 200, elapsed, RequestStats())
+    text = metrics_registry.render()
+
+    def bucket(le):
+        return sample(text, "http_request_duration_seconds_bucket", method="GET", route="/x", le=le)
+
+    assert [bucket("0.005"), bucket("0.025"), bucket(str(LATENCY_BUCKETS[-1])), bucket("+Inf")] == [1, 3, 3, 4]
+    assert "# TYPE http_request_duration_seconds histogram" in text
+
+
+def test_route_template_adds_the_router_prefix():
+    class Route:
+        def __init__(self, path):
+            self.path = path
+
+    assert route_template({"route": Route("/patient/{patient_id}"), "path": "/api/prescriptions/patient/42"}) == \
+        "/api/prescriptions/patient/{patient_id}"
+    assert route_template({"route": Route("/"), "path": "/api/appointments/"}) == "/api/appointments/"
+    assert route_template({"route": Route("/metrics"), "path": "/metrics"}) == "/metrics"
+    assert route_template({"path": "/nowhere"}) == "unmatched"
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from src.appointments.models import Appointment
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.pagination import DEFAULT_PAGE_LIMIT, NEXT_CURSOR_HEADER
+
+
+def insert_appointments(run, seed, count):
+    async def insert():
+        base = datetime(2026, 1, 1)
+        async with async_session_maker() as session:
+            rows = [
+                Appointment(
+                    patient_id=seed["patient_id"], doctor_id=seed["doctor_id"],
+                    appointment_date=base + timedelta(minutes=30 * i), created_at=base + timedelta(minutes=i),
+                )
+                for i in range(count)
+            ]
+            session.add_all(rows)
+            # Doctor listings only show patients the doctor may access.
+            session.add(DoctorPatient(doctor_id=seed["doctor_id"], patient_id=seed["patient_id"], grants_access=True))
+            await session.commit()
+            return [row.id for row in rows]
+
+    return run(insert())
+
+
+def test_walks_pages_newest_first(client, run, seed):
+    ids = insert_appointments(run, seed, 5)
+    url = f"/api/appointments/doctor/{seed['doctor_id']}"
+
+    async def walk():
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get(url, params=params, headers=seed["doctor_headers"])
+            assert response.status_code == 200
+            seen.extend(item["id"] for item in response.json())
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                return seen
+
+    seen = run(walk())
+    assert seen == [str(i) for i in reversed(ids)]
+
+
+def test_ascending_order_and_default_limit(client, run, seed):
+    ids = insert_appointments(run, seed, 3)
+    response = run(client.get(
+        f"/api/appointments/patient/{seed['patient_id']}",
+        params={"order": "asc"}, headers=seed["patient_headers"],
+    ))
+    assert [item["id"] for item in response.json()] == [str(i) for i in ids]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_rejects_malformed_cursor(client, run, seed):
+    response = run(client.get(
+        f"/api/audit-logs/actor/{seed['doctor_id']}",
+        params={"cursor": "garbage"}, headers=seed["doctor_headers"],
+    ))
+    assert response.status_code == 400
+
+
+def test_whole_list_without_limit_or_cursor(client, run, seed):
+    ids = insert_appointments(run, seed, DEFAULT_PAGE_LIMIT + 5)
+    url = f"/api/appointments/patient/{seed['patient_id']}"
+
+    response = run(client.get(url, headers=seed["patient_headers"]))
+    assert len(response.json()) == len(ids)
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+    # A cursor alone continues in pages of the default size.
+    first = run(client.get(url, params={"limit": 2}, headers=seed["patient_headers"]))
+    rest = run(client.get(url, params={"cursor": first.headers[NEXT_CURSOR_HEADER]}, headers=seed["patient_headers"]))
+    assert len(rest.json()) == DEFAULT_PAGE_LIMIT
+    assert NEXT_CURSOR_HEADER in rest.headers
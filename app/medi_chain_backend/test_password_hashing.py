@@ -0,0 +1,68 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from src.utils import PasswordHasherPool, password_hasher, verify_password
+
+
+def test_hash_and_verify_run_on_the_pool(run):
+    pool = PasswordHasherPool(workers=2, max_pending=4)
+
+    async def roundtrip():
+        hashed = await pool.hash("correct horse")
+        return hashed, await pool.verify("correct horse", hashed), await pool.verify("wrong", hashed)
+
+    hashed, good, bad = run(roundtrip())
+    assert verify_password("correct horse", hashed)
+    assert good is True and bad is False
+    stats = pool.stats()
+    assert stats["hash"]["count"] == 1 and stats["verify"]["count"] == 2
+    pool.shutdown()
+
+
+def test_event_loop_keeps_running_while_hashing(run):
+    pool = PasswordHasherPool(workers=2, max_pending=8)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(asyncio.get_running_loop().time())
+            await asyncio.sleep(0)
+
+    async def both():
+        await asyncio.gather(pool.hash("pw-1"), pool.hash("pw-2"), ticker())
+
+    run(both())
+    assert len(ticks) == 5
+    pool.shutdown()
+
+
+def test_saturated_pool_returns_503(run):
+    pool = PasswordHasherPool(workers=1, max_pending=1)
+
+    async def flood():
+        return await asyncio.gather(*(pool.hash(f"pw-{i}") for i in range(3)), return_exceptions=True)
+
+    results = run(flood())
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 2
+    assert rejected[0].status_code == 503
+    assert pool.stats()["rejected"] == 2
+    pool.shutdown()
+
+
+def test_signup_and_login_use_shared_pool(client, run):
+    async def flow():
+        signup = await client.post("/api/doctors/signup", json={
+            "full_name": "Dr. Pool", "email": "pool@example.com", "password": "secret123",
+            "specialization": "Cardiology", "hospital_name": "General",
+        })
+        login = await client.post("/api/doctors/login", json={"email": "pool@example.com", "password": "secret123"})
+        return signup, login
+
+    before = password_hasher.stats()
+    signup, login = run(flow())
+    assert signup.status_code == 200 and login.status_code == 200
+    after = password_hasher.stats()
+    assert after["hash"]["count"] == before["hash"]["count"] + 1
+    assert after["verify"]["count"] == before["verify"]["count"] + 1
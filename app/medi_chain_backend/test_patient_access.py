@@ -0,0 +1,174 @@
+"""Patient record access: who may read what, and what it costs per request."""
+import uuid
+
+import pytest
+
+from src.consents.access import AccessDecision
+from src.db.main import async_session_maker
+from src.doctors.models import Doctor
+from src.patients.models import Patient
+from src.utils import create_access_token
+
+
+def headers(user_id):
+    token = create_access_token({"email": "user@example.com", "id": str(user_id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def others(run, seed):
+    """A second patient of the seeded doctor, and a doctor with no relationship."""
+    async def insert():
+        async with async_session_maker() as session:
+            patient = Patient(full_name="Other Patient", email="other-patient@example.com", password_hash="x")
+            doctor = Doctor(
+                full_name="Other Doctor", email="other-doctor@example.com", password_hash="x",
+                specialization="Dermatology", hospital_name="General",
+            )
+            session.add_all([patient, doctor])
+            await session.commit()
+            return patient.id, doctor.id
+
+    patient_id, doctor_id = run(insert())
+    return {"patient_id": patient_id, "doctor_id": doctor_id}
+
+
+def prescribe(client, run, seed, patient_id):
+    body = {"patient_id": str(patient_id), "doctor_id": str(seed["doctor_id"]), "medication": "m", "dosage": "1"}
+    return run(client.post("/api/prescriptions/", json=body, headers=seed["doctor_headers"])).json()
+
+
+@pytest.mark.parametrize("link_active,access_status,allowed", [
+    (False, None, False),
+    (True, None, True),
+    (True, "pending", True),
+    (True, "revoked", False),
+    (False, "granted", True),
+    (False, "revoked", False),
+])
+def test_decision_rule(link_active, access_status, allowed):
+    assert AccessDecision(link_active, access_status).allowed is allowed
+
+
+def test_patient_lists_require_access(client, run, seed, others, grant_access):
+    prescribe(client, run, seed, seed["patient_id"])
+    grant_access()
+    url = f"/api/prescriptions/patient/{seed['patient_id']}"
+
+    assert run(client.get(url, headers=seed["patient_headers"])).status_code == 200
+    assert run(client.get(url, headers=seed["doctor_headers"])).status_code == 200
+    assert run(client.get(url, headers=headers(others["doctor_id"]))).status_code == 403
+    assert run(client.get(url, headers=headers(others["patient_id"]))).status_code == 403
+
+    timeline = f"/api/patients/{seed['patient_id']}/timeline"
+    assert run(client.get(timeline, headers=headers(others["doctor_id"]))).status_code == 403
+
+
+def test_consent_changes_apply_immediately(client, run, seed, others):
+    stranger = {"patient_id": str(seed["patient_id"]), "doctor_id": str(others["doctor_id"])}
+    url = f"/api/lab-reports/patient/{seed['patient_id']}"
+    stranger_headers = headers(others["doctor_id"])
+
+    assert run(client.get(url, headers=stranger_headers)).status_code == 403
+    consent = run(client.post("/api/consents/", json=stranger, headers=seed["patient_headers"])).json()
+    run(client.put(f"/api/consents/{consent['id']}", json={"access_status": "granted"}, headers=seed["patient_headers"]))
+    assert run(client.get(url, headers=stranger_headers)).status_code == 200
+    run(client.put(f"/api/consents/{consent['id']}", json={"access_status": "revoked"}, headers=seed["patient_headers"]))
+    assert run(client.get(url, headers=stranger_headers)).status_code == 403
+
+
+def test_only_the_patient_opens_their_records(client, run, seed):
+    url = f"/api/appointments/patient/{seed['patient_id']}"
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    doctor = seed["doctor_headers"]
+    assert run(client.get(url, headers=doctor)).status_code == 403
+
+    # Booking and prescribing link the doctor to the patient without access.
+    booking = {**pair, "appointment_date": "2026-05-01T10:00:00"}
+    assert run(client.post("/api/appointments/", json=booking, headers=doctor)).status_code == 200
+    prescribe(client, run, seed, seed["patient_id"])
+    assert run(client.get(url, headers=doctor)).status_code == 403
+
+    # The doctor can neither link themselves nor grant their own consent.
+    assert run(client.post("/api/doctor-patient/", json=pair, headers=doctor)).status_code == 403
+    consent = run(client.post("/api/consents/", json=pair, headers=doctor)).json()
+    granted = run(client.put(f"/api/consents/{consent['id']}", json={"access_status": "granted"}, headers=doctor))
+    assert granted.status_code == 403
+    assert run(client.delete(f"/api/consents/{consent['id']}", headers=doctor)).status_code == 403
+    assert run(client.get(url, headers=doctor)).status_code == 403
+
+    # The patient linking them does, and the cached denial must go.
+    assert run(client.post("/api/doctor-patient/", json=pair, headers=seed["patient_headers"])).status_code == 200
+    assert run(client.get(url, headers=doctor)).status_code == 200
+
+
+def test_consents_and_links_are_listed_to_their_parties(client, run, seed, others):
+    pair = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    consent = run(client.post("/api/consents/", json=pair, headers=seed["patient_headers"])).json()
+    link = run(client.post("/api/doctor-patient/", json=pair, headers=seed["patient_headers"])).json()
+    stranger = headers(others["doctor_id"])
+
+    for url, allowed in [
+        (f"/api/consents/{consent['id']}", [seed["patient_headers"], seed["doctor_headers"]]),
+        (f"/api/consents/patient/{seed['patient_id']}", [seed["patient_headers"]]),
+        (f"/api/consents/doctor/{seed['doctor_id']}", [seed["doctor_headers"]]),
+        (f"/api/doctor-patient/patient/{seed['patient_id']}", [seed["patient_headers"]]),
+        (f"/api/doctor-patient/doctor/{seed['doctor_id']}", [seed["doctor_headers"]]),
+    ]:
+        for caller in allowed:
+            assert run(client.get(url, headers=caller)).status_code == 200, url
+        assert run(client.get(url, headers=stranger)).status_code == 403, url
+
+    # Either side may deactivate the link, only the patient reactivates it.
+    link_url = f"/api/doctor-patient/{link['id']}"
+    assert run(client.put(link_url, json={"is_active": False}, headers=stranger)).status_code == 403
+    assert run(client.put(link_url, json={"is_active": False}, headers=seed["doctor_headers"])).status_code == 200
+    assert run(client.put(link_url, json={"is_active": True}, headers=seed["doctor_headers"])).status_code == 403
+    assert run(client.put(link_url, json={"is_active": True}, headers=seed["patient_headers"])).status_code == 200
+
+
+def test_single_records_check_the_records_patient(client, run, seed, others):
+    prescription = prescribe(client, run, seed, seed["patient_id"])
+    url = f"/api/prescriptions/{prescription['id']}"
+
+    assert run(client.get(url, headers=seed["patient_headers"])).status_code == 200
+    assert run(client.get(url, headers=headers(others["doctor_id"]))).status_code == 403
+    assert run(client.get(url, headers=headers(others["patient_id"]))).status_code == 403
+
+
+def test_doctor_lists_only_show_accessible_patients(client, run, seed, others, db, count_round_trips, grant_access):
+    kept = prescribe(client, run, seed, seed["patient_id"])
+    grant_access()
+    prescribe(client, run, seed, others["patient_id"])
+    revoke = {"patient_id": str(others["patient_id"]), "doctor_id": str(seed["doctor_id"])}
+    consent = run(client.post("/api/consents/", json=revoke, headers=headers(others["patient_id"]))).json()
+    run(client.put(f"/api/consents/{consent['id']}", json={"access_status": "revoked"},
+                   headers=headers(others["patient_id"])))
+    url = f"/api/prescriptions/doctor/{seed['doctor_id']}"
+
+    with count_round_trips(db) as (statements, _):
+        response = run(client.get(url, headers=seed["doctor_headers"]))
+    assert [item["id"] for item in response.json()] == [kept["id"]]
+    # The collection version lookup for the ETag, the accessible patients,
+    # then the filtered page.
+    assert statements == ["SELECT", "SELECT", "SELECT"]
+
+    assert run(client.get(url, headers=headers(others["doctor_id"]))).status_code == 403
+
+
+def test_enforcement_costs_at_most_one_query(client, run, seed, db, count_round_trips):
+    prescribe(client, run, seed, seed["patient_id"])
+    url = f"/api/appointments/patient/{seed['patient_id']}"
+    stranger = headers(uuid.uuid4())
+
+    with count_round_trips(db) as (first, _):
+        run(client.get(url, headers=stranger))
+    with count_round_trips(db) as (second, _):
+        run(client.get(url, headers=stranger))
+    with count_round_trips(db) as (own, _):
+        run(client.get(url, headers=seed["patient_headers"]))
+
+    # Denied callers never reach the ETag version lookup or the list query.
+    assert first == ["SELECT"]
+    assert second == []
+    assert own == ["SELECT", "SELECT"]
@@ -0,0 +1,115 @@
+"""Fails if a service lookup or list query needs a full table scan."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.appointments.models import Appointment
+from src.appointments.service import AppointmentService
+from src.audit_logs.models import AuditLog
+from src.audit_logs.service import AuditLogService
+from src.consents.access import get_access_decision
+from src.consents.cache import consent_decisions
+from src.consents.models import Consent
+from src.consents.service import ConsentService
+from src.db.explain import SUPPORTED_DIALECTS, capture_statements, find_sequential_scans
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.doctor_patient.schemas import DoctorPatientCreate
+from src.doctor_patient.service import DoctorPatientService
+from src.doctors.models import Doctor
+from src.doctors.service import DoctorService
+from src.lab_reports.models import LabReport
+from src.lab_reports.service import LabReportService
+from src.patients.models import Patient
+from src.patients.service import PatientService
+from src.patients.timeline import TimelineService
+from src.prescriptions.models import Prescription
+from src.prescriptions.service import PrescriptionService
+from src.search.service import SearchParams, SearchService
+from src.versions.bumps import doctor_collection, patient_collection
+from src.versions.etags import collection_versions, record_version
+
+
+async def seed_dataset(session, people=20, records=5):
+    patients = [Patient(full_name=f"P{i}", email=f"p{i}@example.com", password_hash="x") for i in range(people)]
+    doctors = [
+        Doctor(full_name=f"D{i}", email=f"d{i}@example.com", password_hash="x",
+               specialization="GP", hospital_name="General")
+        for i in range(people)
+    ]
+    session.add_all(patients + doctors)
+    base = datetime(2026, 1, 1)
+    for i, (patient, doctor) in enumerate(zip(patients, doctors)):
+        session.add(DoctorPatient(doctor_id=doctor.id, patient_id=patient.id, grants_access=True))
+        session.add(Consent(doctor_id=doctor.id, patient_id=patient.id))
+        for j in range(records):
+            when = base + timedelta(hours=i * records + j)
+            session.add(Appointment(patient_id=patient.id, doctor_id=doctor.id, appointment_date=when, created_at=when))
+            session.add(Prescription(patient_id=patient.id, doctor_id=doctor.id, medication="m", dosage="d", created_at=when))
+            session.add(LabReport(patient_id=patient.id, doctor_id=doctor.id, file_url="f", report_type="blood", uploaded_at=when))
+            session.add(AuditLog(actor_id=doctor.id, action="CREATE_APPOINTMENT", target_type="appointment", timestamp=when))
+    await session.commit()
+    return patients[0], doctors[0]
+
+
+async def run_service_queries(session, patient, doctor):
+    await PatientService().get_patient_by_email(patient.email, session)
+    await DoctorService().get_doctor_by_email(doctor.email, session)
+    await AppointmentService().get_appointments_by_patient(patient.id, session)
+    await AppointmentService().get_appointments_by_doctor(doctor.id, session)
+    await AppointmentService().get_appointments_by_doctor(doctor.id, session, accessible_only=True)
+    await PrescriptionService().get_prescriptions_by_patient(patient.id, session)
+    await PrescriptionService().get_prescriptions_by_doctor(doctor.id, session)
+    await LabReportService().get_lab_reports_by_patient(patient.id, session)
+    await LabReportService().get_lab_reports_by_doctor(doctor.id, session)
+    await LabReportService().get_lab_reports_by_doctor(doctor.id, session, accessible_only=True)
+    consent_decisions.clear()
+    await get_access_decision(session, doctor.id, patient.id)
+    await ConsentService().get_consents_by_patient(patient.id, session)
+    await ConsentService().get_consents_by_doctor(doctor.id, session)
+    await DoctorPatientService().get_patients_by_doctor(doctor.id, session)
+    await DoctorPatientService().get_doctors_by_patient(patient.id, session)
+    await AuditLogService().get_audit_logs_by_actor(doctor.id, session)
+    await AuditLogService().get_audit_logs_by_action("CREATE_APPOINTMENT", session)
+    # Streaming exports (their date-range and per-patient forms).
+    await session.execute(AuditLogService().export_statement(date_from=datetime(2026, 1, 2)))
+    await session.execute(AuditLogService().export_statement(actor_id=doctor.id, action="CREATE_APPOINTMENT"))
+    await session.execute(TimelineService().export_statement(patient.id, date_from=datetime(2026, 1, 1)))
+    # ETag version lookups.
+    await collection_versions(session, [patient_collection("appointments", patient.id), doctor_collection("consents", doctor.id)])
+    await record_version(session, Prescription, patient.id, "prescriptions")
+    # Search; only Postgres answers it with SQL (elsewhere the in-process
+    # index loads the whole table once).
+    if session.get_bind().dialect.name == "postgresql":
+        await SearchService().search("doctors", SearchParams(q="gp gen"), session)
+        await SearchService().search("patients", SearchParams(q="p1"), session)
+        await SearchService().search("patients", SearchParams(q="+1555"), session)
+    # The reference check inside create_doctor_patient (the pair already exists).
+    with pytest.raises(HTTPException, match="relationship already exists") as duplicate:
+        await DoctorPatientService().create_doctor_patient(
+            DoctorPatientCreate(doctor_id=doctor.id, patient_id=patient.id), session
+        )
+    assert duplicate.value.status_code == 400
+
+
+def test_service_queries_use_indexes(db, run):
+    if db.dialect.name not in SUPPORTED_DIALECTS:
+        pytest.skip(f"no query plan check for {db.dialect.name}")
+
+    async def check():
+        async with async_session_maker() as session:
+            patient, doctor = await seed_dataset(session)
+            with capture_statements(db) as statements:
+                await run_service_queries(session, patient, doctor)
+        assert len(statements) >= 15
+
+        failures = {}
+        async with db.begin() as conn:
+            for statement, parameters in statements:
+                scans = await find_sequential_scans(conn, statement, parameters)
+                if scans:
+                    failures[statement] = scans
+        return failures
+
+    assert run(check()) == {}
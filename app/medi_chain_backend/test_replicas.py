@@ -0,0 +1,174 @@
+"""Read replicas: round-robin, health checks and read-your-writes, on two SQLite files."""
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+from sqlmodel import SQLModel, select
+
+from src.appointments.models import Appointment
+from src.config import config
+from src.consents.cache import consent_decisions
+from src.consents.models import Consent
+from src.db.main import async_session_maker, build_engine, replica_router
+from src.db.replicas import Replica, ReplicaRouter
+from src.doctor_patient.models import DoctorPatient
+from src.doctors.models import Doctor
+from src.patients.models import Patient
+from src.prescriptions.models import Prescription
+from src.versions.bumps import doctor_collection
+from src.versions.models import CollectionVersion
+
+
+def sqlite_replica(run, path) -> Replica:
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = build_engine(config, url)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    run(create())
+    return Replica(url, engine)
+
+
+@pytest.fixture
+def replica(db, run, tmp_path, monkeypatch):
+    """An empty second database standing in for a replica that has not caught up."""
+    replica = sqlite_replica(run, tmp_path / "replica.db")
+    monkeypatch.setattr(replica_router, "replicas", [replica])
+    monkeypatch.setattr(replica_router, "_sticky", OrderedDict())
+    yield replica
+    run(replica.engine.dispose())
+
+
+def test_reads_use_the_replica_except_right_after_the_callers_writes(client, run, seed, replica, monkeypatch, grant_access):
+    patient_id, doctor_id = seed["patient_id"], seed["doctor_id"]
+    by_patient = f"/api/prescriptions/patient/{patient_id}"
+    body = {"patient_id": str(patient_id), "doctor_id": str(doctor_id), "medication": "[]", "dosage": "1"}
+
+    created = run(client.post("/api/prescriptions/", json=body, headers=seed["doctor_headers"]))
+    assert created.status_code == 200
+    assert replica.reads == 0
+
+    # The patient has not written, so they read the replica, which lacks the row.
+    assert run(client.get(by_patient, headers=seed["patient_headers"])).json() == []
+    assert replica.reads == 1
+
+    monkeypatch.setattr(replica_router, "sticky_seconds", 0.05)
+    grant_access()
+    # The doctor just wrote and reads their prescription from the primary.
+    mine = f"/api/prescriptions/{created.json()['id']}"
+    assert run(client.get(mine, headers=seed["doctor_headers"])).status_code == 200
+    assert replica.reads == 1 and replica_router.sticky_reads >= 1
+
+    run(client.post("/api/prescriptions/", json=body, headers=seed["doctor_headers"]))
+    time.sleep(0.1)
+    assert run(client.get(mine, headers=seed["doctor_headers"])).status_code == 404
+    assert replica.reads == 2
+
+
+def test_access_is_decided_on_the_primary_when_the_replica_lags(client, run, seed, replica):
+    patient_id, doctor_id = seed["patient_id"], seed["doctor_id"]
+
+    async def insert(session_maker, *rows):
+        async with session_maker() as session:
+            session.add_all(rows)
+            await session.commit()
+
+    # The replica has not seen the revocation yet.
+    run(insert(replica.session_maker,
+               Patient(id=patient_id, full_name="Pat Ient", email="patient@example.com", password_hash="x"),
+               Doctor(id=doctor_id, full_name="Doc Tor", email="doctor@example.com", password_hash="x",
+                      specialization="Cardiology", hospital_name="General"),
+               Consent(patient_id=patient_id, doctor_id=doctor_id, access_status="granted"),
+               Prescription(patient_id=patient_id, doctor_id=doctor_id, medication="[]", dosage="1")))
+    run(insert(async_session_maker, Consent(patient_id=patient_id, doctor_id=doctor_id, access_status="revoked")))
+    consent_decisions.clear()
+
+    response = run(client.get(f"/api/prescriptions/patient/{patient_id}", headers=seed["doctor_headers"]))
+    assert response.status_code == 403
+
+    # With access granted on the primary, the records still come from the replica.
+    async def grant():
+        async with async_session_maker() as session:
+            consent = (await session.execute(select(Consent))).scalar_one()
+            consent.access_status = "granted"
+            await session.commit()
+
+    run(grant())
+    consent_decisions.clear()
+    response = run(client.get(f"/api/prescriptions/patient/{patient_id}", headers=seed["doctor_headers"]))
+    assert response.status_code == 200 and len(response.json()) == 1
+    assert replica.reads == 2
+
+
+def test_doctor_lists_read_the_replica_once_access_is_decided(client, run, seed, replica):
+    patient_id, doctor_id = seed["patient_id"], seed["doctor_id"]
+
+    async def insert(session_maker, *rows):
+        async with session_maker() as session:
+            session.add_all(rows)
+            await session.commit()
+
+    # The replica still has the link the patient has since revoked on the primary.
+    run(insert(replica.session_maker,
+               Patient(id=patient_id, full_name="Pat Ient", email="patient@example.com", password_hash="x"),
+               Doctor(id=doctor_id, full_name="Doc Tor", email="doctor@example.com", password_hash="x",
+                      specialization="Cardiology", hospital_name="General"),
+               DoctorPatient(doctor_id=doctor_id, patient_id=patient_id, grants_access=True),
+               Prescription(patient_id=patient_id, doctor_id=doctor_id, medication="[]", dosage="1")))
+    run(insert(async_session_maker,
+               DoctorPatient(doctor_id=doctor_id, patient_id=patient_id, grants_access=True),
+               Consent(patient_id=patient_id, doctor_id=doctor_id, access_status="revoked")))
+
+    url = f"/api/prescriptions/doctor/{doctor_id}"
+    response = run(client.get(url, headers=seed["doctor_headers"]))
+    assert response.status_code == 200 and response.json() == []
+    assert replica.reads == 1
+
+    async def grant():
+        async with async_session_maker() as session:
+            consent = (await session.execute(select(Consent))).scalar_one()
+            consent.access_status = "granted"
+            await session.commit()
+
+    run(grant())
+    consent_decisions.clear()
+    assert len(run(client.get(url, headers=seed["doctor_headers"])).json()) == 1
+    assert replica.reads == 2
+
+    # The cached listing reads the primary while the replica is behind on its collection.
+    resource, owner_id = doctor_collection("appointments", doctor_id)
+    run(insert(async_session_maker,
+               Appointment(patient_id=patient_id, doctor_id=doctor_id, appointment_date=datetime(2026, 5, 4, 9)),
+               CollectionVersion(resource=resource, owner_id=owner_id, version=1)))
+    listed = run(client.get(f"/api/appointments/doctor/{doctor_id}", headers=seed["doctor_headers"]))
+    assert len(listed.json()) == 1
+    assert replica.reads == 3
+
+
+def test_round_robin_skips_replicas_failing_the_health_check(db, run, tmp_path):
+    first = sqlite_replica(run, tmp_path / "first.db")
+    second = sqlite_replica(run, tmp_path / "second.db")
+    broken = Replica(f"sqlite+aiosqlite:///{tmp_path}/missing/broken.db",
+                     build_engine(config, f"sqlite+aiosqlite:///{tmp_path}/missing/broken.db"))
+    router = ReplicaRouter(async_session_maker, [first, broken, second], sticky_seconds=60,
+                           health_interval=60, health_timeout=1)
+    try:
+        assert run(router.check()) == 2
+        assert not broken.healthy and broken.failed_checks == 1
+        assert [router.pick() for _ in range(4)] == [first, second, first, second]
+
+        router.mark_write("writer")
+        assert router.pick("writer") is None and router.pick("reader") is first
+        assert router.session_maker("writer") is async_session_maker
+
+        first.healthy = second.healthy = False
+        assert router.pick("reader") is None and router.fallback_reads == 1
+
+        (tmp_path / "missing").mkdir()
+        assert run(router.check()) == 3 and broken.healthy
+    finally:
+        for replica in (first, second, broken):
+            run(replica.engine.dispose())
@@ -0,0 +1,184 @@
+"""Response cache for the per-doctor listings: hits, invalidation, single-flight."""
+import asyncio
+
+from starlette.requests import Request
+
+from src.response_cache import CACHE_STATUS_HEADER, LocalCacheBackend, ResponseCache
+
+
+def book(client, run, seed, hour):
+    body = {
+        "patient_id": str(seed["patient_id"]),
+        "doctor_id": str(seed["doctor_id"]),
+        "appointment_date": f"2026-05-04T{hour:02d}:00:00",
+    }
+    response = run(client.post("/api/appointments/", json=body, headers=seed["doctor_headers"]))
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_repeated_polls_are_served_from_the_cache(client, run, seed, db, count_round_trips, grant_access, shared_response_cache):
+    book(client, run, seed, 9)
+    grant_access()
+    url = f"/api/appointments/doctor/{seed['doctor_id']}"
+
+    first = run(client.get(url, headers=seed["doctor_headers"]))
+    with count_round_trips(db) as (statements, _):
+        second = run(client.get(url, headers=seed["doctor_headers"]))
+    other_params = run(client.get(url, params={"limit": 1}, headers=seed["doctor_headers"]))
+
+    assert first.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert second.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert second.json() == first.json() and len(first.json()) == 1
+    assert statements == []
+    assert other_params.headers[CACHE_STATUS_HEADER] == "MISS"
+
+
+def test_keys_include_the_principal(client, run, seed):
+    book(client, run, seed, 9)
+    url = f"/api/doctor-patient/doctor/{seed['doctor_id']}"
+
+    doctor = run(client.get(url, headers=seed["doctor_headers"]))
+    patient = run(client.get(url, headers=seed["patient_headers"]))
+
+    assert doctor.headers[CACHE_STATUS_HEADER] == "MISS"
+    # Access is checked before the cache is consulted.
+    assert patient.status_code == 403 and CACHE_STATUS_HEADER not in patient.headers
+
+    cache = ResponseCache(ttl=60, max_entries=100, redis_url=None, prefix="test")
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b"[]", {}
+
+    async def poll():
+        for user_id in ("doctor", "other", "doctor"):
+            await cache.respond(request_for("/list"), {"user": {"id": user_id}}, "scope", load)
+
+    run(poll())
+    assert len(loads) == 2
+
+
+def test_mutations_invalidate(client, run, seed, grant_access, shared_response_cache):
+    url = f"/api/appointments/doctor/{seed['doctor_id']}"
+    links = f"/api/doctor-patient/doctor/{seed['doctor_id']}"
+    book(client, run, seed, 9)
+    grant_access()
+    run(client.get(url, headers=seed["doctor_headers"]))
+    run(client.get(links, headers=seed["doctor_headers"]))
+
+    second = book(client, run, seed, 10)
+    listed = run(client.get(url, headers=seed["doctor_headers"]))
+    assert listed.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert second["id"] in [item["id"] for item in listed.json()]
+
+    link_id = run(client.get(links, headers=seed["doctor_headers"])).json()[0]["id"]
+    run(client.put(f"/api/doctor-patient/{link_id}", json={"is_active": False}, headers=seed["doctor_headers"]))
+    # Deactivating the link hides the patient's appointments from the doctor.
+    assert run(client.get(url, headers=seed["doctor_headers"])).json() == []
+    assert run(client.get(links, headers=seed["doctor_headers"])).json()[0]["is_active"] is False
+
+
+def test_non_canonical_ids_share_the_invalidated_scope(client, run, seed, grant_access, shared_response_cache):
+    url = f"/api/appointments/doctor/{seed['doctor_id'].hex.upper()}"
+    book(client, run, seed, 9)
+    grant_access()
+    run(client.get(url, headers=seed["doctor_headers"]))
+
+    second = book(client, run, seed, 10)
+    listed = run(client.get(url, headers=seed["doctor_headers"]))
+    assert listed.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert second["id"] in [item["id"] for item in listed.json()]
+
+
+def test_access_filtered_listings_bypass_an_unshared_cache(client, run, seed, grant_access):
+    book(client, run, seed, 9)
+    grant_access()
+    appointments = f"/api/appointments/doctor/{seed['doctor_id']}"
+    links = f"/api/doctor-patient/doctor/{seed['doctor_id']}"
+
+    # Another worker's revocation would not reach this worker's entries.
+    statuses = [run(client.get(url, headers=seed["doctor_headers"])).headers[CACHE_STATUS_HEADER]
+                for url in (appointments, appointments, links, links)]
+    assert statuses == ["BYPASS", "BYPASS", "MISS", "HIT"]
+
+
+def request_for(path, query=b""):
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []})
+
+
+def test_concurrent_misses_share_one_load(run):
+    cache = ResponseCache(ttl=60, max_entries=100, redis_url=None, prefix="test")
+    token_data = {"user": {"id": "doctor"}}
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return b"[]", {}
+
+    async def poll():
+        return await asyncio.gather(*[
+            cache.respond(request_for("/poll"), token_data, "scope", load) for _ in range(10)
+        ])
+
+    responses = run(poll())
+    assert len(loads) == 1
+    assert all(response.body == b"[]" for response in responses)
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"], stats["coalesced"]) == (1, 9, 9)
+    assert stats["hit_ratio"] == 0.9
+
+
+def test_invalidation_orphans_every_variant(run):
+    cache = ResponseCache(ttl=60, max_entries=100, redis_url=None, prefix="test")
+    token_data = {"user": {"id": "doctor"}}
+    version = [b"old"]
+
+    async def load():
+        return version[0], {}
+
+    async def flow():
+        for query in (b"", b"limit=1"):
+            await cache.respond(request_for("/list", query), token_data, "scope", load)
+        version[0] = b"new"
+        await cache.invalidate("scope")
+        return [
+            (await cache.respond(request_for("/list", query), token_data, "scope", load)).body
+            for query in (b"", b"limit=1")
+        ]
+
+    assert run(flow()) == [b"new", b"new"]
+
+
+def test_backend_failures_fall_back_to_the_database(run):
+    class Unavailable(LocalCacheBackend):
+        async def get(self, key):
+            raise ConnectionError("redis is down")
+
+    cache = ResponseCache(ttl=60, max_entries=100, redis_url=None, prefix="test")
+    cache.backend = Unavailable(100)
+
+    async def load():
+        return b"[1]", {}
+
+    response = run(cache.respond(request_for("/list"), {"user": {"id": "doctor"}}, "scope", load))
+    assert response.body == b"[1]"
+    assert response.headers[CACHE_STATUS_HEADER] == "BYPASS"
+    assert cache.stats()["errors"] == 1
+
+
+def test_local_backend_expiry_and_bounds(run):
+    backend = LocalCacheBackend(max_entries=2)
+
+    async def flow():
+        await backend.set("a", b"1", ex=60)
+        await backend.set("b", b"2", ex=60)
+        await backend.set("c", b"3", ex=60)
+        await backend.incr("version")
+        await backend.set("gone", b"4", ex=-1)
+        return [await backend.get(key) for key in ("a", "c", "gone", "version")]
+
+    # "a" was evicted and "gone" expired; counters are never evicted.
+    assert run(flow()) == [None, b"3", None, b"1"]
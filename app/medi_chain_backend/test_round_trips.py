@@ -0,0 +1,99 @@
+"""Statement counts for the create paths (one SELECT for references, one commit)."""
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from src.appointments.schemas import AppointmentCreate
+from src.appointments.service import AppointmentService
+from src.audit_logs.sink import audit_sink
+from src.availability.index import booked_slots
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.prescriptions.schemas import PrescriptionCreate
+from src.prescriptions.service import PrescriptionService
+
+
+@pytest.fixture(autouse=True)
+def transactional_audit(monkeypatch):
+    monkeypatch.setattr(audit_sink, "mode", "transactional")
+
+
+def test_create_appointment_round_trips(db, run, seed, count_round_trips):
+    data = AppointmentCreate(
+        patient_id=seed["patient_id"], doctor_id=seed["doctor_id"], appointment_date=datetime(2026, 5, 1, 10)
+    )
+
+    async def create():
+        async with async_session_maker() as session:
+            # The doctor's slot index is loaded once per process, not per booking.
+            await booked_slots.get(session, seed["doctor_id"])
+            with count_round_trips(db) as (statements, commits):
+                await AppointmentService().create_appointment(data, session, actor_id=seed["doctor_id"])
+            return statements, commits
+
+    statements, commits = run(create())
+    # reference check, link upsert, patient and daily appointment counter
+    # upserts, collection version upsert, appointment insert, audit insert
+    assert statements == ["SELECT", "INSERT", "INSERT", "INSERT", "INSERT", "INSERT", "INSERT"]
+    assert len(commits) == 1
+
+
+def test_create_prescription_reuses_existing_link(db, run, seed, count_round_trips):
+    data = PrescriptionCreate(
+        patient_id=seed["patient_id"], doctor_id=seed["doctor_id"], medication="[]", dosage="1/day"
+    )
+
+    async def create_twice():
+        service = PrescriptionService()
+        async with async_session_maker() as session:
+            await service.create_prescription(data, session, actor_id=seed["doctor_id"])
+        async with async_session_maker() as session:
+            with count_round_trips(db) as (statements, commits):
+                await service.create_prescription(data, session, actor_id=seed["doctor_id"])
+            links = (await session.execute(select(DoctorPatient))).scalars().all()
+            return statements, commits, links
+
+    statements, commits, links = run(create_twice())
+    # No patient count bump for the existing link: one counter upsert, plus
+    # the collection version upsert.
+    assert len(statements) == 6 and len(commits) == 1
+    assert len(links) == 1 and links[0].is_active
+
+
+def test_missing_reference_costs_one_query(db, run, seed, count_round_trips):
+    import uuid
+
+    data = AppointmentCreate(
+        patient_id=uuid.uuid4(), doctor_id=seed["doctor_id"], appointment_date=datetime(2026, 5, 1, 10)
+    )
+
+    async def create():
+        async with async_session_maker() as session:
+            with count_round_trips(db) as (statements, commits):
+                with pytest.raises(HTTPException) as error:
+                    await AppointmentService().create_appointment(data, session)
+            return statements, commits, error.value
+
+    statements, commits, error = run(create())
+    assert error.status_code == 404 and error.detail == "Patient not found"
+    assert statements == ["SELECT"] and commits == []
+
+
+def test_inactive_link_is_reactivated(client, run, seed):
+    async def flow():
+        body = {"doctor_id": str(seed["doctor_id"]), "patient_id": str(seed["patient_id"])}
+        created = await client.post("/api/doctor-patient/", json=body, headers=seed["patient_headers"])
+        duplicate = await client.post("/api/doctor-patient/", json=body, headers=seed["patient_headers"])
+        link_id = created.json()["id"]
+        await client.put(f"/api/doctor-patient/{link_id}", json={"is_active": False}, headers=seed["doctor_headers"])
+        reactivated = await client.post("/api/doctor-patient/", json=body, headers=seed["patient_headers"])
+        return created, duplicate, reactivated
+
+    created, duplicate, reactivated = run(flow())
+    assert created.status_code == 200
+    assert duplicate.status_code == 400
+    assert reactivated.status_code == 200
+    assert reactivated.json()["id"] == created.json()["id"]
+    assert reactivated.json()["is_active"] is True
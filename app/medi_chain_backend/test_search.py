@@ -0,0 +1,104 @@
+"""Ranked, paginated patient and doctor search (in-process index on SQLite)."""
+import uuid
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from src.db.main import async_session_maker
+from src.doctors.models import SEARCH_VECTOR, Doctor
+from src.search.index import PrefixIndex, search_indexes
+from src.search.service import SEARCHABLE, parse_query, postgres_statement
+
+DOCTORS = [
+    ("Ana Cardenas", "Dermatology", "City Hospital", None),
+    ("Bo Smith", "Cardiology", "General", "+15550001"),
+    ("Cardo Lee", "Pediatrics", "Cardiff Clinic", "+15550002"),
+    ("Dee Jones", "Cardiology", "Cardiff Clinic", None),
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    search_indexes.clear()
+    yield
+    search_indexes.clear()
+
+
+def add_doctors(run):
+    async def insert():
+        async with async_session_maker() as session:
+            for i, (name, specialization, hospital, phone) in enumerate(DOCTORS):
+                session.add(Doctor(full_name=name, email=f"search{i}@example.com", password_hash="x",
+                                   specialization=specialization, hospital_name=hospital, phone=phone))
+            await session.commit()
+
+    run(insert())
+
+
+def names(response):
+    return [row["full_name"] for row in response.json()]
+
+
+def test_prefix_index_ranks_and_requires_every_term():
+    ids = [uuid.uuid4() for _ in range(3)]
+    index = PrefixIndex(["id", "full_name", "phone"], [
+        (ids[0], "Maria Lopez", "+4470001"),
+        (ids[1], "Mariam Long", None),
+        (ids[2], "Lopez Maria", "+4470002"),
+    ], {"full_name": 1.0})
+
+    assert index.scores(["maria"], None) == {ids[0]: 1.0, ids[1]: 0.5, ids[2]: 1.0}
+    assert set(index.scores(["mar", "lop"], None)) == {ids[0], ids[2]}
+    assert index.scores([], "+447000") == {ids[0]: 1.0, ids[2]: 1.0}
+    first, second = index.search(["maria"], None, limit=2), index.search(["maria"], None, limit=2, after=(1.0, min(ids[0], ids[2])))
+    assert [row_id for _, row_id in first] == sorted([ids[0], ids[2]], reverse=True)
+    assert second == [(0.5, ids[1])]
+
+
+def test_doctor_search_is_ranked_and_paginated(client, run, seed):
+    add_doctors(run)
+    headers = seed["patient_headers"]
+
+    response = run(client.get("/api/doctors/search", params={"q": "card"}, headers=headers))
+    assert response.status_code == 200
+    # Name prefixes outrank specialization prefixes; ties go by id.
+    assert set(names(response)[:2]) == {"Cardo Lee", "Ana Cardenas"}
+    assert set(names(response)[2:]) == {"Dee Jones", "Bo Smith", "Doc Tor"}
+    scores = [row["score"] for row in response.json()]
+    assert scores == sorted(scores, reverse=True)
+
+    exact = run(client.get("/api/doctors/search", params={"q": "cardiology cardiff"}, headers=headers))
+    assert names(exact) == ["Dee Jones"]
+
+    pages, params = [], {"q": "card", "limit": 2}
+    while True:
+        page = run(client.get("/api/doctors/search", params=params, headers=headers))
+        pages.append(names(page))
+        if "X-Next-Cursor" not in page.headers:
+            break
+        params["cursor"] = page.headers["X-Next-Cursor"]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sum(pages, []) == names(response)
+
+    phone = run(client.get("/api/doctors/search", params={"q": "+1 555 0002"}, headers=headers))
+    assert names(phone) == ["Cardo Lee"]
+    assert run(client.get("/api/doctors/search", params={"q": "--"}, headers=headers)).status_code == 400
+
+
+def test_patient_search_is_for_doctors_and_sees_new_signups(client, run, seed):
+    params = {"q": "pat"}
+    assert run(client.get("/api/patients/search", params=params, headers=seed["patient_headers"])).status_code == 403
+    assert names(run(client.get("/api/patients/search", params=params, headers=seed["doctor_headers"]))) == ["Pat Ient"]
+
+    body = {"full_name": "Patricia Noor", "email": "noor@example.com", "password": "secret-1"}
+    assert run(client.post("/api/patients/signup", json=body)).status_code == 200
+    response = run(client.get("/api/patients/search", params=params, headers=seed["doctor_headers"]))
+    assert sorted(names(response)) == ["Pat Ient", "Patricia Noor"]
+    assert set(response.json()[0]) == {"id", "full_name", "email", "phone", "date_of_birth", "score"}
+
+
+def test_postgres_query_repeats_the_indexed_expression():
+    statement = postgres_statement(SEARCHABLE["doctors"], parse_query("card lee"), limit=11)
+    sql = str(statement.compile(dialect=asyncpg.dialect()))
+    assert f"({SEARCH_VECTOR}) @@ to_tsquery('simple'" in sql
+    assert "doctors.full_name % $" in sql
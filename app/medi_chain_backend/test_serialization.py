@@ -0,0 +1,81 @@
+"""The orjson fast path must produce exactly what the response models would."""
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from pydantic import TypeAdapter
+
+from src.appointments.models import Appointment
+from src.appointments.schemas import AppointmentResponse
+from src.dashboard.schemas import DoctorDashboard
+from src.patients.models import Patient
+from src.patients.schemas import PatientAuthResponse, TimelineEntry
+from src.prescriptions.models import Prescription
+from src.prescriptions.schemas import PrescriptionResponse
+from src.serialization import dumps, serializer_for
+
+
+def validated(model, obj) -> bytes:
+    adapter = TypeAdapter(model)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+
+
+def appointment(**overrides):
+    return Appointment(**{
+        "patient_id": uuid.uuid4(),
+        "doctor_id": uuid.uuid4(),
+        "appointment_date": datetime(2026, 5, 4, 9, 30),
+        "created_at": datetime(2026, 5, 1, 8, 15, 2, 123456),
+        **overrides,
+    })
+
+
+@pytest.mark.parametrize("row", [
+    appointment(),
+    appointment(reason="check-up", notes="fasting", status="completed"),
+])
+def test_rows_match_the_response_model(row):
+    assert serializer_for(AppointmentResponse).dumps(row) == validated(AppointmentResponse, row)
+    assert serializer_for(AppointmentResponse).dumps_many([row, row]) == validated(list[AppointmentResponse], [row, row])
+
+
+def test_nested_models_dicts_and_defaults():
+    patient = Patient(full_name="Pat Ient", email="patient@example.com", password_hash="x", date_of_birth=datetime(1990, 2, 3))
+    auth = {"patient": patient, "access_token": "a", "refresh_token": "r"}
+    assert serializer_for(PatientAuthResponse).dumps(auth) == validated(PatientAuthResponse, auth)
+
+    prescription = Prescription(patient_id=uuid.uuid4(), doctor_id=uuid.uuid4(), medication="m", dosage="1")
+    dashboard = DoctorDashboard(
+        doctor_id=uuid.uuid4(), day=date(2026, 5, 4), active_patients=1, pending_consents=0,
+        prescriptions=1, appointments_today=2, recent_prescriptions=[prescription],
+    )
+    assert serializer_for(DoctorDashboard).dumps(dashboard) == dashboard.model_dump_json().encode()
+
+    entry = {"type": "consent", "id": uuid.uuid4(), "occurred_at": datetime(2026, 5, 4), "doctor_id": None,
+             "summary": None, "status": "pending"}
+    assert serializer_for(TimelineEntry).dumps(entry) == validated(TimelineEntry, entry)
+
+
+def test_aware_datetimes_use_pydantic_style():
+    value = {"at": datetime(2026, 5, 4, 9, tzinfo=timezone.utc)}
+    assert dumps(value) == TypeAdapter(dict).dump_json(value)
+
+
+def test_routes_keep_headers_and_shapes(client, run, seed):
+    body = {"patient_id": str(seed["patient_id"]), "doctor_id": str(seed["doctor_id"]), "medication": "m", "dosage": "1"}
+    for _ in range(2):
+        run(client.post("/api/prescriptions/", json=body, headers=seed["doctor_headers"]))
+
+    url = f"/api/prescriptions/patient/{seed['patient_id']}"
+    page = run(client.get(url, params={"limit": 1}, headers=seed["patient_headers"]))
+    assert page.headers["content-type"] == "application/json"
+    assert page.headers["X-Next-Cursor"] and page.headers["ETag"]
+    assert list(page.json()[0]) == list(PrescriptionResponse.model_fields)
+
+    signup = {"full_name": "New Doc", "email": "new-doc@example.com", "password": "secret1",
+              "specialization": "GP", "hospital_name": "General"}
+    response = run(client.post("/api/doctors/signup", json=signup))
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+    assert response.json()["doctor"]["email"] == "new-doc@example.com"
+    assert "password_hash" not in response.json()["doctor"]
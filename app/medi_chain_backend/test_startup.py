@@ -0,0 +1,74 @@
+"""Startup: the Alembic head check behind DB_SCHEMA_INIT and lazily included routers."""
+from pathlib import Path
+
+import httpx
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from src.db.main import init_db
+from src.db.schema import VERSION_TABLE, migration_heads, schema_at_head
+from src.main import ROUTERS
+from src.startup import include_routers
+
+
+def test_migration_heads_match_alembic():
+    config = Config(str(Path(__file__).parent / "alembic.ini"))
+    config.set_main_option("script_location", str(Path(__file__).parent / "migrations"))
+
+    assert migration_heads() == frozenset(ScriptDirectory.from_config(config).get_heads())
+
+
+def test_create_all_is_skipped_only_at_the_head(db, run):
+    async def at_head():
+        async with db.connect() as conn:
+            return await conn.run_sync(schema_at_head)
+
+    async def stamp(revision):
+        async with db.begin() as conn:
+            await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (version_num VARCHAR(32) PRIMARY KEY)"))
+            await conn.execute(text(f"DELETE FROM {VERSION_TABLE}"))
+            await conn.execute(text(f"INSERT INTO {VERSION_TABLE} VALUES (:revision)"), {"revision": revision})
+
+    async def unstamp():
+        async with db.begin() as conn:
+            await conn.execute(text(f"DROP TABLE {VERSION_TABLE}"))
+
+    assert run(at_head()) is False
+    assert run(init_db("auto")) == "created"
+    try:
+        run(stamp("0000000000ab"))
+        assert run(at_head()) is False
+        assert run(init_db("auto")) == "created"
+
+        (head,) = migration_heads()
+        run(stamp(head))
+        assert run(at_head()) is True
+        assert run(init_db("auto")) == "at_head"
+        assert run(init_db("create_all")) == "created"
+        assert run(init_db("skip")) == "skipped"
+    finally:
+        run(unstamp())
+
+
+def test_lazy_routers_are_included_on_first_request(db, run):
+    app = FastAPI()
+    include_routers(app, ROUTERS, lazy=True)
+    paths = lambda: {getattr(route, "path", None) for route in app.routes}
+    assert "/openapi.json" in paths() and not any(str(path).startswith("/api/") for path in paths())
+
+    async def get(path):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path)
+
+    assert run(get("/api/doctors/search?q=ab")).status_code == 401
+    assert run(get("/api/patients/search?q=ab")).status_code == 401
+    middleware = app.middleware_stack
+    while not hasattr(middleware, "pending"):
+        middleware = middleware.app
+    assert {spec.prefix for spec in middleware.pending} == {spec.prefix for spec in ROUTERS} - {"/api/doctors", "/api/patients"}
+
+    schema = run(get("/openapi.json")).json()
+    assert middleware.pending == []
+    assert {"/api/appointments/", "/api/imports/{kind}"} <= set(schema["paths"])
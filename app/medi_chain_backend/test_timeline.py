@@ -0,0 +1,92 @@
+"""The patient timeline merges every record type in one indexed query."""
+from datetime import datetime, timedelta
+
+from src.appointments.models import Appointment
+from src.consents.models import Consent
+from src.db.explain import capture_statements, find_sequential_scans
+from src.db.main import async_session_maker
+from src.doctor_patient.models import DoctorPatient
+from src.lab_reports.models import LabReport
+from src.patients.timeline import TimelineService
+from src.prescriptions.models import Prescription
+
+BASE = datetime(2026, 3, 1)
+
+
+def seed_history(run, seed):
+    patient_id, doctor_id = seed["patient_id"], seed["doctor_id"]
+
+    async def insert():
+        async with async_session_maker() as session:
+            session.add(DoctorPatient(doctor_id=doctor_id, patient_id=patient_id, assigned_at=BASE, grants_access=True))
+            session.add(Consent(doctor_id=doctor_id, patient_id=patient_id, created_at=BASE + timedelta(minutes=1)))
+            for day in range(1, 4):
+                when = BASE + timedelta(days=day)
+                session.add(Appointment(patient_id=patient_id, doctor_id=doctor_id, appointment_date=when,
+                                        reason=f"visit {day}", created_at=when))
+                session.add(Prescription(patient_id=patient_id, doctor_id=doctor_id, medication=f"med {day}",
+                                         dosage="1", created_at=when + timedelta(hours=1)))
+                session.add(LabReport(patient_id=patient_id, doctor_id=doctor_id, file_url="f",
+                                      report_type=f"lab {day}", uploaded_at=when + timedelta(hours=2)))
+            await session.commit()
+
+    run(insert())
+
+
+def test_timeline_pages_through_merged_feed(client, run, seed):
+    seed_history(run, seed)
+    url = f"/api/patients/{seed['patient_id']}/timeline"
+
+    async def walk():
+        entries, cursor = [], None
+        while True:
+            params = {"limit": 4}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get(url, params=params, headers=seed["doctor_headers"])
+            assert response.status_code == 200
+            entries.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return entries
+
+    entries = run(walk())
+    assert len(entries) == 11
+    times = [entry["occurred_at"] for entry in entries]
+    assert times == sorted(times, reverse=True)
+    assert entries[0] == {
+        "type": "lab_report", "id": entries[0]["id"], "occurred_at": "2026-03-04T02:00:00",
+        "doctor_id": str(seed["doctor_id"]), "summary": "lab 3", "status": None,
+    }
+    assert entries[-1]["type"] == "doctor_patient" and entries[-1]["status"] == "active"
+    assert entries[-2]["type"] == "consent" and entries[-2]["status"] == "pending"
+
+
+def test_timeline_filters_by_type_and_date(client, run, seed):
+    seed_history(run, seed)
+    params = [("type", "appointment"), ("type", "prescription"),
+              ("from", "2026-03-02T00:00:00"), ("to", "2026-03-03T12:00:00+00:00"), ("order", "asc")]
+
+    response = run(client.get(f"/api/patients/{seed['patient_id']}/timeline", params=params,
+                              headers=seed["doctor_headers"]))
+
+    assert response.status_code == 200
+    assert [(e["type"], e["summary"]) for e in response.json()] == [
+        ("appointment", "visit 1"), ("prescription", "med 1"),
+        ("appointment", "visit 2"), ("prescription", "med 2"),
+    ]
+
+
+def test_timeline_is_one_indexed_query(db, run, seed):
+    seed_history(run, seed)
+
+    async def check():
+        async with async_session_maker() as session:
+            with capture_statements(db) as statements:
+                await TimelineService().get_patient_timeline(seed["patient_id"], session)
+        async with db.begin() as conn:
+            return statements, await find_sequential_scans(conn, *statements[0])
+
+    statements, scans = run(check())
+    assert len(statements) == 1
+    assert scans == []
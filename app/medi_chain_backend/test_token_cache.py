@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from src import utils
+from src.dependencies import VerifiedTokenCache, verified_tokens, verify_token
+from src.utils import create_access_token
+
+
+def test_bearer_decodes_each_token_once(monkeypatch):
+    verified_tokens.clear()
+    calls = []
+    real_decode = utils.decode_token
+
+    def counting_decode(token):
+        calls.append(token)
+        return real_decode(token)
+
+    monkeypatch.setattr("src.dependencies.decode_token", counting_decode)
+    token = create_access_token({"email": "a@example.com", "id": "1"})
+
+    for _ in range(5):
+        assert verify_token(token)["user"]["id"] == "1"
+    assert len(calls) == 1
+    assert verified_tokens.stats()["hits"] >= 4
+
+
+def test_entries_honour_token_expiry():
+    cache = VerifiedTokenCache(ttl=300, max_entries=10, max_bytes=1 << 20)
+    cache.put("a.b.c", {"exp": time.time() - 1})
+    assert cache.get("a.b.c") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_is_bounded_by_entries_and_bytes():
+    cache = VerifiedTokenCache(ttl=300, max_entries=3, max_bytes=1 << 20)
+    for i in range(5):
+        cache.put(f"h.claims{i}.s", {"n": i})
+    assert cache.stats()["entries"] == 3
+    assert cache.get("h.claims0.s") is None
+    assert cache.get("h.claims4.s") == {"n": 4}
+
+    small = VerifiedTokenCache(ttl=300, max_entries=100, max_bytes=VerifiedTokenCache.ENTRY_OVERHEAD * 2 + 40)
+    for i in range(5):
+        small.put(f"h.claims{i}.s", {"n": i})
+    assert small.stats()["entries"] == 2
+
+
+def test_invalid_and_refresh_tokens_are_rejected(client, run):
+    refresh = create_access_token({"email": "a@example.com", "id": "1"}, expiry=timedelta(days=1), refresh=True)
+
+    async def calls():
+        bad = await client.delete("/api/patients/delete-account", headers={"Authorization": "Bearer not.a.token"})
+        wrong_kind = await client.delete("/api/patients/delete-account", headers={"Authorization": f"Bearer {refresh}"})
+        return bad, wrong_kind
+
+    bad, wrong_kind = run(calls())
+    assert bad.status_code == 403
+    assert wrong_kind.status_code == 403